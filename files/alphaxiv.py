@@ -9,12 +9,16 @@ Handles:
 """
 
 import asyncio
+import copy
 import json
-import re
 from pathlib import Path
 from datetime import datetime
 from typing import Optional
 from dataclasses import dataclass, field
+from urllib.parse import urlparse
+
+from .page_selectors import SELECTOR_FALLBACKS
+from .papers import canonical_arxiv_id
 
 try:
     from playwright.async_api import async_playwright, Browser, Page, BrowserContext
@@ -38,44 +42,8 @@ class AlphaxivClient:
     ALPHAXIV_URL = "https://www.alphaxiv.org/assistant"
     PROFILE_DIR = Path.home() / ".research-verifier" / "browser-profile"
     
-    # Multiple selector fallbacks for resilience to UI changes
-    # Each entry is a list of selectors to try in order
-    SELECTOR_FALLBACKS = {
-        "input_box": [
-            'textarea[placeholder*="Ask"]',
-            'textarea[placeholder*="ask"]',
-            'textarea[placeholder*="research"]',
-            'textarea[placeholder*="question"]',
-            'textarea[placeholder*="Search"]',
-            'textarea',  # Last resort: any textarea
-            'input[type="text"][placeholder*="Ask"]',
-            'input[type="text"][placeholder*="Search"]',
-            '[contenteditable="true"]',
-        ],
-        "send_button": [
-            'button[type="submit"]:not([disabled])',
-            'button:has(svg):not([disabled])',
-            'button[aria-label*="send" i]:not([disabled])',
-            'button[aria-label*="submit" i]:not([disabled])',
-            'form button:not([disabled])',
-        ],
-        "response_container": [
-            "div.prose",
-            "div[class*='message']",
-            "div[class*='assistant']",
-            "div[class*='response']",
-            "div[class*='chat']",
-            "div[class*='answer']",
-        ],
-        "completion_indicator": [
-            "button:has-text('Copy')",
-            "[aria-label*='Copy']",
-            "button:has-text('👍')",
-            "button:has-text('👎')",
-            "[class*='feedback']",
-            "[class*='actions']",
-        ],
-    }
+    # Multiple selector fallbacks for resilience to UI changes (see page_selectors)
+    SELECTOR_FALLBACKS = SELECTOR_FALLBACKS
 
     # Legacy format for backward compatibility
     SELECTORS = {
@@ -87,20 +55,32 @@ class AlphaxivClient:
         "paper_pill": "button:has-text('...'), span[class*='truncate']",
     }
     
-    def __init__(self, headless: bool = False, debug: bool = False):
+    def __init__(self, headless: bool = False, debug: bool = False,
+                 url: Optional[str] = None, profile_dir: Optional[Path] = None):
         """
         Initialize client.
 
         Args:
             headless: Run browser in headless mode (False recommended for first login)
             debug: Enable debug mode for selector troubleshooting
+            url: Assistant URL override (e.g. a local mock server for benchmarks)
+            profile_dir: Browser profile directory override
         """
         self.headless = headless
         self.debug = debug
+        if url:
+            self.ALPHAXIV_URL = url
+        if profile_dir:
+            self.PROFILE_DIR = Path(profile_dir)
+        # Host used to tell whether the page is still on the assistant site
+        self._site = (urlparse(self.ALPHAXIV_URL).hostname or "").removeprefix("www.")
         self.browser: Optional[Browser] = None
         self.context: Optional[BrowserContext] = None
         self.page: Optional[Page] = None
         self._playwright = None
+        self._parent: Optional["AlphaxivClient"] = None  # Set on tabs from open_tab()
+        # Batch workers reach _ensure_browser() at once; only one may launch
+        self._launch_lock = asyncio.Lock()
 
         # Ensure profile directory exists
         self.PROFILE_DIR.mkdir(parents=True, exist_ok=True)
@@ -164,7 +144,12 @@ class AlphaxivClient:
         """Ensure browser is running with persistent context."""
         if self.context is not None:
             return
-        
+        async with self._launch_lock:
+            if self.context is None:
+                await self._launch()
+
+    async def _launch(self):
+        """Start Playwright and open the persistent context (profile dir is locked while open)."""
         self._playwright = await async_playwright().start()
         
         # Use persistent context to maintain Google login
@@ -184,6 +169,23 @@ class AlphaxivClient:
         else:
             self.page = await self.context.new_page()
     
+    async def open_tab(self) -> "AlphaxivClient":
+        """
+        Open another tab of this browser session as its own client.
+
+        The tab shares the persistent context (and its login) but has its
+        own page, so queries on different tabs can run concurrently.
+        Closing the tab leaves the session open.
+
+        Returns:
+            Client whose queries run on the new tab
+        """
+        await self._ensure_browser()
+        tab = copy.copy(self)
+        tab.page = await self.context.new_page()
+        tab._parent = self
+        return tab
+
     async def login_interactive(self):
         """
         Open browser for manual login.
@@ -263,7 +265,7 @@ class AlphaxivClient:
         await self._ensure_browser()
 
         # Ensure we're on the right page
-        if "alphaxiv.org" not in self.page.url:
+        if self._site not in self.page.url:
             await self.new_conversation()
 
         # Find input box using fallback selectors
@@ -445,9 +447,8 @@ class AlphaxivClient:
             href = await link.get_attribute("href")
             title = await link.inner_text()
 
-            # Extract arxiv ID from URL
-            arxiv_match = re.search(r'(?:arxiv|alphaxiv)\.org/abs/(\d+\.\d+)', href or "")
-            arxiv_id = arxiv_match.group(1) if arxiv_match else None
+            # Extract canonical (version-stripped) arxiv ID from URL
+            arxiv_id = canonical_arxiv_id(href)
 
             if arxiv_id:  # Only add if we found a valid ID
                 papers.append({
@@ -486,7 +487,13 @@ Based on this context, what are the most relevant recent papers (from the last 2
         return await self.query(context_prompt)
     
     async def close(self):
-        """Close browser gracefully."""
+        """Close browser gracefully (only the tab, for clients from open_tab)."""
+        if self._parent is not None:
+            if self.page:
+                await self.page.close()
+                self.page = None
+            return
+
         if self.context:
             await self.context.close()
             self.context = None
@@ -0,0 +1,321 @@
+"""
+Cycle Archive - Packs finished cycles into compressed archives.
+
+Handles:
+- rv archive: packing each range of old, finished cycles into one file
+  under research/archive/ and removing their directories
+- The archive format: each cycle's files compressed together as one
+  block (so the duplicated .md/.json response text costs almost nothing),
+  followed by an offset index for random access
+- zstd compression (pip install zstandard), falling back to the standard
+  library's xz/LZMA when zstandard isn't installed
+- CycleFiles: reading cycle files the same way whether they are still in
+  research/cycle-NNN/ or archived, without extracting anything to disk
+"""
+
+import json
+import lzma
+import os
+import shutil
+import struct
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+from .fileops import atomic_write
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+if TYPE_CHECKING:
+    from .project import ProjectManager
+
+
+ARCHIVE_DIR = "archive"
+ARCHIVE_SUFFIX = ".rva"
+
+_MAGIC = b"RVARCH01"
+# Footer: index length, magic
+_FOOTER = struct.Struct("<Q8s")
+
+
+def default_codec() -> str:
+    return "zstd" if zstandard is not None else "xz"
+
+
+def _compress(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=10).compress(data)
+    return lzma.compress(data, preset=6)
+
+
+def _decompress(data: bytes, codec: str, size: int) -> bytes:
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("This archive uses zstd. Install it with: pip install zstandard")
+        return zstandard.ZstdDecompressor().decompress(data, max_output_size=size)
+    return lzma.decompress(data)
+
+
+class CycleArchive:
+    """One archive file holding a range of cycles."""
+
+    # Decompressed cycle blocks kept in memory
+    CACHE_BLOCKS = 4
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._index: Optional[dict] = None
+        self._blocks: "OrderedDict[int, bytes]" = OrderedDict()
+
+    @classmethod
+    def write(cls, path: Path, cycles: Dict[int, Dict[str, bytes]], codec: str) -> "CycleArchive":
+        """
+        Write an archive.
+
+        Args:
+            path: Archive file to create
+            cycles: {cycle_num: {path relative to the cycle dir: contents}}
+            codec: "zstd" or "xz"
+        """
+        parts = []
+        offset = 0
+        index = {"codec": codec, "created": datetime.now().isoformat(), "cycles": {}}
+
+        for cycle_num in sorted(cycles):
+            members = {}
+            raw = bytearray()
+            for name in sorted(cycles[cycle_num]):
+                data = cycles[cycle_num][name]
+                members[name] = [len(raw), len(data)]
+                raw += data
+            block = _compress(bytes(raw), codec)
+            index["cycles"][str(cycle_num)] = {
+                "offset": offset, "length": len(block), "size": len(raw), "members": members,
+            }
+            parts.append(block)
+            offset += len(block)
+
+        index_bytes = json.dumps(index).encode("utf-8")
+        atomic_write(path, b"".join(parts) + index_bytes + _FOOTER.pack(len(index_bytes), _MAGIC))
+        return cls(path)
+
+    @property
+    def index(self) -> dict:
+        if self._index is None:
+            with open(self.path, "rb") as f:
+                f.seek(-_FOOTER.size, os.SEEK_END)
+                index_len, magic = _FOOTER.unpack(f.read(_FOOTER.size))
+                if magic != _MAGIC:
+                    raise ValueError(f"Not a cycle archive: {self.path}")
+                f.seek(-(_FOOTER.size + index_len), os.SEEK_END)
+                self._index = json.loads(f.read(index_len))
+        return self._index
+
+    def cycle_numbers(self) -> List[int]:
+        return sorted(int(n) for n in self.index["cycles"])
+
+    def names(self, cycle_num: int) -> List[str]:
+        entry = self.index["cycles"].get(str(cycle_num))
+        return sorted(entry["members"]) if entry else []
+
+    def read(self, cycle_num: int, name: str) -> Optional[bytes]:
+        entry = self.index["cycles"].get(str(cycle_num))
+        if entry is None or name not in entry["members"]:
+            return None
+        start, length = entry["members"][name]
+        return self._block(cycle_num, entry)[start:start + length]
+
+    def _block(self, cycle_num: int, entry: dict) -> bytes:
+        if cycle_num in self._blocks:
+            self._blocks.move_to_end(cycle_num)
+            return self._blocks[cycle_num]
+        with open(self.path, "rb") as f:
+            f.seek(entry["offset"])
+            block = _decompress(f.read(entry["length"]), self.index["codec"], entry["size"])
+        self._blocks[cycle_num] = block
+        if len(self._blocks) > self.CACHE_BLOCKS:
+            self._blocks.popitem(last=False)
+        return block
+
+
+class CycleFiles:
+    """
+    Read access to cycle files, whether in research/cycle-NNN/ or archived.
+
+    Files still on disk take precedence, so anything written to an archived
+    cycle afterwards is seen on top of the archived copy.
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self._archives: Dict[int, CycleArchive] = {}
+        self._archive_dir_mtime: Optional[float] = None
+
+    @property
+    def research_dir(self) -> Path:
+        return self.root / "research"
+
+    def cycle_dir(self, cycle_num: int) -> Path:
+        return self.research_dir / f"cycle-{cycle_num:03d}"
+
+    def cycle_numbers(self) -> List[int]:
+        """Every cycle on disk or archived, in numeric order."""
+        numbers = set(self._archive_map())
+        for d in self.research_dir.glob("cycle-*"):
+            if d.name.split("-")[1].isdigit():
+                numbers.add(int(d.name.split("-")[1]))
+        return sorted(numbers)
+
+    def is_archived(self, cycle_num: int) -> bool:
+        return cycle_num in self._archive_map()
+
+    def archive_name(self, cycle_num: int) -> Optional[str]:
+        """File name of the archive holding a cycle, if it is archived."""
+        archive = self._archive_map().get(cycle_num)
+        return archive.path.name if archive is not None else None
+
+    def list(self, cycle_num: int, subdir: str = "") -> List[str]:
+        """File names directly under the cycle directory (or one of its subdirectories)."""
+        prefix = f"{subdir.strip('/')}/" if subdir else ""
+        names = set()
+        archive = self._archive_map().get(cycle_num)
+        if archive is not None:
+            for name in archive.names(cycle_num):
+                rest = name[len(prefix):]
+                if name.startswith(prefix) and "/" not in rest:
+                    names.add(rest)
+        directory = self.cycle_dir(cycle_num) / subdir
+        if directory.is_dir():
+            names.update(p.name for p in directory.iterdir() if p.is_file())
+        return sorted(names)
+
+    def read_bytes(self, cycle_num: int, name: str) -> Optional[bytes]:
+        path = self.cycle_dir(cycle_num) / name
+        if path.is_file():
+            return path.read_bytes()
+        archive = self._archive_map().get(cycle_num)
+        return archive.read(cycle_num, name) if archive is not None else None
+
+    def read_text(self, cycle_num: int, name: str) -> Optional[str]:
+        data = self.read_bytes(cycle_num, name)
+        return data.decode("utf-8") if data is not None else None
+
+    def exists(self, cycle_num: int, name: str) -> bool:
+        if (self.cycle_dir(cycle_num) / name).is_file():
+            return True
+        archive = self._archive_map().get(cycle_num)
+        return archive is not None and name in archive.index["cycles"][str(cycle_num)]["members"]
+
+    def _archive_map(self) -> Dict[int, CycleArchive]:
+        archive_dir = self.research_dir / ARCHIVE_DIR
+        try:
+            mtime = archive_dir.stat().st_mtime
+        except OSError:
+            return {}
+        if mtime != self._archive_dir_mtime:
+            self._archives = {}
+            for path in sorted(archive_dir.glob(f"*{ARCHIVE_SUFFIX}")):
+                archive = CycleArchive(path)
+                for cycle_num in archive.cycle_numbers():
+                    self._archives[cycle_num] = archive
+            self._archive_dir_mtime = mtime
+        return self._archives
+
+
+@dataclass
+class ArchiveResult:
+    """One archive written by archive_cycles()."""
+    path: Path
+    cycles: List[int] = field(default_factory=list)
+    files: int = 0
+    bytes_before: int = 0
+    bytes_after: int = 0
+
+
+def archivable_cycles(pm: "ProjectManager", cutoff: datetime) -> List[int]:
+    """Finished cycles last updated before cutoff that are still unarchived directories."""
+    numbers = []
+    for cycle in pm.catalog.list():
+        finished = cycle.get("synthesis") or cycle.get("checkpoint")
+        updated = cycle.get("updated") or cycle.get("started")
+        if not finished or not updated or datetime.fromisoformat(updated) >= cutoff:
+            continue
+        if pm.cycle_files.is_archived(cycle["cycle_num"]):
+            continue
+        if pm.cycle_files.cycle_dir(cycle["cycle_num"]).is_dir():
+            numbers.append(cycle["cycle_num"])
+    return numbers
+
+
+def archive_cycles(pm: "ProjectManager", cutoff: datetime, per_archive: int = 50,
+                   codec: Optional[str] = None, dry_run: bool = False) -> List[ArchiveResult]:
+    """
+    Pack finished cycles older than cutoff into archives and remove their directories.
+
+    Consecutive cycles are grouped into archives of up to per_archive cycles.
+    Each archive is verified against the files before they are deleted.
+
+    Returns:
+        One result per archive (not written when dry_run)
+    """
+    codec = codec or default_codec()
+    results = []
+
+    with pm.backend.lock.exclusive():
+        for group in _group(archivable_cycles(pm, cutoff), per_archive):
+            cycles = {n: _read_tree(pm.cycle_files.cycle_dir(n)) for n in group}
+            path = _archive_path(pm.cycle_files.research_dir / ARCHIVE_DIR, group[0], group[-1])
+            result = ArchiveResult(
+                path=path,
+                cycles=group,
+                files=sum(len(files) for files in cycles.values()),
+                bytes_before=sum(len(d) for files in cycles.values() for d in files.values()),
+            )
+            results.append(result)
+            if dry_run:
+                continue
+
+            path.parent.mkdir(parents=True, exist_ok=True)
+            archive = CycleArchive.write(path, cycles, codec)
+            for n, files in cycles.items():
+                for name, data in files.items():
+                    if archive.read(n, name) != data:
+                        path.unlink()
+                        raise RuntimeError(f"Archive verification failed for cycle-{n:03d}/{name}")
+            result.bytes_after = path.stat().st_size
+
+            for n in group:
+                shutil.rmtree(pm.cycle_files.cycle_dir(n))
+            pm.catalog.cycles_archived(group, path.name)
+
+    return results
+
+
+def _group(numbers: List[int], size: int) -> List[List[int]]:
+    """Split into runs of consecutive numbers, each at most size long."""
+    groups: List[List[int]] = []
+    for n in numbers:
+        if groups and n == groups[-1][-1] + 1 and len(groups[-1]) < size:
+            groups[-1].append(n)
+        else:
+            groups.append([n])
+    return groups
+
+
+def _read_tree(directory: Path) -> Dict[str, bytes]:
+    return {p.relative_to(directory).as_posix(): p.read_bytes()
+            for p in sorted(directory.rglob("*")) if p.is_file()}
+
+
+def _archive_path(archive_dir: Path, first: int, last: int) -> Path:
+    path = archive_dir / f"cycles-{first:04d}-{last:04d}{ARCHIVE_SUFFIX}"
+    suffix = 1
+    while path.exists():
+        suffix += 1
+        path = archive_dir / f"cycles-{first:04d}-{last:04d}-{suffix}{ARCHIVE_SUFFIX}"
+    return path
@@ -0,0 +1,176 @@
+"""
+Batch Queries - Many questions through one Alphaxiv browser session.
+
+Handles:
+- Reading questions from a file or stdin (one per line; blank lines and
+  lines starting with # are skipped, repeats are asked once)
+- Running them on up to N tabs of a single AlphaxivClient session, each
+  question in a fresh conversation so answers and paper links don't mix
+  (rv ask --batch), or one conversation per tab (rv cycle)
+- Streaming one JSONL record per question (question, text, papers,
+  timings) in completion order
+- Resuming: questions already answered in the output file are skipped,
+  and a record torn by an interrupted write is dropped before appending
+"""
+
+import asyncio
+import json
+import sys
+import time
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set
+
+from .fileops import durable_append
+
+
+@dataclass
+class BatchRecord:
+    """One line of batch output."""
+    index: int  # Position of the question in the input
+    question: str
+    text: str = ""
+    papers: list = field(default_factory=list)
+    timings: Dict[str, object] = field(default_factory=dict)
+    tab: int = 0
+    error: Optional[str] = None
+
+    def to_json(self) -> str:
+        data = asdict(self)
+        if data["error"] is None:
+            del data["error"]
+        return json.dumps(data, ensure_ascii=False)
+
+
+@dataclass
+class BatchSummary:
+    """Outcome of run_batch."""
+    answered: int = 0
+    failed: int = 0
+    skipped: int = 0  # Already answered in the output file
+    wall_seconds: float = 0.0
+
+
+def read_questions(source: str) -> List[str]:
+    """
+    Questions from a file, or stdin if source is '-'.
+
+    Returns:
+        Questions in input order, without repeats
+    """
+    text = sys.stdin.read() if source == "-" else Path(source).read_text()
+    questions = [line.strip() for line in text.splitlines()]
+    return list(dict.fromkeys(q for q in questions if q and not q.startswith("#")))
+
+
+def answered_questions(path: Path) -> Set[str]:
+    """
+    Questions already answered in a batch output file.
+
+    A trailing partial line (left by an interrupted write) is truncated
+    away so new records start on a line of their own. Records with an
+    error don't count, so those questions are asked again.
+    """
+    path = Path(path)
+    if not path.exists():
+        return set()
+    data = path.read_bytes()
+    if data and not data.endswith(b"\n"):
+        keep = data.rfind(b"\n") + 1
+        with open(path, "r+b") as f:
+            f.truncate(keep)
+        data = data[:keep]
+
+    done = set()
+    for line in data.decode("utf-8", errors="replace").splitlines():
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        if isinstance(record, dict) and "question" in record and not record.get("error"):
+            done.add(record["question"])
+    return done
+
+
+def file_sink(path: Path) -> Callable[[BatchRecord], None]:
+    """Sink appending each record to path, durably."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return lambda record: durable_append(path, record.to_json() + "\n")
+
+
+def stream_sink(stream) -> Callable[[BatchRecord], None]:
+    """Sink writing each record to a text stream as soon as it completes."""
+    def write(record: BatchRecord):
+        stream.write(record.to_json() + "\n")
+        stream.flush()
+    return write
+
+
+async def run_batch(client, questions: List[str], sink: Callable[[BatchRecord], None],
+                    concurrency: int = 2, timeout_seconds: int = 120,
+                    skip: Optional[Set[str]] = None,
+                    fresh_conversations: bool = True) -> BatchSummary:
+    """
+    Ask every question through one browser session.
+
+    Args:
+        client: AlphaxivClient; the first worker uses its page, the others
+            open tabs of the same session
+        questions: Questions in input order
+        sink: Called with each record as its question completes
+        concurrency: Tabs querying at once
+        timeout_seconds: Per-question response timeout
+        skip: Questions to leave out (already answered)
+        fresh_conversations: Start a new conversation for every question;
+            if False, each tab asks its questions in one conversation
+
+    Returns:
+        BatchSummary
+    """
+    skip = skip or set()
+    summary = BatchSummary(skipped=sum(1 for q in questions if q in skip))
+    queue: asyncio.Queue = asyncio.Queue()
+    for index, question in enumerate(questions):
+        if question not in skip:
+            queue.put_nowait((index, question))
+    workers = max(1, min(concurrency, queue.qsize()))
+    batch_start = time.perf_counter()
+
+    async def worker(tab_num: int):
+        tab = client if tab_num == 0 else await client.open_tab()
+        conversation_open = False
+        try:
+            while not queue.empty():
+                index, question = queue.get_nowait()
+                record = BatchRecord(index=index, question=question, tab=tab_num)
+                started = datetime.now().isoformat()
+                wait = time.perf_counter() - batch_start
+                start = time.perf_counter()
+                try:
+                    if fresh_conversations or not conversation_open:
+                        await tab.new_conversation()
+                        conversation_open = True
+                    start = time.perf_counter()
+                    response = await tab.query(question, timeout_seconds=timeout_seconds)
+                    record.text = response.text
+                    record.papers = response.papers
+                    summary.answered += 1
+                except Exception as e:
+                    record.error = f"{type(e).__name__}: {e}"
+                    summary.failed += 1
+                record.timings = {
+                    "started": started,
+                    "queued_seconds": round(wait, 3),
+                    "query_seconds": round(time.perf_counter() - start, 3),
+                    "finished": datetime.now().isoformat(),
+                }
+                sink(record)
+        finally:
+            if tab is not client:
+                await tab.close()
+
+    await asyncio.gather(*(worker(n) for n in range(workers)))
+    summary.wall_seconds = round(time.perf_counter() - batch_start, 3)
+    return summary
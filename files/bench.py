@@ -0,0 +1,449 @@
+"""
+Benchmarks - Offline performance measurements for rv.
+
+Handles:
+- End-to-end runs of AlphaxivClient and ResearchOrchestrator against the
+  local mock Alphaxiv server
+- Throughput, latency percentiles and memory for each run
+- Storage scaling: synthetic projects in the real project layout at
+  several sizes, timing the ProjectManager operations a run depends on
+- Saving results as JSON and comparing against a saved baseline
+"""
+
+import contextlib
+import io
+import json
+import math
+import random
+import statistics
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+from .alphaxiv import AlphaxivClient
+from .mock_server import MockAlphaxivServer, MockConfig
+from .orchestrator import ResearchOrchestrator
+from .project import ProjectManager
+from .storage import open_backend
+
+
+# Metrics where a higher value is a regression (everything else: lower is worse)
+HIGHER_IS_WORSE = ("latency", "seconds", "_mb")
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Linear-interpolated percentile (pct in 0-100)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def max_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MB."""
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KB on Linux, bytes on macOS
+    return rss / (1024 * 1024) if rss > 1 << 32 else rss / 1024
+
+
+def summarize(latencies: List[float], wall_seconds: float, peak_bytes: int) -> Dict[str, float]:
+    """Standard metrics for a run of timed queries."""
+    return {
+        "queries": len(latencies),
+        "wall_seconds": round(wall_seconds, 2),
+        "queries_per_minute": round(len(latencies) / wall_seconds * 60, 2) if wall_seconds else 0.0,
+        "latency_p50": round(percentile(latencies, 50), 3),
+        "latency_p90": round(percentile(latencies, 90), 3),
+        "latency_p99": round(percentile(latencies, 99), 3),
+        "peak_python_mb": round(peak_bytes / (1024 * 1024), 2),
+    }
+
+
+async def bench_client(url: str, num_queries: int, headless: bool = True) -> Dict[str, float]:
+    """Time raw AlphaxivClient queries in one conversation."""
+    latencies = []
+    with tempfile.TemporaryDirectory(prefix="rv-bench-profile-") as profile:
+        client = AlphaxivClient(headless=headless, url=url, profile_dir=Path(profile))
+        tracemalloc.start()
+        start = time.perf_counter()
+        try:
+            await client.new_conversation()
+            for i in range(num_queries):
+                q_start = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    await client.query(f"Benchmark question {i}: what is known about topic {i}?")
+                latencies.append(time.perf_counter() - q_start)
+        finally:
+            wall = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            await client.close()
+    return summarize(latencies, wall, peak)
+
+
+async def bench_orchestrator(url: str, num_cycles: int, headless: bool = True) -> Dict[str, float]:
+    """Time full run_cycles on a scratch project."""
+    with tempfile.TemporaryDirectory(prefix="rv-bench-") as scratch:
+        pm = ProjectManager()
+        root = pm.create_project("bench-project", scratch)
+        (root / "concept" / "README.md").write_text(
+            "# Concept\n\n## Core Theory\n\nBenchmarking inference-time compute scaling for language models.\n"
+        )
+        pm = ProjectManager(root)
+        client = AlphaxivClient(headless=headless, url=url, profile_dir=Path(scratch) / "profile")
+        orchestrator = ResearchOrchestrator(pm, client=client)
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                results = await orchestrator.run_cycles(num_cycles=num_cycles)
+        finally:
+            wall = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+        latencies = [r["duration_seconds"] for r in pm.iter_responses() if "duration_seconds" in r]
+
+        metrics = summarize(latencies, wall, peak)
+        metrics["cycles"] = len(results)
+        metrics["cycle_seconds_mean"] = round(
+            sum(r.duration_seconds for r in results) / len(results), 2
+        ) if results else 0.0
+        return metrics
+
+
+async def run_e2e(config: MockConfig, num_queries: int = 5, num_cycles: int = 1,
+                  headless: bool = True) -> Dict[str, dict]:
+    """Run the end-to-end suite against a fresh mock server."""
+    results: Dict[str, dict] = {"config": asdict(config)}
+    with MockAlphaxivServer(config) as server:
+        if num_queries:
+            results["client"] = await bench_client(server.url, num_queries, headless)
+        if num_cycles:
+            results["orchestrator"] = await bench_orchestrator(server.url, num_cycles, headless)
+        results["server_queries"] = server.queries
+    results["max_rss_mb"] = max_rss_mb()
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float = 0.2) -> List[str]:
+    """
+    Compare results with a baseline run.
+
+    Returns:
+        Descriptions of metrics that regressed by more than tolerance
+    """
+    regressions = []
+    for suite, metrics in results.items():
+        if suite in ("config", "scaling") or not isinstance(metrics, dict) \
+                or not isinstance(baseline.get(suite), dict):
+            continue
+        for name, value in metrics.items():
+            before = baseline[suite].get(name)
+            if not isinstance(value, (int, float)) or not isinstance(before, (int, float)) or not before:
+                continue
+            change = (value - before) / before
+            worse = change if any(k in name for k in HIGHER_IS_WORSE) else -change
+            if worse > tolerance:
+                regressions.append(f"{suite}.{name}: {before} → {value} ({change:+.0%})")
+    return regressions
+
+
+def print_results(results: dict):
+    """Print benchmark results as a table per suite."""
+    print("\n⏱  Benchmark results")
+    print("=" * 50)
+    for suite, metrics in results.items():
+        if suite == "config" or not isinstance(metrics, dict):
+            continue
+        print(f"\n  {suite}:")
+        for name, value in metrics.items():
+            print(f"    {name:<22} {value}")
+    if results.get("max_rss_mb") is not None:
+        print(f"\n  max RSS: {results['max_rss_mb']:.1f} MB")
+    print()
+
+
+# === Storage scaling ===
+
+@dataclass
+class ProjectScale:
+    """Size of a synthetic project."""
+    cycles: int = 1000
+    papers: int = 50000
+    gaps: int = 2000  # Active and resolved; a quarter are resolved
+    responses_per_cycle: int = 3
+    papers_per_response: int = 5
+
+    def scaled(self, factor: float) -> "ProjectScale":
+        return ProjectScale(
+            cycles=max(1, round(self.cycles * factor)),
+            papers=max(1, round(self.papers * factor)),
+            gaps=max(40, round(self.gaps * factor)),  # resolve_gap needs a few active gaps
+            responses_per_cycle=self.responses_per_cycle,
+            papers_per_response=self.papers_per_response,
+        )
+
+
+class _Words:
+    """Pronounceable pseudo-words, so synthetic titles don't look like near-duplicates."""
+
+    SYLLABLES = ["ka", "lo", "mi", "ren", "tu", "sa", "vel", "dor", "qui", "ny", "pha", "ex",
+                 "or", "zen", "lu", "ta", "gri", "mon", "bel", "sti", "ar", "cy", "fo", "hu"]
+
+    def __init__(self, rng: random.Random, size: int = 4000):
+        self.rng = rng
+        vocab = set()
+        while len(vocab) < size:
+            vocab.add("".join(rng.choice(self.SYLLABLES) for _ in range(rng.randint(2, 4))))
+        self.vocab = sorted(vocab)
+
+    def phrase(self, low: int, high: int) -> str:
+        return " ".join(self.rng.choice(self.vocab) for _ in range(self.rng.randint(low, high)))
+
+
+def generate_project(parent: Path, scale: ProjectScale, storage: str = "yaml", seed: int = 0,
+                     name: str = "synthetic") -> Path:
+    """
+    Create a project with the standard structure and fill it with synthetic
+    cycles, responses, papers and gaps.
+
+    Data goes in through the storage backend's restore(), the way rv import
+    does, and the derived views are then rebuilt, so the project looks like
+    one that has been run for `scale.cycles` cycles.
+
+    Returns:
+        Project root
+    """
+    rng = random.Random(seed)
+    words = _Words(rng)
+    root = ProjectManager().create_project(name, str(parent), storage=storage)
+    start = datetime(2024, 1, 1)
+
+    papers = []
+    for i in range(scale.papers):
+        arxiv_id = f"{23 + i // 1080000}{(i // 90000) % 12 + 1:02d}.{10000 + i % 90000:05d}"
+        papers.append({"title": words.phrase(5, 9).capitalize(), "arxiv_id": arxiv_id,
+                       "url": f"https://arxiv.org/abs/{arxiv_id}",
+                       "added": (start + timedelta(minutes=i)).isoformat()})
+
+    gaps, resolved = [], []
+    for gap_id in range(1, scale.gaps + 1):
+        gap = {"id": gap_id, "description": f"Open question on {words.phrase(3, 6)}",
+               "priority": rng.choice(["high", "medium", "medium", "low"]), "related_components": [],
+               "created": (start + timedelta(hours=gap_id)).isoformat()}
+        if gap_id % 4 == 0:
+            gap.update(resolved=(start + timedelta(hours=gap_id + 12)).isoformat(),
+                       resolution=f"Answered by {words.phrase(2, 4)}")
+            resolved.append(gap)
+        else:
+            gaps.append(gap)
+
+    phases = ["expansive", "integrative", "synthesis"]
+    responses, cycles = [], {}
+    checkpoint_interval = 5
+    for cycle_num in range(1, scale.cycles + 1):
+        when = start + timedelta(hours=cycle_num)
+        phase = phases[(cycle_num - 1) % 3]
+        questions = [f"What is known about {words.phrase(3, 6)}?" for _ in range(scale.responses_per_cycle)]
+        cited = []
+        for q_num, question in enumerate(questions, 1):
+            sample = rng.sample(papers, min(scale.papers_per_response, len(papers)))
+            cited.extend(sample)
+            responses.append({
+                "cycle_num": cycle_num, "question_num": q_num, "question": question,
+                "text": " ".join(words.phrase(8, 16).capitalize() + "." for _ in range(8)),
+                "papers": [{k: p[k] for k in ("title", "url", "arxiv_id")} for p in sample],
+                "timestamp": (when + timedelta(minutes=q_num)).isoformat(),
+                "duration_seconds": round(rng.uniform(20, 90), 2),
+            })
+        cycles[cycle_num] = {"cycle_num": cycle_num, "completed": when.isoformat(),
+                             "questions_count": len(questions), "papers_found": len(cited), "new_gaps": 0}
+
+        cycle_dir = root / "research" / f"cycle-{cycle_num:03d}"
+        cycle_dir.mkdir(parents=True, exist_ok=True)
+        (cycle_dir / "questions.md").write_text(
+            f"# Questions for Cycle {cycle_num}\n\n"
+            + "".join(f"## Q{i}\n\n{q}\n\n" for i, q in enumerate(questions, 1)))
+        (cycle_dir / "synthesis.md").write_text(
+            f"# Cycle Synthesis - {phase.capitalize()} Phase\n\n## Summary\n\n{words.phrase(20, 40)}.\n\n"
+            f"## Key Findings\n\n{words.phrase(30, 60)}.\n")
+        if cycle_num % checkpoint_interval == 0:
+            (cycle_dir / "checkpoint.json").write_text(json.dumps(
+                {"cycle_num": cycle_num, "phase": phase, "timestamp": when.isoformat()}, indent=2))
+
+    state = {
+        "project_name": name, "current_hypothesis_version": 1, "current_cycle": scale.cycles,
+        "current_phase": phases[scale.cycles % 3], "total_cycles_completed": scale.cycles,
+        "last_updated": datetime.now().isoformat(), "gaps_count": len(gaps), "papers_collected": len(papers),
+    }
+    open_backend(root, storage).restore({"state": state, "papers": papers, "gaps": gaps,
+                                         "resolved": resolved, "responses": responses, "cycles": cycles})
+
+    pm = ProjectManager(root)
+    pm.catalog.rebuild()
+    pm.recap.rebuild()
+    pm.title_index.rebuild()
+    return root
+
+
+def _storage_operations(rng: random.Random) -> Dict[str, Callable[[ProjectManager, int], object]]:
+    """Timed operations: name → fn(pm, call number)."""
+    words = _Words(rng, size=500)
+
+    def update_papers(pm: ProjectManager, i: int):
+        # Ten new papers plus five the generator registered first
+        known = [{"title": "Known paper", "url": f"https://arxiv.org/abs/2301.{10000 + k:05d}"}
+                 for k in range(5)]
+        new = [{"title": words.phrase(5, 9).capitalize(),
+                "url": f"https://arxiv.org/abs/2912.{i * 10 + k:05d}"} for k in range(10)]
+        with pm.transaction():
+            pm._update_papers(known + new)
+
+    def add_gap(pm: ProjectManager, i: int):
+        pm.add_gap(f"Benchmark gap {i}: {words.phrase(3, 6)}")
+
+    def resolve_gap(pm: ProjectManager, i: int):
+        # Generated gaps 1, 5, 9, ... are active
+        pm.resolve_gap(1 + 4 * i, "Resolved by benchmark")
+
+    def context_recap(pm: ProjectManager, i: int):
+        pm.get_context_recap()
+
+    def print_status(pm: ProjectManager, i: int):
+        with contextlib.redirect_stdout(io.StringIO()):
+            pm.print_status()
+
+    def resume_discovery(pm: ProjectManager, i: int):
+        latest = pm.catalog.latest_checkpoint()
+        if latest:
+            pm.load_checkpoint(latest["cycle_num"])
+
+    return {
+        "update_papers": update_papers,
+        "add_gap": add_gap,
+        "resolve_gap": resolve_gap,
+        "context_recap": context_recap,
+        "print_status": print_status,
+        "resume_discovery": resume_discovery,
+    }
+
+
+def bench_storage_operations(root: Path, repeat: int = 5, seed: int = 0) -> Dict[str, float]:
+    """
+    Time each storage operation on a project.
+
+    Per operation: the first call on a fresh ProjectManager (as in a new rv
+    process), the median of `repeat` further calls, and peak Python memory
+    of a cold call (measured separately, as tracing slows the timed calls).
+    """
+    metrics: Dict[str, float] = {}
+    for name, op in _storage_operations(random.Random(seed)).items():
+        pm = ProjectManager(root)
+        start = time.perf_counter()
+        op(pm, 0)
+        metrics[f"{name}_cold_seconds"] = round(time.perf_counter() - start, 5)
+
+        warm = []
+        for i in range(1, repeat + 1):
+            start = time.perf_counter()
+            op(pm, i)
+            warm.append(time.perf_counter() - start)
+        metrics[f"{name}_seconds"] = round(statistics.median(warm), 5) if warm else 0.0
+
+        tracemalloc.start()
+        try:
+            op(ProjectManager(root), repeat + 1)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        metrics[f"{name}_peak_mb"] = round(peak / (1024 * 1024), 3)
+    return metrics
+
+
+def _disk_mb(root: Path) -> float:
+    return round(sum(p.stat().st_size for p in root.rglob("*") if p.is_file()) / (1024 * 1024), 2)
+
+
+def run_storage(base: ProjectScale, factors: List[float], storage: str = "yaml", repeat: int = 5,
+                seed: int = 0, keep_dir: Optional[Path] = None) -> Dict[str, dict]:
+    """
+    Generate a synthetic project per scale factor and time storage operations on each.
+
+    Returns:
+        Results with one suite per factor ("x0.1", ...) and "scaling": the
+        fitted exponent k of time ∝ size^k per operation, from the smallest
+        to the largest project
+    """
+    results: Dict[str, dict] = {"config": {"base": asdict(base), "factors": factors, "storage": storage,
+                                           "repeat": repeat, "seed": seed}}
+    with contextlib.ExitStack() as stack:
+        parent = keep_dir or Path(stack.enter_context(tempfile.TemporaryDirectory(prefix="rv-bench-storage-")))
+        parent.mkdir(parents=True, exist_ok=True)
+        for factor in sorted(factors):
+            scale = base.scaled(factor)
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                root = generate_project(parent, scale, storage=storage, seed=seed, name=f"synthetic-x{factor:g}")
+            suite = {"cycles": scale.cycles, "papers": scale.papers, "gaps": scale.gaps,
+                     "generate_seconds": round(time.perf_counter() - start, 2), "disk_mb": _disk_mb(root)}
+            with contextlib.redirect_stdout(io.StringIO()):
+                suite.update(bench_storage_operations(root, repeat=repeat, seed=seed))
+            results[f"x{factor:g}"] = suite
+
+    suites = [results[f"x{f:g}"] for f in sorted(factors)]
+    if len(suites) > 1:
+        small, large = suites[0], suites[-1]
+        size_ratio = large["papers"] / small["papers"]
+        results["scaling"] = {}
+        for name in _storage_operations(random.Random(seed)):
+            key = f"{name}_seconds"
+            if small[key] > 0 and large[key] > 0 and size_ratio > 1:
+                results["scaling"][name] = round(math.log(large[key] / small[key]) / math.log(size_ratio), 2)
+    results["max_rss_mb"] = max_rss_mb()
+    return results
+
+
+def print_storage_results(results: dict):
+    """Print per-operation timings across scales, with their scaling exponents."""
+    suites = [(name, metrics) for name, metrics in results.items()
+              if name.startswith("x") and isinstance(metrics, dict)]
+    scaling = results.get("scaling", {})
+
+    print(f"\n⏱  Storage scaling ({results['config']['storage']} backend)")
+    print("=" * 72)
+    header = f"  {'':<18}" + "".join(f"{name:>14}" for name, _ in suites)
+    print(header)
+    for label, key in (("cycles", "cycles"), ("papers", "papers"), ("gaps", "gaps"),
+                       ("generate (s)", "generate_seconds"), ("disk (MB)", "disk_mb")):
+        print(f"  {label:<18}" + "".join(f"{m[key]:>14}" for _, m in suites))
+
+    print(f"\n  {'operation (ms)':<18}" + "".join(f"{name:>14}" for name, _ in suites)
+          + f"{'cold@max':>11}{'peak MB':>9}{'k':>7}")
+    for op in _storage_operations(random.Random(0)):
+        largest = suites[-1][1]
+        row = "".join(f"{m[f'{op}_seconds'] * 1000:>14.2f}" for _, m in suites)
+        k = scaling.get(op)
+        print(f"  {op:<18}{row}{largest[f'{op}_cold_seconds'] * 1000:>11.1f}"
+              f"{largest[f'{op}_peak_mb']:>9.2f}{(f'{k:.2f}' if k is not None else '-'):>7}")
+    if scaling:
+        print("\n  k: time grows as size^k between the smallest and largest project "
+              "(0 = constant, 1 = linear)")
+    if results.get("max_rss_mb") is not None:
+        print(f"  max RSS: {results['max_rss_mb']:.1f} MB")
+    print()
@@ -0,0 +1,159 @@
+"""
+Blob Store - Content-addressed storage for response text.
+
+Handles:
+- Keeping each distinct response text once (blobs/ab/cdef….z, zlib
+  compressed), named by its SHA-256, so a repeated answer costs nothing
+- References ("sha256:<hex>") that response files hold instead of the text
+- Garbage collection of blobs that no response refers to any more
+- Integrity checks: every blob still hashes to its name and every
+  reference resolves
+"""
+
+import hashlib
+import re
+import zlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+from .fileops import atomic_write
+
+
+REF_PREFIX = "sha256:"
+_REF = re.compile(r"sha256:([0-9a-f]{64})")
+
+
+def is_ref(value) -> bool:
+    return isinstance(value, str) and _REF.fullmatch(value) is not None
+
+
+@dataclass
+class IntegrityReport:
+    """Result of BlobStore.check()."""
+    blobs: int = 0
+    references: int = 0
+    corrupt: List[str] = field(default_factory=list)
+    # (where, ref) for references whose blob is gone
+    missing: List[Tuple[str, str]] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.corrupt and not self.missing
+
+
+class BlobStore:
+    """Write-once blobs under <project>/blobs/, addressed by content hash."""
+
+    BLOB_DIR = "blobs"
+    SUFFIX = ".z"
+
+    def __init__(self, root: Path):
+        """
+        Initialize blob store.
+
+        Args:
+            root: Project root; blobs live in its blobs/ directory
+        """
+        self.dir = Path(root) / self.BLOB_DIR
+
+    def put(self, text: str) -> str:
+        """
+        Store text, exactly as given, unless an identical blob exists.
+
+        Returns:
+            Reference to the blob
+        """
+        data = text.encode("utf-8")
+        ref = REF_PREFIX + hashlib.sha256(data).hexdigest()
+        path = self._path(ref)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write(path, zlib.compress(data, 6))
+        return ref
+
+    def get(self, ref: str) -> Optional[str]:
+        """Text of a blob, or None if it is missing or unreadable."""
+        try:
+            return zlib.decompress(self._path(ref).read_bytes()).decode("utf-8")
+        except (OSError, ValueError, zlib.error):
+            return None
+
+    def exists(self, ref: str) -> bool:
+        return self._path(ref).exists()
+
+    def resolve(self, prefix: str) -> List[str]:
+        """References starting with prefix (with or without "sha256:")."""
+        digest = prefix[len(REF_PREFIX):] if prefix.startswith(REF_PREFIX) else prefix
+        if len(digest) < 2:
+            return []
+        return sorted(REF_PREFIX + p.parent.name + p.name[:-len(self.SUFFIX)]
+                      for p in (self.dir / digest[:2]).glob(f"{digest[2:]}*{self.SUFFIX}"))
+
+    def refs(self) -> Iterator[str]:
+        """Every stored blob's reference."""
+        for path in sorted(self.dir.glob(f"??/*{self.SUFFIX}")):
+            yield REF_PREFIX + path.parent.name + path.name[:-len(self.SUFFIX)]
+
+    def size(self, ref: str) -> int:
+        try:
+            return self._path(ref).stat().st_size
+        except OSError:
+            return 0
+
+    def verify(self, ref: str) -> bool:
+        """True if the blob decompresses to content matching its hash."""
+        try:
+            data = zlib.decompress(self._path(ref).read_bytes())
+        except (OSError, zlib.error):
+            return False
+        return REF_PREFIX + hashlib.sha256(data).hexdigest() == ref
+
+    # === Maintenance ===
+
+    def collect_garbage(self, live: set, dry_run: bool = False) -> Tuple[int, int]:
+        """
+        Delete blobs not in live. The caller must hold the project's
+        exclusive lock, so no writer can add a reference meanwhile.
+
+        Returns:
+            (blobs removed, bytes freed)
+        """
+        removed = freed = 0
+        for ref in list(self.refs()):
+            if ref in live:
+                continue
+            removed += 1
+            freed += self.size(ref)
+            if not dry_run:
+                self._path(ref).unlink(missing_ok=True)
+        if not dry_run:
+            for subdir in self.dir.glob("??"):
+                if subdir.is_dir() and not any(subdir.iterdir()):
+                    subdir.rmdir()
+        return removed, freed
+
+    def check(self, references: Iterator[Tuple[str, str]]) -> IntegrityReport:
+        """
+        Verify every blob and that every reference resolves.
+
+        Args:
+            references: (where, ref) pairs, e.g. ("cycle-003 Q2", "sha256:…")
+        """
+        report = IntegrityReport()
+        for ref in self.refs():
+            report.blobs += 1
+            if not self.verify(ref):
+                report.corrupt.append(ref)
+        for where, ref in references:
+            report.references += 1
+            if not self.exists(ref):
+                report.missing.append((where, ref))
+        return report
+
+    def _path(self, ref: str) -> Path:
+        match = _REF.fullmatch(ref)
+        if not match:
+            raise ValueError(f"Not a blob reference: {ref}")
+        digest = match.group(1)
+        return self.dir / digest[:2] / f"{digest[2:]}{self.SUFFIX}"
@@ -0,0 +1,199 @@
+"""
+Run Budget - Wall-clock and query limits for automated runs.
+
+Handles:
+- Tracking elapsed time and queries against --max-minutes/--max-queries/--deadline
+- Forecasting remaining cost from observed per-query latency
+- Deciding which questions fit the remaining budget (the rest are deferred)
+- Carrying a checkpointed run's limits over to rv resume
+"""
+
+import time
+from datetime import datetime, timedelta
+from typing import Callable, List, Optional, Tuple
+
+
+class BudgetTracker:
+    """Tracks a run's time and query budget and forecasts what still fits."""
+
+    # Assumed cost of a query before any latency has been observed
+    DEFAULT_QUERY_SECONDS = 60.0
+
+    def __init__(self, max_minutes: Optional[float] = None,
+                 max_queries: Optional[int] = None,
+                 deadline: Optional[datetime] = None,
+                 query_overhead: float = 2.0,
+                 prior_query_seconds: float = DEFAULT_QUERY_SECONDS,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize budget tracker.
+
+        Args:
+            max_minutes: Wall-clock budget for the whole run
+            max_queries: Maximum number of Alphaxiv queries for the run
+            deadline: Absolute time by which the run must stop
+            query_overhead: Fixed delay added after every query (seconds)
+            prior_query_seconds: Latency assumed until one has been observed
+            clock: Monotonic clock in seconds (an event loop's time() in simulations)
+        """
+        self.max_seconds = max_minutes * 60 if max_minutes is not None else None
+        self.max_queries = max_queries
+        self.deadline = deadline
+        self.query_overhead = query_overhead
+        self.prior_query_seconds = prior_query_seconds
+        self.latencies: List[float] = []
+        self._clock = clock
+        self._started = clock()
+        self._started_at = datetime.now()
+        # Measure the deadline on the same clock as elapsed time
+        self._deadline_seconds = (
+            (deadline - self._started_at).total_seconds() if deadline is not None else None
+        )
+
+    @property
+    def is_limited(self) -> bool:
+        """Whether any limit has been configured."""
+        return any(v is not None for v in (self.max_seconds, self.max_queries, self.deadline))
+
+    @property
+    def queries_used(self) -> int:
+        return len(self.latencies)
+
+    @property
+    def elapsed_seconds(self) -> float:
+        return self._clock() - self._started
+
+    def record_query(self, seconds: float):
+        """Record the observed latency of one query."""
+        self.latencies.append(max(0.0, seconds))
+
+    def expected_query_seconds(self) -> float:
+        """Expected cost of one more query, including the inter-question delay."""
+        if self.latencies:
+            # Weight recent queries more: slow spells tend to persist
+            recent = self.latencies[-5:]
+            latency = 0.5 * (sum(recent) / len(recent)) + 0.5 * (sum(self.latencies) / len(self.latencies))
+        else:
+            latency = self.prior_query_seconds
+        return latency + self.query_overhead
+
+    def remaining_seconds(self) -> Optional[float]:
+        """Seconds left before the tighter of --max-minutes and --deadline, or None."""
+        limits = []
+        if self.max_seconds is not None:
+            limits.append(self.max_seconds - self.elapsed_seconds)
+        if self._deadline_seconds is not None:
+            limits.append(self._deadline_seconds - self.elapsed_seconds)
+        if not limits:
+            return None
+        return max(0.0, min(limits))
+
+    def remaining_queries(self) -> Optional[int]:
+        """Queries left before --max-queries, or None."""
+        if self.max_queries is None:
+            return None
+        return max(0, self.max_queries - self.queries_used)
+
+    def forecast_seconds(self, num_queries: int) -> float:
+        """Forecast wall time for the given number of further queries."""
+        return num_queries * self.expected_query_seconds()
+
+    def exhausted(self) -> bool:
+        """True once no further query can be started within the budget."""
+        remaining_queries = self.remaining_queries()
+        if remaining_queries is not None and remaining_queries <= 0:
+            return True
+        remaining_seconds = self.remaining_seconds()
+        return remaining_seconds is not None and remaining_seconds <= 0
+
+    def can_afford(self, num_queries: int = 1) -> bool:
+        """Whether the forecast for num_queries fits what is left."""
+        remaining_queries = self.remaining_queries()
+        if remaining_queries is not None and num_queries > remaining_queries:
+            return False
+        remaining_seconds = self.remaining_seconds()
+        if remaining_seconds is not None and self.forecast_seconds(num_queries) > remaining_seconds:
+            return False
+        return True
+
+    def fit(self, questions: List[str]) -> Tuple[List[str], List[str]]:
+        """
+        Split questions into those that fit the budget and those to defer.
+
+        Questions are assumed to be ordered by value (generators emit the
+        phase's core question first), so the tail is deferred first.
+
+        Returns:
+            (questions to ask now, deferred questions)
+        """
+        count = 0
+        while count < len(questions) and self.can_afford(count + 1):
+            count += 1
+        return questions[:count], questions[count:]
+
+    def query_timeout(self, default: int) -> int:
+        """Cap a single query's timeout so it cannot run past the budget."""
+        remaining_seconds = self.remaining_seconds()
+        if remaining_seconds is None:
+            return default
+        return max(1, min(default, int(remaining_seconds)))
+
+    def summary(self) -> dict:
+        """Budget usage for checkpoints and end-of-run reporting."""
+        return {
+            "started": self._started_at.isoformat(),
+            "elapsed_seconds": round(self.elapsed_seconds, 1),
+            "queries_used": self.queries_used,
+            "max_queries": self.max_queries,
+            "max_minutes": self.max_seconds / 60 if self.max_seconds is not None else None,
+            "deadline": self.deadline.isoformat() if self.deadline else None,
+            "expected_query_seconds": round(self.expected_query_seconds(), 1),
+            "exhausted": self.exhausted(),
+        }
+
+
+def parse_deadline(value: str, now: Optional[datetime] = None) -> datetime:
+    """
+    Parse a --deadline value.
+
+    Accepts an ISO timestamp ("2026-01-04T18:30") or a clock time ("18:30"),
+    which means the next occurrence of that time.
+    """
+    now = now or datetime.now()
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        pass
+
+    try:
+        clock = datetime.strptime(value, "%H:%M").time()
+    except ValueError:
+        raise ValueError(f"Invalid deadline '{value}'. Use HH:MM or an ISO timestamp.")
+
+    deadline = datetime.combine(now.date(), clock)
+    if deadline <= now:
+        deadline += timedelta(days=1)
+    return deadline
+
+
+def resume_limits(summary: Optional[dict], now: Optional[datetime] = None) -> dict:
+    """
+    Budget limits for resuming a run, from the budget summary in its checkpoint.
+
+    The resumed run gets the original --max-minutes and --max-queries again
+    (like any new rv run) and keeps the original deadline unless it has passed.
+
+    Returns:
+        max_minutes, max_queries and deadline keyword arguments
+    """
+    summary = summary or {}
+    now = now or datetime.now()
+    deadline = summary.get("deadline")
+    deadline = datetime.fromisoformat(deadline) if deadline else None
+    if deadline is not None and deadline <= now:
+        deadline = None
+    return {
+        "max_minutes": summary.get("max_minutes"),
+        "max_queries": summary.get("max_queries"),
+        "deadline": deadline,
+    }
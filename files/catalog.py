@@ -0,0 +1,259 @@
+"""
+Cycle Catalog - Project-level index of research cycles.
+
+Handles:
+- One entry per cycle (.research-cycles.json): phase, timestamps,
+  question/response/paper/gap counts, synthesis and checkpoint state
+- Updating entries as each cycle artifact is written, so status, resume
+  and cycle queries never glob the research/ directory
+- Numeric ordering (cycle-1000 sorts after cycle-999)
+- Rebuilding from the research/ directory (and cycle archives) for
+  projects that predate it
+"""
+
+import json
+import re
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING, List, Optional
+
+from .fileops import atomic_write
+
+if TYPE_CHECKING:
+    from .project import ProjectManager
+
+
+def _now() -> str:
+    return datetime.now().isoformat()
+
+
+def parse_since(value: str) -> datetime:
+    """
+    Parse a --since value: an ISO date/timestamp, or a relative age like 7d, 12h, 30m.
+
+    Raises:
+        ValueError: If the value is neither
+    """
+    match = re.fullmatch(r"(\d+(?:\.\d+)?)\s*([dhm])", value.strip())
+    if match:
+        amount, unit = float(match.group(1)), match.group(2)
+        delta = {"d": timedelta(days=amount), "h": timedelta(hours=amount),
+                 "m": timedelta(minutes=amount)}[unit]
+        return datetime.now() - delta
+    try:
+        return datetime.fromisoformat(value.strip())
+    except ValueError:
+        raise ValueError(f"Invalid --since '{value}'. Use a date (2025-01-31), "
+                         f"a timestamp, or an age such as 7d or 12h.")
+
+
+class CycleCatalog:
+    """Catalog of one project's cycles, kept in step with every cycle write."""
+
+    CATALOG_FILE = ".research-cycles.json"
+    REBUILD_HINT = "run 'rv cycles rebuild'"
+
+    def __init__(self, project_manager: "ProjectManager"):
+        """
+        Initialize cycle catalog.
+
+        Args:
+            project_manager: ProjectManager of the project the catalog belongs to
+        """
+        self.pm = project_manager
+        self._cycles: Optional[dict] = None
+        self._mtime: Optional[float] = None
+
+    @property
+    def path(self) -> Path:
+        return self.pm.root / self.CATALOG_FILE
+
+    # === Reading ===
+
+    def list(self, phase: Optional[str] = None, since: Optional[datetime] = None) -> List[dict]:
+        """
+        Cycles in numeric order, optionally filtered.
+
+        Args:
+            phase: Only cycles run in this phase
+            since: Only cycles updated at or after this time
+        """
+        cycles = sorted(self._load().values(), key=lambda c: c["cycle_num"])
+        if phase:
+            cycles = [c for c in cycles if c.get("phase") == phase]
+        if since:
+            cycles = [c for c in cycles if c.get("updated") and datetime.fromisoformat(c["updated"]) >= since]
+        return cycles
+
+    def get(self, cycle_num: int) -> Optional[dict]:
+        return self._load().get(str(cycle_num))
+
+    def latest_checkpoint(self) -> Optional[dict]:
+        """Entry of the highest-numbered cycle with a checkpoint."""
+        checkpointed = [c for c in self.list() if c.get("checkpoint")]
+        return checkpointed[-1] if checkpointed else None
+
+    def summary(self) -> dict:
+        cycles = self.list()
+        return {
+            "cycles": len(cycles),
+            "synthesized": sum(1 for c in cycles if c.get("synthesis")),
+            "questions": sum(c.get("questions", 0) for c in cycles),
+            "responses": sum(c.get("responses", 0) for c in cycles),
+            "papers_found": sum(c.get("papers", 0) for c in cycles),
+            "new_gaps": sum(c.get("new_gaps", 0) for c in cycles),
+            "latest": cycles[-1]["cycle_num"] if cycles else None,
+        }
+
+    # === Incremental updates ===
+
+    def questions_saved(self, cycle_num: int, count: int, phase: Optional[str] = None):
+        def update(entry):
+            entry["questions"] = count
+            if phase:
+                entry["phase"] = phase
+        self._update(cycle_num, update)
+
+    def response_saved(self, cycle_num: int, responses: int, papers: int):
+        def update(entry):
+            entry["responses"] = responses
+            entry["papers"] = entry.get("papers", 0) + papers
+        self._update(cycle_num, update)
+
+    def synthesis_saved(self, cycle_num: int, new_gaps: int, papers: Optional[int] = None,
+                        completed: bool = False):
+        def update(entry):
+            entry["synthesis"] = True
+            entry["new_gaps"] = entry.get("new_gaps", 0) + new_gaps
+            if papers is not None:
+                entry["papers"] = papers
+            entry["completed" if completed else "synthesized"] = _now()
+        self._update(cycle_num, update)
+
+    def checkpoint_saved(self, cycle_num: int, phase: Optional[str] = None):
+        def update(entry):
+            entry["checkpoint"] = True
+            if phase:
+                entry["phase"] = phase
+        self._update(cycle_num, update)
+
+    def cycles_archived(self, cycle_nums: List[int], archive_name: str):
+        with self.pm.backend.lock.exclusive():
+            cycles = self._load()
+            for cycle_num in cycle_nums:
+                entry = cycles.setdefault(str(cycle_num), self._new_entry(cycle_num))
+                entry["archived"] = archive_name
+            self._save(cycles)
+
+    def _update(self, cycle_num: int, update):
+        # Read-modify-write under the project lock; other rv processes may write too
+        with self.pm.backend.lock.exclusive():
+            cycles = self._load()
+            entry = cycles.setdefault(str(cycle_num), self._new_entry(cycle_num))
+            update(entry)
+            entry["updated"] = _now()
+            self._save(cycles)
+
+    @staticmethod
+    def _new_entry(cycle_num: int) -> dict:
+        return {
+            "cycle_num": cycle_num,
+            "phase": None,
+            "started": _now(),
+            "updated": None,
+            "completed": None,
+            "synthesized": None,
+            "questions": 0,
+            "responses": 0,
+            "papers": 0,
+            "new_gaps": 0,
+            "synthesis": False,
+            "checkpoint": False,
+            "archived": None,
+        }
+
+    # === Storage ===
+
+    def rebuild(self) -> dict:
+        """Rebuild the catalog from the research/ directory and cycle metadata."""
+        cycles = {}
+        metadata = self.pm.backend.list_cycle_metadata()
+        files = self.pm.cycle_files
+
+        for cycle_num in files.cycle_numbers():
+            cycle_dir = files.cycle_dir(cycle_num)
+            meta = metadata.get(cycle_num, {})
+            entry = self._new_entry(cycle_num)
+            # Archived cycles keep their timestamps in metadata only
+            entry["started"] = _file_time(cycle_dir / "questions.md") or _file_time(cycle_dir)
+            entry["updated"] = (_file_time(cycle_dir) or meta.get("synthesized")
+                                or meta.get("completed") or entry["started"])
+
+            questions = files.read_text(cycle_num, "questions.md")
+            if questions is not None:
+                entry["questions"] = len(re.findall(r"^## Q\d+", questions, re.MULTILINE))
+            entry["responses"] = self.pm.backend.count_responses(cycle_num)
+            entry["papers"] = meta.get("papers_found", 0)
+            entry["new_gaps"] = meta.get("new_gaps", 0) + meta.get("new_gaps_added", 0)
+            entry["completed"] = meta.get("completed")
+            entry["synthesized"] = meta.get("synthesized")
+            entry["synthesis"] = files.exists(cycle_num, "synthesis.md")
+            entry["archived"] = files.archive_name(cycle_num)
+
+            checkpoint = files.read_text(cycle_num, "checkpoint.json")
+            if checkpoint is not None:
+                entry["checkpoint"] = True
+                try:
+                    entry["phase"] = json.loads(checkpoint).get("phase")
+                except ValueError:
+                    pass
+
+            cycles[str(cycle_num)] = entry
+
+        with self.pm.backend.lock.exclusive():
+            self._save(cycles)
+        return cycles
+
+    def _load(self) -> dict:
+        # Re-read if another rv process has updated the catalog since
+        mtime = _mtime(self.path)
+        if self._cycles is None or mtime != self._mtime:
+            if mtime is None:
+                return self.rebuild()
+            self._cycles = json.loads(self.path.read_text()).get("cycles", {})
+            self._mtime = mtime
+        return self._cycles
+
+    def _save(self, cycles: dict):
+        atomic_write(self.path, json.dumps({"cycles": cycles}, indent=1))
+        self._cycles = cycles
+        self._mtime = _mtime(self.path)
+
+
+def format_cycle_line(cycle: dict) -> str:
+    """One-line summary of a catalog entry for terminal listings."""
+    if cycle.get("synthesis"):
+        status = "✓ synthesized"
+    elif cycle.get("checkpoint"):
+        status = "checkpointed"
+    else:
+        status = "in progress"
+    if cycle.get("archived"):
+        status += " (archived)"
+    when = (cycle.get("updated") or cycle.get("started") or "")[:16].replace("T", " ")
+    return (f"cycle-{cycle['cycle_num']:03d}  {cycle.get('phase') or '-':<12} "
+            f"Q {cycle.get('responses', 0)}/{cycle.get('questions', 0)}  "
+            f"papers {cycle.get('papers', 0):<3} gaps +{cycle.get('new_gaps', 0):<2} "
+            f"{when}  {status}")
+
+
+def _mtime(path: Path) -> Optional[float]:
+    try:
+        return path.stat().st_mtime
+    except OSError:
+        return None
+
+
+def _file_time(path: Path) -> Optional[str]:
+    mtime = _mtime(path)
+    return datetime.fromtimestamp(mtime).isoformat() if mtime is not None else None
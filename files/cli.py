@@ -5,23 +5,60 @@ Research Verifier CLI - Automates research verification loops between Claude and
 Natural commands:
     rv new <project-name>     Create a new research project
     rv ask <question>         Send a question to Alphaxiv and capture response
-    rv cycle <question>       Run a single cycle with a specific question (Claude Code orchestrated)
+    rv ask --batch FILE|-     Ask many questions in one browser session, JSONL out [-o FILE]
+    rv cycle <question>...    Run a cycle with specific questions in one browser session
+                              (Claude Code orchestrated) [-f FILE|-] [-j TABS] [-n N appends]
     rv run [--cycles N]       Run N verification cycles (default: 2)
+           [--max-minutes M] [--max-queries Q] [--deadline HH:MM]
     rv synthesize <N>         Save synthesis for cycle N
     rv gaps [list|add|resolve] Manage research gaps
-    rv status                 Show current project status
+    rv papers [list|compact]  Show the paper registry / fold its log into papers.yaml
+    rv papers top             Most central papers in the co-citation graph
+    rv papers dedupe          Merge probable duplicate papers [--dry-run]
+    rv papers fetch           Download paper PDFs into resources/downloads/ [-j N] [--mirror DIR]
+    rv papers extract         Extract and chunk the downloaded PDFs' text for rv search [-j N]
+    rv papers text <id>       Print a downloaded paper's extracted text
+    rv blobs [stats|gc|check|pack|show]  Maintain the response blob store
+    rv report                 Render templates/REPORT_TEMPLATE.md into results/REPORT.md
+    rv hypothesis log         List hypothesis versions and what changed in each
+    rv hypothesis diff vN [vM] Compare two hypothesis versions (default vM: current)
+    rv simulate               Project run time for concurrency/pacing settings
+    rv bench [e2e|serve]      Benchmark against a local mock Alphaxiv server
+    rv bench storage          Time storage operations on synthetic projects of growing size
+    rv status [--json]        Show current project status
+    rv cycles list            List cycles [--phase P] [--since 7d|DATE]
+    rv search <query>         Full-text search over responses, syntheses and paper text
+    rv archive --older-than N Pack finished cycles older than N days into research/archive/
+    rv import yaml            Move papers, gaps, responses and state into SQLite
+    rv export yaml            Write the SQLite store back out as YAML files
+    rv export --format parquet|arrow  Append new cycles to columnar analytics tables
     rv resume                 Resume from last checkpoint
     rv login                  Open browser for manual Alphaxiv login
 """
 
 import argparse
 import asyncio
+import contextlib
+import json
 import sys
 from pathlib import Path
 
+from . import batch, bench, downloads, fulltext
 from .orchestrator import ResearchOrchestrator
+from .persistence import AsyncPersistence
 from .alphaxiv import AlphaxivClient
+from .mock_server import MockAlphaxivServer, MockConfig
+from .budget import parse_deadline
+from .archive import archive_cycles, default_codec, zstandard
+from .hypotheses import parse_version
+from .catalog import format_cycle_line, parse_since
+from .columnar import EXPORT_FORMATS, export_columnar
+from .papers import canonical_arxiv_id
 from .project import ProjectManager
+from .report import ReportBuilder
+from .storage import STORAGE_BACKENDS
+from .search import fts5_available, hits_to_json, print_hits, search_projects
+from .simulate import LatencyModel, RunSimulator, print_report
 
 
 def main():
@@ -35,23 +72,159 @@ def main():
     new_parser = subparsers.add_parser('new', help='Create a new research project')
     new_parser.add_argument('name', help='Project name')
     new_parser.add_argument('--path', '-p', default='.', help='Parent directory (default: current)')
+    new_parser.add_argument('--storage', choices=STORAGE_BACKENDS, default='yaml',
+                            help='Storage backend (default: yaml; sqlite for large projects)')
 
     # rv ask <question>
     ask_parser = subparsers.add_parser('ask', help='Send a question to Alphaxiv')
-    ask_parser.add_argument('question', nargs='+', help='Question to ask')
+    ask_parser.add_argument('question', nargs='*', help='Question to ask')
     ask_parser.add_argument('--save', '-s', action='store_true', help='Save response to project')
+    ask_parser.add_argument('--batch', metavar='FILE',
+                            help="Ask every question in FILE (one per line; '-' for stdin)")
+    ask_parser.add_argument('--output', '-o',
+                            help='With --batch: append JSONL here and resume from it (default: stdout)')
+    ask_parser.add_argument('--concurrency', '-j', type=int, default=2,
+                            help='With --batch: browser tabs querying at once (default: 2)')
+    ask_parser.add_argument('--timeout', type=int, default=120,
+                            help='Seconds to wait for each response (default: 120)')
 
     # rv run
     run_parser = subparsers.add_parser('run', help='Run verification cycles')
     run_parser.add_argument('--cycles', '-c', type=int, default=2, help='Number of cycles (default: 2)')
     run_parser.add_argument('--phase', '-p', choices=['expansive', 'integrative', 'synthesis'], 
                            help='Force a specific phase type')
+    run_parser.add_argument('--max-minutes', type=float,
+                            help='Stop cleanly after this many minutes of wall-clock time')
+    run_parser.add_argument('--max-queries', type=int,
+                            help='Stop cleanly after this many Alphaxiv queries')
+    run_parser.add_argument('--deadline',
+                            help='Stop cleanly before this time (HH:MM or ISO timestamp)')
+    run_parser.add_argument('--profile', action='store_true',
+                            help='Write a Chrome trace (trace.json) of each cycle into its directory')
+    run_parser.add_argument('--profile-cpu', action='store_true',
+                            help='Also write a cProfile profile.prof per cycle (implies --profile)')
+
+    # rv simulate
+    sim_parser = subparsers.add_parser('simulate', help='Estimate run time without querying Alphaxiv')
+    sim_parser.add_argument('--projects', nargs='+', default=['.'],
+                            help='Project directories to run together (default: current)')
+    sim_parser.add_argument('--cycles', '-c', type=int, default=20, help='Cycles per project (default: 20)')
+    sim_parser.add_argument('--concurrency', nargs='+', type=int, default=[1],
+                            help='Concurrent project runs to compare (e.g. 1 2 4)')
+    sim_parser.add_argument('--pacing', nargs='+', type=float,
+                            default=[ResearchOrchestrator.QUERY_DELAY],
+                            help='Delays between questions to compare, in seconds')
+    sim_parser.add_argument('--max-minutes', type=float, help='Per-project budget, as for rv run')
+    sim_parser.add_argument('--contention', type=float, default=0.0,
+                            help='Fractional slowdown per extra concurrent query (default: 0)')
+    sim_parser.add_argument('--seed', type=int, default=0, help='Random seed')
+
+    # rv bench [e2e|serve] - Offline benchmarks against a mock Alphaxiv server
+    bench_parser = subparsers.add_parser('bench', help='Run offline performance benchmarks')
+    bench_sub = bench_parser.add_subparsers(dest='bench_command')
+
+    mock_args = argparse.ArgumentParser(add_help=False)
+    mock_args.add_argument('--answer-chars', type=int, default=MockConfig.answer_chars,
+                           help='Characters per mock answer')
+    mock_args.add_argument('--stream-rate', type=float, default=MockConfig.stream_chars_per_second,
+                           help='Mock streaming speed (chars/second)')
+    mock_args.add_argument('--first-token-delay', type=float, default=MockConfig.first_token_delay,
+                           help='Seconds before the mock answer starts streaming')
+    mock_args.add_argument('--papers', type=int, default=MockConfig.papers_per_answer,
+                           help='Paper links per mock answer')
+
+    e2e_parser = bench_sub.add_parser('e2e', parents=[mock_args],
+                                      help='Benchmark AlphaxivClient and run_cycles end to end')
+    e2e_parser.add_argument('--queries', '-q', type=int, default=5, help='Raw client queries (default: 5)')
+    e2e_parser.add_argument('--cycles', '-c', type=int, default=1, help='Orchestrated cycles (default: 1)')
+    e2e_parser.add_argument('--show-browser', action='store_true', help='Run the browser visibly')
+    e2e_parser.add_argument('--output', '-o', help='Write results JSON to this file')
+    e2e_parser.add_argument('--baseline', '-b', help='Fail if results regress against this results JSON')
+    e2e_parser.add_argument('--tolerance', type=float, default=0.2,
+                            help='Allowed regression before failing (default: 0.2 = 20%%)')
+
+    serve_parser = bench_sub.add_parser('serve', parents=[mock_args], help='Run the mock Alphaxiv server')
+    serve_parser.add_argument('--port', type=int, default=8765, help='Port (default: 8765)')
+
+    storage_bench = bench_sub.add_parser('storage', help='Time storage operations on synthetic projects')
+    storage_bench.add_argument('--cycles', type=int, default=bench.ProjectScale.cycles,
+                               help='Cycles in the largest project (default: 1000)')
+    storage_bench.add_argument('--papers', type=int, default=bench.ProjectScale.papers,
+                               help='Papers in the largest project (default: 50000)')
+    storage_bench.add_argument('--gaps', type=int, default=bench.ProjectScale.gaps,
+                               help='Gaps in the largest project (default: 2000)')
+    storage_bench.add_argument('--scales', nargs='+', type=float, default=[0.1, 0.3, 1.0],
+                               help='Project sizes to compare, as fractions of the above (default: 0.1 0.3 1)')
+    storage_bench.add_argument('--storage', choices=STORAGE_BACKENDS, default='yaml',
+                               help='Storage backend (default: yaml)')
+    storage_bench.add_argument('--repeat', type=int, default=5, help='Timed calls per operation (default: 5)')
+    storage_bench.add_argument('--seed', type=int, default=0, help='Random seed')
+    storage_bench.add_argument('--keep', type=Path, default=None,
+                               help='Keep the generated projects in this directory')
+    storage_bench.add_argument('--output', '-o', help='Write results JSON to this file')
+    storage_bench.add_argument('--baseline', '-b', help='Fail if results regress against this results JSON')
+    storage_bench.add_argument('--tolerance', type=float, default=0.2,
+                               help='Allowed regression before failing (default: 0.2 = 20%%)')
 
     # rv status
-    subparsers.add_parser('status', help='Show current project status')
+    status_parser = subparsers.add_parser('status', help='Show current project status')
+    status_parser.add_argument('--json', action='store_true', help='Print status as JSON')
+
+    # rv cycles list - Query the cycle catalog
+    cycles_parser = subparsers.add_parser('cycles', help='Query the cycle catalog')
+    cycles_sub = cycles_parser.add_subparsers(dest='cycles_command')
+    cycles_list = cycles_sub.add_parser('list', help='List cycles')
+    cycles_list.add_argument('--phase', choices=['expansive', 'integrative', 'synthesis'],
+                             help='Only cycles run in this phase')
+    cycles_list.add_argument('--since', help='Only cycles updated since a date/time or age (e.g. 7d, 12h)')
+    cycles_list.add_argument('--json', action='store_true', help='Print cycles as JSON')
+    cycles_sub.add_parser('rebuild', help='Rebuild the catalog from the research/ directory')
+
+    # rv search <query>
+    search_parser = subparsers.add_parser('search', help='Full-text search over responses, syntheses and papers')
+    search_parser.add_argument('query', nargs='*',
+                               help='Words (all must match), "exact phrases", prefix*, OR, NOT')
+    search_parser.add_argument('--limit', '-n', type=int, default=10, help='Maximum results (default: 10)')
+    search_parser.add_argument('--kind', choices=['response', 'synthesis', 'paper'], help='Only search one kind')
+    search_parser.add_argument('--projects', nargs='+', default=['.'],
+                               help='Project directories to search (default: current)')
+    search_parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    search_parser.add_argument('--rebuild', action='store_true', help='Re-index the projects first')
+
+    # rv archive --older-than N
+    archive_parser = subparsers.add_parser('archive', help='Pack old finished cycles into compressed archives')
+    archive_parser.add_argument('--older-than', required=True,
+                                help='Archive cycles last updated more than N days ago (or an age such as 12h)')
+    archive_parser.add_argument('--per-archive', type=int, default=50,
+                                help='Maximum cycles per archive file (default: 50)')
+    archive_parser.add_argument('--codec', choices=['zstd', 'xz'],
+                                help='Compression (default: zstd if installed, else xz)')
+    archive_parser.add_argument('--dry-run', action='store_true', help='Show what would be archived')
+
+    # rv import yaml / rv export yaml - Convert between storage backends
+    import_parser = subparsers.add_parser('import', help='Import the YAML layout into SQLite storage')
+    import_parser.add_argument('format', choices=['yaml'], help='Source format')
+    import_parser.add_argument('--force', action='store_true',
+                               help='Re-import even if the project already uses SQLite')
+
+    # rv export --format parquet|arrow - Columnar analytics tables
+    export_parser = subparsers.add_parser('export', help='Export project storage or analytics tables')
+    export_parser.add_argument('format', nargs='?', choices=['yaml', *EXPORT_FORMATS], help='Target format')
+    export_parser.add_argument('--format', dest='format_option', choices=['yaml', *EXPORT_FORMATS],
+                               help='Target format (same as the positional argument)')
+    export_parser.add_argument('--output', '-o', type=Path, default=None,
+                               help='Directory for parquet/arrow tables (default: results/export)')
+    export_parser.add_argument('--full', action='store_true',
+                               help='Export every cycle again instead of appending new ones')
 
     # rv resume
-    subparsers.add_parser('resume', help='Resume from last checkpoint')
+    resume_parser = subparsers.add_parser('resume', help='Resume from last checkpoint')
+    resume_parser.add_argument('--max-minutes', type=float,
+                               help='Time budget (default: the interrupted run\'s)')
+    resume_parser.add_argument('--max-queries', type=int,
+                               help='Query budget (default: the interrupted run\'s)')
+    resume_parser.add_argument('--deadline',
+                               help='Stop before this time (default: the interrupted run\'s)')
 
     # rv login
     login_parser = subparsers.add_parser('login', help='Open browser for Alphaxiv login')
@@ -62,12 +235,19 @@ def main():
     run_parser.add_argument('--debug', '-d', action='store_true',
                             help='Enable debug mode for troubleshooting')
 
-    # rv cycle <question> - Single cycle with specific question (Claude Code orchestrated)
-    cycle_parser = subparsers.add_parser('cycle', help='Run a single research cycle with a specific question')
-    cycle_parser.add_argument('question', nargs='+', help='The question to send to Alphaxiv')
+    # rv cycle <question>... - Single cycle with specific questions (Claude Code orchestrated)
+    cycle_parser = subparsers.add_parser('cycle', help='Run a single research cycle with specific questions')
+    cycle_parser.add_argument('question', nargs='*',
+                              help='Questions to send to Alphaxiv (quote each one)')
+    cycle_parser.add_argument('--file', '-f', metavar='FILE',
+                              help="Also ask every question in FILE (one per line; '-' for stdin)")
+    cycle_parser.add_argument('--parallel', '-j', type=int, default=1,
+                              help='Browser tabs querying at once, each its own conversation '
+                                   '(default: 1, all questions in one conversation)')
     cycle_parser.add_argument('--phase', '-p', choices=['expansive', 'integrative', 'synthesis'],
                               default='expansive', help='Phase label for this cycle')
-    cycle_parser.add_argument('--cycle-num', '-n', type=int, help='Override cycle number')
+    cycle_parser.add_argument('--cycle-num', '-n', type=int,
+                              help='Add to cycle N (with no questions: re-ask its unanswered ones)')
     cycle_parser.add_argument('--debug', '-d', action='store_true', help='Enable debug mode')
 
     # rv synthesize <cycle-num> - Save synthesis for a cycle
@@ -90,6 +270,72 @@ def main():
     resolve_gap.add_argument('gap_id', type=int, help='Gap ID to resolve')
     resolve_gap.add_argument('--reason', '-r', required=True, help='How it was resolved')
 
+    # rv papers [list|compact] - Paper registry
+    papers_parser = subparsers.add_parser('papers', help='Manage the paper registry')
+    papers_sub = papers_parser.add_subparsers(dest='papers_command')
+
+    papers_sub.add_parser('list', help='List registered papers')
+    papers_sub.add_parser('compact', help='Fold the append-only paper log into papers.yaml')
+    papers_top = papers_sub.add_parser('top', help='Most central papers in the co-citation graph')
+    papers_top.add_argument('--limit', '-n', type=int, default=10, help='Number of papers (default: 10)')
+    papers_top.add_argument('--by', choices=['pagerank', 'degree'], default='pagerank',
+                            help='Centrality measure (default: pagerank)')
+    papers_top.add_argument('--json', action='store_true', help='Print papers as JSON')
+    papers_top.add_argument('--rebuild', action='store_true', help='Rebuild the graph from saved responses first')
+    papers_dedupe = papers_sub.add_parser('dedupe', help='Merge probable duplicate papers')
+    papers_dedupe.add_argument('--dry-run', action='store_true', help='Only report the duplicates found')
+    papers_dedupe.add_argument('--threshold', type=float, default=None,
+                               help='Title similarity needed, 0-1 (default: 0.8)')
+    papers_dedupe.add_argument('--rebuild', action='store_true', help='Rebuild the title index first')
+    papers_fetch = papers_sub.add_parser('fetch', help='Download paper PDFs into resources/downloads/')
+    papers_fetch.add_argument('ids', nargs='*', help='Only these arXiv IDs (default: every registered paper)')
+    papers_fetch.add_argument('--concurrency', '-j', type=int, default=4,
+                              help='Downloads in flight at once (default: 4)')
+    papers_fetch.add_argument('--rate', type=float, default=downloads.DEFAULT_RATE,
+                              help='Requests per second to each host (default: 0.33; 0 for no limit)')
+    papers_fetch.add_argument('--mirror', type=Path, help='Copy PDFs from this directory when present')
+    papers_fetch.add_argument('--offline', action='store_true', help='Only use --mirror, never the network')
+    papers_fetch.add_argument('--base-url', default=downloads.ARXIV_PDF_URL,
+                              help='Where arXiv PDFs are fetched from (default: https://arxiv.org/pdf/)')
+    papers_fetch.add_argument('--limit', type=int, help='Fetch at most this many papers')
+    papers_fetch.add_argument('--verify', action='store_true',
+                              help='Re-check finished files against the manifest checksums')
+    papers_extract = papers_sub.add_parser('extract', help='Extract and chunk the text of downloaded PDFs')
+    papers_extract.add_argument('--jobs', '-j', type=int, default=None,
+                                help='Worker processes (default: CPU count)')
+    papers_extract.add_argument('--force', action='store_true', help='Extract every PDF again')
+    papers_text = papers_sub.add_parser('text', help="Print a downloaded paper's extracted text")
+    papers_text.add_argument('arxiv_id', help='arXiv ID of the paper')
+    papers_text.add_argument('--page', type=int, help='Only passages starting on this page')
+
+    # rv blobs - Content-addressed response store
+    blobs_parser = subparsers.add_parser('blobs', help='Maintain the response blob store')
+    blobs_sub = blobs_parser.add_subparsers(dest='blobs_command')
+    blobs_sub.add_parser('stats', help='Show blob store size and deduplication')
+    blobs_gc = blobs_sub.add_parser('gc', help='Delete blobs no response refers to')
+    blobs_gc.add_argument('--dry-run', action='store_true', help='Only report what would be deleted')
+    blobs_sub.add_parser('check', help='Verify blob hashes and response references')
+    blobs_sub.add_parser('pack', help='Move inline response text from older cycles into the store')
+    blobs_show = blobs_sub.add_parser('show', help='Print a blob')
+    blobs_show.add_argument('ref', help='Blob reference or a unique prefix of its hash')
+
+    # rv hypothesis [log|diff] - Version history
+    hyp_parser = subparsers.add_parser('hypothesis', help='Show hypothesis version history')
+    hyp_sub = hyp_parser.add_subparsers(dest='hypothesis_command')
+    hyp_log = hyp_sub.add_parser('log', help='List versions and what changed in each')
+    hyp_log.add_argument('--json', action='store_true', help='Print the log as JSON')
+    hyp_diff = hyp_sub.add_parser('diff', help='Compare two hypothesis versions')
+    hyp_diff.add_argument('from_version', help='Version to compare from, e.g. v1')
+    hyp_diff.add_argument('to_version', nargs='?', help='Version to compare to (default: current)')
+    hyp_diff.add_argument('--json', action='store_true', help='Print the diff as JSON')
+
+    # rv report - Verification report from REPORT_TEMPLATE.md
+    report_parser = subparsers.add_parser('report', help='Render the verification report')
+    report_parser.add_argument('--template', type=Path, default=None,
+                               help='Report template (default: templates/REPORT_TEMPLATE.md)')
+    report_parser.add_argument('--force', action='store_true',
+                               help='Re-render every section, ignoring the dependency manifest')
+
     args = parser.parse_args()
 
     if args.command is None:
@@ -105,7 +351,7 @@ async def dispatch(args):
     
     if args.command == 'new':
         pm = ProjectManager()
-        project_path = pm.create_project(args.name, args.path)
+        project_path = pm.create_project(args.name, args.path, storage=args.storage)
         print(f"✓ Created research project: {project_path}")
         print(f"\nNext steps:")
         print(f"  1. cd {project_path}")
@@ -119,14 +365,27 @@ async def dispatch(args):
         print("✓ Browser session saved. You can now run automated queries.")
 
     elif args.command == 'ask':
+        if args.batch:
+            if args.question:
+                print("✗ Give either a question or --batch, not both")
+                sys.exit(1)
+            await ask_batch(args)
+            return
+        if not args.question:
+            print("✗ Give a question, or --batch FILE")
+            sys.exit(1)
+
         question = ' '.join(args.question)
         client = AlphaxivClient()
         print(f"→ Sending to Alphaxiv: {question[:80]}...")
-        response = await client.query(question)
-        print(f"\n{response['text']}")
-        if response['papers']:
-            print(f"\n📚 Papers found: {len(response['papers'])}")
-            for paper in response['papers'][:5]:
+        try:
+            response = await client.query(question, timeout_seconds=args.timeout)
+        finally:
+            await client.close()
+        print(f"\n{response.text}")
+        if response.papers:
+            print(f"\n📚 Papers found: {len(response.papers)}")
+            for paper in response.papers[:5]:
                 print(f"  • {paper['title']}: {paper['url']}")
 
     elif args.command == 'run':
@@ -135,19 +394,249 @@ async def dispatch(args):
             print("✗ Not in a research project directory. Run 'rv new <name>' first.")
             sys.exit(1)
 
+        deadline = None
+        if args.deadline:
+            try:
+                deadline = parse_deadline(args.deadline)
+            except ValueError as e:
+                print(f"✗ {e}")
+                sys.exit(1)
+
         debug = getattr(args, 'debug', False)
-        orchestrator = ResearchOrchestrator(pm, debug=debug)
+        orchestrator = ResearchOrchestrator(pm, debug=debug, profile=args.profile,
+                                            profile_cpu=args.profile_cpu)
         await orchestrator.run_cycles(
             num_cycles=args.cycles,
-            phase_override=args.phase
+            phase_override=args.phase,
+            max_minutes=args.max_minutes,
+            max_queries=args.max_queries,
+            deadline=deadline,
         )
 
+    elif args.command == 'simulate':
+        roots = [Path(p).resolve() for p in args.projects]
+        for root in roots:
+            if not ProjectManager(root).is_project_dir():
+                print(f"✗ Not a research project directory: {root}")
+                sys.exit(1)
+
+        model = LatencyModel.fit(roots)
+        simulator = RunSimulator(roots, model, num_cycles=args.cycles,
+                                 max_minutes=args.max_minutes,
+                                 contention=args.contention, seed=args.seed)
+        print(f"→ Simulating {len(args.concurrency) * len(args.pacing)} setting(s)...")
+        results = await asyncio.to_thread(simulator.sweep, args.concurrency, args.pacing)
+        print_report(results, model, len(roots), args.cycles)
+
+    elif args.command == 'bench':
+        if args.bench_command is None:
+            print("✗ Choose a benchmark: rv bench e2e | rv bench serve | rv bench storage")
+            sys.exit(1)
+
+        if args.bench_command == 'storage':
+            base = bench.ProjectScale(cycles=args.cycles, papers=args.papers, gaps=args.gaps)
+            print(f"→ Generating synthetic projects at {', '.join(f'{s:g}' for s in sorted(args.scales))}× "
+                  f"({args.cycles} cycles, {args.papers} papers, {args.gaps} gaps)...")
+            results = bench.run_storage(base, args.scales, storage=args.storage, repeat=args.repeat,
+                                        seed=args.seed, keep_dir=args.keep)
+            bench.print_storage_results(results)
+        else:
+            config = MockConfig(
+                answer_chars=args.answer_chars,
+                stream_chars_per_second=args.stream_rate,
+                first_token_delay=args.first_token_delay,
+                papers_per_answer=args.papers,
+            )
+
+        if args.bench_command == 'serve':
+            server = MockAlphaxivServer(config, port=args.port)
+            print(f"✓ Mock Alphaxiv serving at {server.url} (Ctrl+C to stop)")
+            print(f"  Paper PDFs at {server.pdf_url} (rv papers fetch --base-url)")
+            try:
+                await asyncio.to_thread(server.serve_forever)
+            finally:
+                server.stop()
+
+        elif args.bench_command == 'e2e':
+            print(f"→ Benchmarking {args.queries} queries and {args.cycles} cycle(s) against mock Alphaxiv...")
+            results = await bench.run_e2e(config, args.queries, args.cycles,
+                                          headless=not args.show_browser)
+            bench.print_results(results)
+
+        if args.bench_command in ('e2e', 'storage'):
+            if args.output:
+                Path(args.output).write_text(json.dumps(results, indent=2))
+                print(f"✓ Results saved to {args.output}")
+
+            if args.baseline:
+                baseline = json.loads(Path(args.baseline).read_text())
+                regressions = bench.compare(results, baseline, args.tolerance)
+                if regressions:
+                    print(f"✗ {len(regressions)} regression(s) against {args.baseline}:")
+                    for line in regressions:
+                        print(f"  • {line}")
+                    sys.exit(1)
+                print(f"✓ No regressions against {args.baseline}")
+
     elif args.command == 'status':
         pm = ProjectManager()
         if not pm.is_project_dir():
             print("✗ Not in a research project directory.")
             sys.exit(1)
-        pm.print_status()
+        if args.json:
+            print(json.dumps(pm.status_dict(), indent=2))
+        else:
+            pm.print_status()
+
+    elif args.command == 'cycles':
+        pm = ProjectManager()
+        if not pm.is_project_dir():
+            print("✗ Not in a research project directory.")
+            sys.exit(1)
+
+        if args.cycles_command == 'rebuild':
+            cycles = pm.catalog.rebuild()
+            print(f"✓ Catalogued {len(cycles)} cycles")
+            return
+
+        since = None
+        if getattr(args, 'since', None):
+            try:
+                since = parse_since(args.since)
+            except ValueError as e:
+                print(f"✗ {e}")
+                sys.exit(1)
+
+        cycles = pm.catalog.list(phase=getattr(args, 'phase', None), since=since)
+        if getattr(args, 'json', False):
+            print(json.dumps(cycles, indent=2))
+        elif not cycles:
+            print("No matching cycles.")
+        else:
+            print(f"\n📁 Cycles ({len(cycles)}):\n")
+            for cycle in cycles:
+                print(f"  {format_cycle_line(cycle)}")
+
+    elif args.command == 'search':
+        if not fts5_available():
+            print("✗ rv search needs SQLite with FTS5 support (rebuild Python against a newer SQLite).")
+            sys.exit(1)
+
+        managers = [ProjectManager(Path(p).resolve()) for p in args.projects]
+        for pm in managers:
+            if not pm.is_project_dir():
+                print(f"✗ Not a research project directory: {pm.root}")
+                sys.exit(1)
+
+        if args.rebuild:
+            for pm in managers:
+                count = pm.search_index.rebuild()
+                if not args.json:
+                    print(f"✓ Indexed {count} documents in {pm.root.name}")
+
+        query = ' '.join(args.query)
+        if not query:
+            if not args.rebuild:
+                print("✗ Nothing to search for. Usage: rv search <query>")
+                sys.exit(1)
+            return
+
+        hits, elapsed_ms = search_projects(managers, query, limit=args.limit, kind=args.kind)
+        if args.json:
+            print(hits_to_json(hits))
+        else:
+            print_hits(hits, elapsed_ms, multi_project=len(managers) > 1)
+
+    elif args.command == 'archive':
+        pm = ProjectManager()
+        if not pm.is_project_dir():
+            print("✗ Not in a research project directory.")
+            sys.exit(1)
+        if args.codec == 'zstd' and zstandard is None:
+            print("✗ zstd compression needs zstandard. Install it with: pip install zstandard")
+            sys.exit(1)
+
+        older_than = args.older_than.strip()
+        try:
+            cutoff = parse_since(f"{older_than}d" if older_than.replace('.', '', 1).isdigit() else older_than)
+        except ValueError:
+            print(f"✗ Invalid --older-than '{args.older_than}'. Use a number of days or an age such as 12h.")
+            sys.exit(1)
+
+        results = archive_cycles(pm, cutoff, per_archive=max(1, args.per_archive),
+                                 codec=args.codec, dry_run=args.dry_run)
+        if not results:
+            print("No finished cycles to archive.")
+            return
+
+        for result in results:
+            span = f"cycle-{result.cycles[0]:03d}" + (
+                f"..{result.cycles[-1]:03d}" if len(result.cycles) > 1 else "")
+            if args.dry_run:
+                print(f"  Would archive {span}: {result.files} files, {result.bytes_before / 1024:.1f} KB")
+            else:
+                print(f"  ✓ {span} → research/archive/{result.path.name} "
+                      f"({result.bytes_before / 1024:.1f} KB → {result.bytes_after / 1024:.1f} KB)")
+
+        files = sum(r.files for r in results)
+        before = sum(r.bytes_before for r in results)
+        if args.dry_run:
+            print(f"\n{sum(len(r.cycles) for r in results)} cycles ({files} files) would be archived "
+                  f"with {args.codec or default_codec()}.")
+        else:
+            after = sum(r.bytes_after for r in results)
+            print(f"\n✓ Archived {sum(len(r.cycles) for r in results)} cycles: {files} files in "
+                  f"{len(results)} archive{'s' if len(results) != 1 else ''}, "
+                  f"{before / 1024:.1f} KB → {after / 1024:.1f} KB")
+
+    elif args.command == 'import':
+        pm = ProjectManager()
+        if not pm.is_project_dir():
+            print("✗ Not in a research project directory.")
+            sys.exit(1)
+        if pm.backend.name == 'sqlite' and not args.force:
+            print("✗ Project already uses SQLite storage. Use --force to re-import from the YAML files.")
+            sys.exit(1)
+
+        counts = pm.import_yaml()
+        print(f"✓ Imported {counts['papers']} papers, {counts['gaps']} active gaps, "
+              f"{counts['responses']} responses into {pm.backend.path.name}")
+        print("  Project now uses SQLite storage. Run 'rv export yaml' to refresh the YAML files.")
+
+    elif args.command == 'export':
+        pm = ProjectManager()
+        if not pm.is_project_dir():
+            print("✗ Not in a research project directory.")
+            sys.exit(1)
+
+        fmt = args.format_option or args.format
+        if fmt is None:
+            print(f"✗ Choose a format: rv export yaml, or rv export --format {'|'.join(EXPORT_FORMATS)}")
+            sys.exit(1)
+
+        if fmt == 'yaml':
+            counts = pm.export_yaml()
+            print(f"✓ Exported {counts['papers']} papers, {counts['gaps']} active gaps, "
+                  f"{counts['responses']} responses to the YAML layout")
+            return
+
+        try:
+            result = export_columnar(pm, fmt, output=args.output, full=args.full)
+        except (RuntimeError, ValueError) as e:
+            print(f"✗ {e}")
+            sys.exit(1)
+        if result.cycles_written:
+            print(f"✓ Exported {result.cycles_written} of {result.cycles_total} cycles "
+                  f"({result.rows.get('responses', 0)} responses) as {fmt} to {result.output}")
+        else:
+            print(f"✓ All {result.cycles_total} cycles already exported to {result.output}")
+        if result.parts_replaced:
+            print(f"  Replaced {result.parts_replaced} part{'s' if result.parts_replaced != 1 else ''} "
+                  f"holding cycles that changed")
+        if result.project_tables:
+            print(f"  Papers and gaps tables rewritten ({result.rows.get('papers', 0)} papers, "
+                  f"{result.rows.get('gaps', 0)} gaps)")
+        print(f"  {result.seconds * 1000:.0f} ms")
 
     elif args.command == 'resume':
         pm = ProjectManager()
@@ -155,69 +644,147 @@ async def dispatch(args):
             print("✗ Not in a research project directory.")
             sys.exit(1)
 
+        deadline = None
+        if args.deadline:
+            try:
+                deadline = parse_deadline(args.deadline)
+            except ValueError as e:
+                print(f"✗ {e}")
+                sys.exit(1)
+
         orchestrator = ResearchOrchestrator(pm)
-        await orchestrator.resume()
+        await orchestrator.resume(max_minutes=args.max_minutes, max_queries=args.max_queries,
+                                  deadline=deadline)
 
     elif args.command == 'cycle':
-        # Single cycle with specific question - Claude Code orchestrated
+        # One cycle with specific questions - Claude Code orchestrated
         pm = ProjectManager()
         if not pm.is_project_dir():
             print("✗ Not in a research project directory.")
             sys.exit(1)
 
-        question = ' '.join(args.question)
+        questions = [q.strip() for q in args.question if q.strip()]
+        # An unquoted `rv cycle what is attention` arrives as one-word arguments
+        single_words = [q for q in questions if len(q.split()) == 1]
+        if len(questions) > 1 and len(single_words) == len(questions):
+            print(f"✗ Got {len(questions)} one-word questions - quote each question, "
+                  f"e.g. rv cycle \"{' '.join(questions)}\"")
+            sys.exit(1)
+        if len(questions) > 1 and single_words:
+            print(f"⚠  One-word question(s): {', '.join(single_words)} - "
+                  f"quote each question if that wasn't intended")
+        if args.file:
+            try:
+                questions += batch.read_questions(args.file)
+            except OSError as e:
+                print(f"✗ Could not read questions: {e}")
+                sys.exit(1)
+        questions = list(dict.fromkeys(questions))
+
         cycle_num = args.cycle_num or (pm.state.total_cycles_completed + 1)
         debug = getattr(args, 'debug', False)
 
-        client = AlphaxivClient(headless=False, debug=debug)
-        try:
-            # Start new conversation if this is first cycle
-            await client.new_conversation()
-
-            print(f"\n{'='*60}")
-            print(f"🔄 Cycle {cycle_num} | Phase: {args.phase}")
-            print(f"{'='*60}")
-            print(f"📝 Question: {question[:100]}...")
-
-            response = await client.query(question)
-
-            # Save response
-            pm.save_cycle_questions(cycle_num, [question])
-            pm.save_cycle_response(cycle_num, 1, question, {
-                "text": response.text,
-                "papers": response.papers,
-                "timestamp": response.timestamp,
+        # Questions recorded in the cycle that never got a response (failed, or
+        # the run stopped first); asking one again fills its slot
+        existing = pm.get_cycle_questions(cycle_num)
+        answered = {r["question_num"] for r in pm.iter_responses([cycle_num])}
+        unanswered = {q: n for n, q in enumerate(existing, 1) if n not in answered}
+        if not questions and args.cycle_num and unanswered:
+            questions = list(unanswered)
+            print(f"↩  Re-asking {len(questions)} unanswered question(s) of cycle {cycle_num}")
+        if not questions:
+            print("✗ Give at least one question, or --file FILE")
+            sys.exit(1)
+
+        # Other questions are added after the cycle's existing ones
+        all_questions = list(existing)
+        q_nums = []
+        for question in questions:
+            if question in unanswered:
+                q_nums.append(unanswered.pop(question))
+            else:
+                all_questions.append(question)
+                q_nums.append(len(all_questions))
+        pm.save_cycle_questions(cycle_num, all_questions, args.phase)
+
+        print(f"\n{'='*60}")
+        print(f"🔄 Cycle {cycle_num} | Phase: {args.phase}")
+        print(f"{'='*60}")
+        for q_num, question in zip(q_nums, questions):
+            print(f"📝 Q{q_num}: {question[:100]}...")
+
+        records = []
+
+        def save(record):
+            q_num = q_nums[record.index]
+            records.append(record)
+            if record.error:
+                print(f"    ✗ Q{q_num} error: {record.error}")
+                return
+            # Written on the persistence thread, so the other tabs keep polling meanwhile
+            persistence.save_cycle_response(cycle_num, q_num, record.question, {
+                "text": record.text,
+                "papers": record.papers,
+                "timestamp": record.timings["finished"],
+                "duration_seconds": round(record.timings["query_seconds"], 2),
             })
+            if record.papers:
+                persistence.update_papers(record.papers)
+            print(f"    ✓ Q{q_num} answered ({len(record.papers)} papers, "
+                  f"{record.timings['query_seconds']:.0f}s)")
 
-            # Update state
-            pm.update_state(
-                current_cycle=cycle_num,
-                current_phase=args.phase,
-                total_cycles_completed=cycle_num
-            )
+        client = AlphaxivClient(headless=False, debug=debug)
+        persistence = AsyncPersistence(pm)
+        stopped = None
+        try:
+            await batch.run_batch(client, questions, save, concurrency=args.parallel,
+                                  fresh_conversations=False)
+        except Exception as e:
+            stopped = e
+        finally:
+            await client.close()
+            # Answers received before a stop are still written
+            try:
+                await persistence.close()
+            except Exception as e:
+                print(f"✗ Could not save responses: {e}")
+                sys.exit(1)
+        if stopped is not None:
+            print(f"✗ Cycle {cycle_num} stopped: {stopped}")
+            print(f"   Rerun `rv cycle -n {cycle_num}` to ask the unanswered questions")
+            sys.exit(1)
 
-            # Update papers registry
-            if response.papers:
-                pm._update_papers(response.papers)
+        # Update state
+        pm.update_state(
+            current_cycle=cycle_num,
+            current_phase=args.phase,
+            total_cycles_completed=max(cycle_num, pm.state.total_cycles_completed)
+        )
 
-            # Output for Claude Code to process
-            print(f"\n{'='*60}")
-            print(f"📚 Papers found: {len(response.papers)}")
-            print(f"📄 Response saved to: research/cycle-{cycle_num:03d}/")
-            print(f"{'='*60}")
+        # Output for Claude Code to process, in question order
+        records.sort(key=lambda r: r.index)
+        papers = [p for r in records for p in r.papers]
+        print(f"\n{'='*60}")
+        print(f"📚 Papers found: {len(papers)}")
+        print(f"📄 Responses saved to: research/cycle-{cycle_num:03d}/")
+        print(f"{'='*60}")
 
-            # Print papers found
-            if response.papers:
-                print("\n## Papers:")
-                for paper in response.papers[:10]:
+        for record in records:
+            q_num = q_nums[record.index]
+            heading = f" Q{q_num}" if len(records) > 1 else ""
+            if record.papers:
+                print(f"\n##{heading} Papers:")
+                for paper in record.papers[:10]:
                     print(f"  • [{paper.get('arxiv_id', 'N/A')}] {paper.get('title', 'Unknown')}")
 
             # Print response text for Claude Code to read
-            print("\n## Response:\n")
-            print(response.text)
+            print(f"\n##{heading} Response:\n")
+            print(record.text if not record.error else f"[Error: {record.error}]")
 
-        finally:
-            await client.close()
+        failed = sum(1 for r in records if r.error)
+        if failed:
+            print(f"\n⚠  {failed} question(s) unanswered - rerun `rv cycle -n {cycle_num}` to ask them again")
+            sys.exit(1)
 
     elif args.command == 'synthesize':
         # Save synthesis for a cycle
@@ -266,6 +833,285 @@ async def dispatch(args):
             pm.resolve_gap(args.gap_id, args.reason)
             print(f"✓ Resolved gap #{args.gap_id}")
 
+    elif args.command == 'papers':
+        pm = ProjectManager()
+        if not pm.is_project_dir():
+            print("✗ Not in a research project directory.")
+            sys.exit(1)
+
+        if args.papers_command == 'list' or args.papers_command is None:
+            papers = pm.get_papers()
+            if not papers:
+                print("No papers collected yet.")
+            else:
+                print(f"\n📚 Papers ({len(papers)}):\n")
+                for paper in papers:
+                    print(f"  • [{paper.get('arxiv_id') or 'N/A'}] {paper.get('title', 'Unknown')}")
+
+        elif args.papers_command == 'compact':
+            before, after = pm.compact_papers()
+            print(f"✓ Compacted paper registry: {before} entries → {after} papers")
+
+        elif args.papers_command == 'dedupe':
+            if args.rebuild:
+                pm.title_index.rebuild()
+            groups = pm.find_duplicate_papers(args.threshold)
+            if not groups:
+                print("✓ No probable duplicates found.")
+                return
+
+            count = sum(len(g.duplicates) for g in groups)
+            print(f"\n🔁 {count} probable duplicate{'s' if count != 1 else ''} in {len(groups)} "
+                  f"group{'s' if len(groups) != 1 else ''}:\n")
+            for group in groups:
+                print(f"  keep  [{group.keep.get('arxiv_id') or 'N/A'}] {group.keep.get('title', 'Unknown')}")
+                for dup, reason in zip(group.duplicates, group.reasons):
+                    print(f"  merge [{dup.get('arxiv_id') or 'N/A'}] {dup.get('title', 'Unknown')}  ({reason})")
+                print()
+
+            if args.dry_run:
+                print("Dry run - nothing merged. Run without --dry-run to merge.")
+            else:
+                removed = pm.merge_duplicate_papers(groups)
+                print(f"✓ Merged {removed} duplicate entries; registry now has {len(pm.get_papers())} papers")
+
+        elif args.papers_command == 'top':
+            graph = pm.paper_graph
+            if args.rebuild:
+                graph.rebuild()
+            top = graph.top(args.limit, by=args.by)
+            if args.json:
+                print(json.dumps([p.to_dict() for p in top], indent=2))
+            elif not top:
+                print("No papers in the co-citation graph yet.")
+            else:
+                summary = graph.summary()
+                measure = "PageRank" if args.by == 'pagerank' else "degree"
+                print(f"\n🕸  Most central papers by {measure} "
+                      f"({summary['papers']} papers, {summary['links']} links):\n")
+                for n, paper in enumerate(top, 1):
+                    print(f"  {n:>2}. [{paper.arxiv_id or 'N/A'}] {paper.title or paper.url}")
+                    print(f"      rank {paper.pagerank:.4f}  co-cited with {paper.degree}  "
+                          f"in {paper.mentions} response{'s' if paper.mentions != 1 else ''}")
+
+        elif args.papers_command == 'fetch':
+            if args.offline and args.mirror is None:
+                print("✗ --offline needs --mirror DIR")
+                sys.exit(1)
+            targets = downloads.download_targets(pm.get_papers(), args.base_url)
+            if args.ids:
+                wanted = {canonical_arxiv_id(i) or i for i in args.ids}
+                targets = [t for t in targets if t.key in wanted]
+            if args.limit is not None:
+                targets = targets[:args.limit]
+            if not targets:
+                print("No papers with a PDF to fetch.")
+                return
+
+            def report(target, status, detail):
+                mark = "✗" if status == 'failed' else "✓"
+                note = {'resumed': " (resumed)", 'mirror': " (mirror)"}.get(status, "")
+                print(f"  {mark} [{target.key}] {detail}{note}")
+
+            fetcher = downloads.PaperFetcher(pm.root / "resources" / "downloads",
+                                             concurrency=args.concurrency, rate=args.rate,
+                                             mirror=args.mirror, offline=args.offline)
+            print(f"→ Fetching PDFs for {len(targets)} paper(s)...")
+            result = await fetcher.fetch(targets, verify=args.verify, progress=report)
+            print(f"\n✓ {result.downloaded} downloaded ({result.resumed} resumed), "
+                  f"{result.from_mirror} from mirror, {result.skipped} already present "
+                  f"- {result.bytes / 1e6:.1f} MB in {result.wall_seconds:.1f}s")
+            if result.failed:
+                print(f"⚠ {len(result.failed)} failed; run 'rv papers fetch' again to retry "
+                      f"(partial downloads resume)")
+                sys.exit(1)
+
+        elif args.papers_command == 'extract':
+            if fulltext.extractor_name() is None:
+                print("✗ Extracting text needs pypdf. Install it with: pip install -e \".[fulltext]\"")
+                sys.exit(1)
+
+            def report(key, error):
+                print(f"  ✗ [{key}] {error}" if error else f"  ✓ [{key}]")
+
+            print(f"→ Extracting text with {fulltext.extractor_name()}...")
+            result = pm.fulltext.extract(jobs=args.jobs, force=args.force, progress=report)
+            stats = pm.fulltext.stats()
+            print(f"\n✓ {result.extracted} extracted ({result.chunks} chunks), {result.unchanged} unchanged, "
+                  f"{result.removed} removed in {result.wall_seconds:.1f}s")
+            print(f"  Index: {stats['papers']} papers, {stats['chunks']} chunks, "
+                  f"{stats['bytes'] / 1024:.0f} KB - search it with rv search --kind paper")
+            if result.failed:
+                print(f"⚠ {len(result.failed)} PDF(s) had no extractable text; "
+                      f"they are retried when the file changes or with --force")
+
+        elif args.papers_command == 'text':
+            chunks = pm.fulltext.chunks(args.arxiv_id)
+            if not chunks:
+                print(f"✗ No extracted text for {args.arxiv_id}. Run 'rv papers fetch' and 'rv papers extract'.")
+                sys.exit(1)
+            # Chunks overlap by CHUNK_OVERLAP words; print each word once
+            words = []
+            for chunk in chunks:
+                if args.page is not None and chunk.page != args.page:
+                    continue
+                chunk_words = chunk.text.split()
+                words.extend(chunk_words[fulltext.CHUNK_OVERLAP:] if words and chunk.seq else chunk_words)
+            print(" ".join(words))
+
+    elif args.command == 'blobs':
+        pm = ProjectManager()
+        if not pm.is_project_dir():
+            print("✗ Not in a research project directory.")
+            sys.exit(1)
+
+        if args.blobs_command == 'stats' or args.blobs_command is None:
+            refs = [ref for _, ref in pm.backend.iter_text_refs()]
+            blobs = list(pm.blobs.refs())
+            size = sum(pm.blobs.size(ref) for ref in blobs)
+            print(f"\n🗄  Blob store: {len(blobs)} blobs, {size / 1024:.1f} KB")
+            print(f"  Responses referencing blobs: {len(refs)} ({len(set(refs))} distinct texts)")
+            unreferenced = len(set(blobs) - set(refs))
+            if unreferenced:
+                print(f"  Unreferenced blobs: {unreferenced} (run 'rv blobs gc')")
+
+        elif args.blobs_command == 'gc':
+            removed, freed = pm.collect_garbage(dry_run=args.dry_run)
+            verb = "Would remove" if args.dry_run else "✓ Removed"
+            print(f"{verb} {removed} unreferenced blob{'s' if removed != 1 else ''} ({freed / 1024:.1f} KB)")
+
+        elif args.blobs_command == 'check':
+            report = pm.check_blobs()
+            for ref in report.corrupt:
+                print(f"  ✗ Corrupt blob: {ref}")
+            for where, ref in report.missing:
+                print(f"  ✗ Missing blob {ref} (referenced by {where})")
+            if not report.ok:
+                print(f"✗ {len(report.corrupt)} corrupt, {len(report.missing)} missing "
+                      f"({report.blobs} blobs, {report.references} references checked)")
+                sys.exit(1)
+            print(f"✓ {report.blobs} blobs and {report.references} references OK")
+
+        elif args.blobs_command == 'pack':
+            converted = pm.pack_responses()
+            print(f"✓ Moved {converted} response{'s' if converted != 1 else ''} into the blob store")
+
+        elif args.blobs_command == 'show':
+            matches = pm.blobs.resolve(args.ref)
+            if len(matches) != 1:
+                print(f"✗ {'No' if not matches else 'More than one'} blob matches '{args.ref}'")
+                sys.exit(1)
+            text = pm.blobs.get(matches[0])
+            if text is None:
+                print(f"✗ Blob {matches[0]} is unreadable (run 'rv blobs check')")
+                sys.exit(1)
+            print(text)
+
+    elif args.command == 'report':
+        pm = ProjectManager()
+        if not pm.is_project_dir():
+            print("✗ Not in a research project directory.")
+            sys.exit(1)
+        try:
+            builder = ReportBuilder(pm, args.template)
+        except FileNotFoundError as e:
+            print(f"✗ {e}")
+            sys.exit(1)
+        result = builder.build(force=args.force)
+        verb = "Wrote" if result.changed else "Up to date:"
+        print(f"✓ {verb} {result.path.relative_to(pm.root)} ({result.seconds * 1000:.0f} ms)")
+        print(f"  Sections re-rendered: {', '.join(result.rendered) or 'none'}"
+              f" ({len(result.reused)} reused)")
+        print(f"  Cycles read: {result.cycles_read} of {result.cycles_total}")
+
+    elif args.command == 'hypothesis':
+        pm = ProjectManager()
+        if not pm.is_project_dir():
+            print("✗ Not in a research project directory.")
+            sys.exit(1)
+
+        if args.hypothesis_command == 'log' or args.hypothesis_command is None:
+            log = pm.hypothesis_log()
+            if getattr(args, 'json', False):
+                print(json.dumps([v.to_dict() for v in log], indent=2))
+                return
+            print(f"\n📜 Hypothesis versions ({len(log)}):\n")
+            for v in log:
+                marker = " (current)" if v.current else ""
+                when = v.created[:16].replace("T", " ") or "-"
+                changes = (f"+{v.added} -{v.removed} ~{v.changed}" if v.version > 1
+                           else f"base, {v.components_total} components")
+                print(f"  v{v.version:<3} {when:<16}  {changes}{marker}")
+                if v.reason:
+                    print(f"        {v.reason}")
+
+        elif args.hypothesis_command == 'diff':
+            try:
+                from_version = parse_version(args.from_version)
+                to_version = parse_version(args.to_version) if args.to_version else None
+                diff = pm.hypothesis_diff(from_version, to_version)
+            except ValueError as e:
+                print(f"✗ {e}")
+                sys.exit(1)
+            if args.json:
+                print(json.dumps(diff, indent=2, default=str))
+                return
+
+            components = diff["components"]
+            print(f"\n🔀 Hypothesis v{diff['from']} → v{diff['to']}\n")
+            if not any(components.values()) and not diff["statement"]:
+                print("  No changes.")
+                return
+            for component in components["added"]:
+                print(f"  + [{component.get('id', '?')}] {component.get('claim', '')}")
+            for component in components["removed"]:
+                print(f"  - [{component.get('id', '?')}] {component.get('claim', '')}")
+            for change in components["changed"]:
+                print(f"  ~ [{change['id']}]")
+                for name, (old, new) in change["fields"].items():
+                    print(f"      {name}: {old!r} → {new!r}")
+            if diff["statement"]:
+                print("\n  Statement:")
+                for line in diff["statement"]:
+                    print(f"    {line.rstrip()}")
+
+
+async def ask_batch(args):
+    """rv ask --batch: stream JSONL answers to --output (resumable) or stdout."""
+    try:
+        questions = batch.read_questions(args.batch)
+    except OSError as e:
+        print(f"✗ Could not read questions: {e}")
+        sys.exit(1)
+
+    if args.output:
+        output = Path(args.output)
+        done = batch.answered_questions(output)
+        sink = batch.file_sink(output)
+        log = sys.stdout
+    else:
+        done = set()
+        sink = batch.stream_sink(sys.stdout)
+        log = sys.stderr  # Keep stdout pure JSONL
+
+    pending = len([q for q in questions if q not in done])
+    with contextlib.redirect_stdout(log):
+        if not pending:
+            print(f"✓ All {len(questions)} questions already answered in {args.output}")
+            return
+        resumed = f", {len(done)} already answered" if done else ""
+        print(f"→ Asking {pending} question(s) on {max(1, min(args.concurrency, pending))} tab(s){resumed}...")
+        client = AlphaxivClient()
+        try:
+            summary = await batch.run_batch(client, questions, sink, concurrency=args.concurrency,
+                                            timeout_seconds=args.timeout, skip=done)
+        finally:
+            await client.close()
+        print(f"✓ {summary.answered} answered, {summary.failed} failed in {summary.wall_seconds:.1f}s"
+              + (f" → {args.output}" if args.output else ""))
+        if summary.failed:
+            print("⚠ Failed questions are asked again when the batch is re-run with the same --output")
+
 
 if __name__ == '__main__':
     main()
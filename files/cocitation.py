@@ -0,0 +1,349 @@
+"""
+Paper Graph - Co-citation graph of the papers Alphaxiv returns.
+
+Handles:
+- A weighted co-occurrence graph: papers are linked each time they come up
+  in the same response, and more weakly when they come up in the same cycle
+- Logging each saved response's papers with a single append
+  (.research-graph.log.jsonl); the log is replayed when the graph is read
+  (responses already counted are skipped) and folded into the snapshot
+  (.research-graph.json) once it grows; backfilled from saved responses
+  on first use
+- Storing the adjacency as a sparse CSR matrix (indptr / indices / data),
+  packed only when the graph is ranked or compacted
+- PageRank and degree centrality, vectorised with NumPy when it is
+  installed (pip install numpy) and in pure Python otherwise
+"""
+
+import json
+import math
+import threading
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+from .fileops import atomic_write, durable_append, read_log, truncate_partial_line
+from .papers import canonical_arxiv_id, paper_key
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+if TYPE_CHECKING:
+    from .project import ProjectManager
+
+
+@dataclass
+class PaperRank:
+    """A paper's place in the co-citation graph."""
+    key: str
+    title: str
+    arxiv_id: Optional[str]
+    url: str
+    pagerank: float
+    degree: int  # Distinct co-cited papers
+    strength: float  # Sum of link weights
+    mentions: int  # Responses citing the paper
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def pagerank(indptr: List[int], indices: List[int], data: List[float], damping: float = 0.85,
+             tol: float = 1e-9, max_iter: int = 100) -> List[float]:
+    """
+    Weighted PageRank of a CSR adjacency matrix.
+
+    Papers without links spread their rank evenly over every paper.
+
+    Returns:
+        One score per row; scores sum to 1
+    """
+    n = len(indptr) - 1
+    if n <= 0:
+        return []
+    if numpy is not None:
+        return _pagerank_numpy(indptr, indices, data, damping, tol, max_iter)
+
+    strength = [sum(data[indptr[i]:indptr[i + 1]]) for i in range(n)]
+    rank = [1.0 / n] * n
+    for _ in range(max_iter):
+        dangling = sum(r for r, s in zip(rank, strength) if s == 0)
+        base = (1 - damping + damping * dangling) / n
+        new_rank = [base] * n
+        for i in range(n):
+            if strength[i] == 0:
+                continue
+            share = damping * rank[i] / strength[i]
+            for k in range(indptr[i], indptr[i + 1]):
+                new_rank[indices[k]] += share * data[k]
+        delta = sum(abs(a - b) for a, b in zip(new_rank, rank))
+        rank = new_rank
+        if delta < tol:
+            break
+    return rank
+
+
+def _pagerank_numpy(indptr, indices, data, damping, tol, max_iter) -> List[float]:
+    n = len(indptr) - 1
+    indices = numpy.asarray(indices, dtype=numpy.int64)
+    data = numpy.asarray(data, dtype=numpy.float64)
+    rows = numpy.repeat(numpy.arange(n), numpy.diff(numpy.asarray(indptr)))
+    strength = numpy.bincount(rows, weights=data, minlength=n)
+    linked = strength > 0
+
+    rank = numpy.full(n, 1.0 / n)
+    for _ in range(max_iter):
+        share = numpy.zeros(n)
+        share[linked] = rank[linked] / strength[linked]
+        spread = numpy.bincount(indices, weights=data * share[rows], minlength=n)
+        new_rank = damping * spread + (1 - damping + damping * rank[~linked].sum()) / n
+        delta = numpy.abs(new_rank - rank).sum()
+        rank = new_rank
+        if delta < tol:
+            break
+    return rank.tolist()
+
+
+class PaperGraph:
+    """Co-citation graph of one project's papers, kept in step with saved responses."""
+
+    GRAPH_FILE = ".research-graph.json"
+    LOG_FILE = ".research-graph.log.jsonl"
+    FORMAT = 2
+    REBUILD_HINT = "run 'rv papers top --rebuild'"
+
+    # Link weight for two papers in the same response, and in the same cycle
+    RESPONSE_WEIGHT = 1.0
+    CYCLE_WEIGHT = 0.5
+    DAMPING = 0.85
+
+    # Logged responses folded into the snapshot once a read has replayed this many
+    COMPACT_AFTER = 500
+
+    def __init__(self, project_manager: "ProjectManager"):
+        """
+        Initialize paper graph.
+
+        Args:
+            project_manager: ProjectManager of the project the graph belongs to
+        """
+        self.pm = project_manager
+        self._state: Optional[dict] = None  # Adjacency dicts: snapshot plus replayed log
+        self._snapshot_sig: Optional[tuple] = None
+        self._log_offset = 0
+        self._log_records = 0  # Log lines replayed since the snapshot
+        self._csr: Optional[tuple] = None
+        self._ranks: Optional[List[PaperRank]] = None
+        self._lock = threading.RLock()
+
+    @property
+    def path(self) -> Path:
+        return self.pm.root / self.GRAPH_FILE
+
+    @property
+    def log_path(self) -> Path:
+        return self.pm.root / self.LOG_FILE
+
+    # === Reading ===
+
+    def ranked(self) -> List[PaperRank]:
+        """Every paper with its centrality, most central (by PageRank) first."""
+        with self._lock:
+            self._refresh()
+            if self._ranks is None:
+                indptr, indices, data = self._adjacency()
+                scores = pagerank(indptr, indices, data, damping=self.DAMPING)
+                ranks = []
+                for i, node in enumerate(self._state["nodes"]):
+                    row = slice(indptr[i], indptr[i + 1])
+                    ranks.append(PaperRank(
+                        key=node["key"], title=node.get("title", ""), arxiv_id=node.get("arxiv_id"),
+                        url=node.get("url", ""), pagerank=scores[i], degree=indptr[i + 1] - indptr[i],
+                        strength=math.fsum(data[row]), mentions=node.get("mentions", 0),
+                    ))
+                ranks.sort(key=lambda r: (-r.pagerank, -r.mentions, r.title))
+                self._ranks = ranks
+            return self._ranks
+
+    def top(self, limit: int = 10, by: str = "pagerank") -> List[PaperRank]:
+        """
+        Most central papers.
+
+        Args:
+            limit: Number of papers
+            by: "pagerank" or "degree" (distinct co-cited papers, then link weight)
+        """
+        ranks = self.ranked()
+        if by == "degree":
+            ranks = sorted(ranks, key=lambda r: (-r.degree, -r.strength, -r.pagerank))
+        return ranks[:limit]
+
+    def summary(self) -> dict:
+        with self._lock:
+            self._refresh()
+            _, indices, _ = self._adjacency()
+            return {"papers": len(self._state["nodes"]), "links": len(indices) // 2,
+                    "responses": sum(len(c["questions"]) for c in self._state["cycles"].values())}
+
+    # === Incremental updates ===
+
+    def response_saved(self, cycle_num: int, question_num: int, papers: List[dict]):
+        """Log a saved response's papers; they join the graph when it is next read."""
+        record = {
+            "cycle": cycle_num,
+            "question": question_num,
+            "papers": [{k: p[k] for k in ("title", "url", "arxiv_id") if p.get(k)} for p in papers],
+        }
+        # Under the project lock: other rv processes append and compact too
+        with self.pm.backend.lock.exclusive():
+            truncate_partial_line(self.log_path)
+            durable_append(self.log_path, json.dumps(record, separators=(",", ":")) + "\n")
+
+    def rebuild(self):
+        """Rebuild the graph from every saved response."""
+        with self._lock, self.pm.backend.lock.exclusive():
+            state = self._unpack(self._empty())
+            for record in self.pm.iter_responses():
+                self._add_response(state, record["cycle_num"], record["question_num"],
+                                   record.get("papers", []))
+            self._state = state
+            self._changed()
+            self._write_snapshot()
+
+    def compact(self):
+        """Fold the response log into the snapshot."""
+        with self._lock, self.pm.backend.lock.exclusive():
+            self._refresh(compact=False)
+            self._write_snapshot()
+
+    def _add_response(self, state: dict, cycle_num: int, question_num: int, papers: List[dict]) -> bool:
+        cycle = state["cycles"].setdefault(str(cycle_num), {"papers": set(), "questions": set()})
+        if question_num in cycle["questions"]:
+            return False
+        cycle["questions"].add(question_num)
+
+        nodes, index, adj = state["nodes"], state["index"], state["adj"]
+        cited = []
+        for paper in papers:
+            key = paper_key(paper)
+            if key not in index:
+                index[key] = len(nodes)
+                nodes.append({"key": key, "title": paper.get("title", ""), "url": paper.get("url", ""),
+                              "arxiv_id": canonical_arxiv_id(paper.get("arxiv_id"))
+                              or canonical_arxiv_id(paper.get("url")), "mentions": 0})
+                adj.append({})
+            i = index[key]
+            if i not in cited:
+                cited.append(i)
+                nodes[i]["mentions"] += 1
+
+        def link(a: int, b: int, weight: float):
+            adj[a][b] = adj[a].get(b, 0.0) + weight
+            adj[b][a] = adj[b].get(a, 0.0) + weight
+
+        for n, a in enumerate(cited):
+            for b in cited[n + 1:]:
+                link(a, b, self.RESPONSE_WEIGHT)
+
+        # Each pair of papers in a cycle is linked once, however many responses they share
+        in_cycle = cycle["papers"]
+        new = [i for i in cited if i not in in_cycle]
+        for n, a in enumerate(new):
+            for b in new[n + 1:]:
+                link(a, b, self.CYCLE_WEIGHT)
+            for b in in_cycle:
+                link(a, b, self.CYCLE_WEIGHT)
+        in_cycle.update(new)
+        return True
+
+    # === Storage ===
+
+    def _refresh(self, compact: bool = True):
+        """Load the snapshot if it changed and replay new log lines onto it."""
+        snapshot_sig = _signature(self.path)
+        log_size = self.log_path.stat().st_size if self.log_path.exists() else 0
+
+        if self._state is None or snapshot_sig != self._snapshot_sig or log_size < self._log_offset:
+            graph = json.loads(self.path.read_text()) if snapshot_sig is not None else None
+            if graph is None or graph.get("format") != self.FORMAT:
+                self.rebuild()  # First use, or a graph written by an older version
+                return
+            self._state = self._unpack(graph)
+            self._snapshot_sig = snapshot_sig
+            self._log_offset = 0
+            self._log_records = 0
+            self._changed()
+
+        if log_size > self._log_offset:
+            records, self._log_offset = read_log(self.log_path, self._log_offset)
+            self._log_records += len(records)
+            for record in records:
+                if self._add_response(self._state, record["cycle"], record["question"], record["papers"]):
+                    self._changed()
+            if compact and self._log_records >= self.COMPACT_AFTER:
+                self.compact()
+
+    def _write_snapshot(self):
+        """Write the current graph as the snapshot and drop the log it contains."""
+        indptr, indices, data = self._adjacency()
+        graph = {
+            "format": self.FORMAT,
+            "nodes": self._state["nodes"],
+            "indptr": indptr,
+            "indices": indices,
+            "data": data,
+            "cycles": {c: {"papers": sorted(cycle["papers"]), "questions": sorted(cycle["questions"])}
+                       for c, cycle in self._state["cycles"].items()},
+        }
+        atomic_write(self.path, json.dumps(graph, separators=(",", ":")))
+        # A crash before this unlink only means the log is replayed again: its responses are skipped
+        self.log_path.unlink(missing_ok=True)
+        self._snapshot_sig = _signature(self.path)
+        self._log_offset = 0
+        self._log_records = 0
+
+    def _adjacency(self) -> tuple:
+        """CSR (indptr, indices, data) of the current adjacency, packed once per change."""
+        if self._csr is None:
+            indptr, indices, data = [0], [], []
+            for row in self._state["adj"]:
+                for j in sorted(row):
+                    indices.append(j)
+                    data.append(row[j])
+                indptr.append(len(indices))
+            self._csr = (indptr, indices, data)
+        return self._csr
+
+    def _changed(self):
+        self._csr = None
+        self._ranks = None
+
+    @staticmethod
+    def _empty() -> dict:
+        return {"nodes": [], "indptr": [0], "indices": [], "data": [], "cycles": {}}
+
+    @staticmethod
+    def _unpack(graph: dict) -> dict:
+        """CSR on disk → adjacency dicts for updating."""
+        indptr, indices, data = graph["indptr"], graph["indices"], graph["data"]
+        adj: List[Dict[int, float]] = [
+            dict(zip(indices[indptr[i]:indptr[i + 1]], data[indptr[i]:indptr[i + 1]]))
+            for i in range(len(graph["nodes"]))
+        ]
+        return {
+            "nodes": [dict(node) for node in graph["nodes"]],
+            "index": {node["key"]: i for i, node in enumerate(graph["nodes"])},
+            "adj": adj,
+            "cycles": {c: {"papers": set(cycle["papers"]), "questions": set(cycle["questions"])}
+                       for c, cycle in graph["cycles"].items()},
+        }
+
+
+def _signature(path: Path) -> Optional[tuple]:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
@@ -0,0 +1,360 @@
+"""
+Columnar Export - A project's research data as Parquet or Arrow tables.
+
+Handles:
+- Streaming cycles, responses, the papers each response cited, the paper
+  registry and gaps into columnar tables (one directory per table), in
+  record batches so memory stays bounded however large the project grows
+- Incremental append: each run adds one part file per table holding only
+  the cycles that are new or changed since the last export; a part holding
+  a changed cycle is replaced (tracked in _manifest.json)
+- A project column in every table, so pandas or DuckDB can query the
+  exports of many projects at once
+- pyarrow as an optional dependency (pip install -e ".[analytics]")
+"""
+
+import hashlib
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+from .fileops import atomic_write
+from .papers import paper_key
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+if TYPE_CHECKING:
+    from .project import ProjectManager
+
+
+EXPORT_FORMATS = ("parquet", "arrow")
+SUFFIXES = {"parquet": ".parquet", "arrow": ".arrow"}
+
+# Table -> (column, type) pairs
+TABLES = {
+    "cycles": [
+        ("project", "string"), ("cycle_num", "int64"), ("phase", "string"),
+        ("started", "timestamp"), ("updated", "timestamp"), ("completed", "timestamp"),
+        ("synthesized", "timestamp"), ("questions", "int64"), ("responses", "int64"),
+        ("papers", "int64"), ("new_gaps", "int64"), ("synthesis", "bool"),
+        ("archived", "string"), ("query_seconds", "float64"),
+    ],
+    "responses": [
+        ("project", "string"), ("cycle_num", "int64"), ("question_num", "int64"),
+        ("phase", "string"), ("question", "string"), ("timestamp", "timestamp"),
+        ("duration_seconds", "float64"), ("papers", "int64"), ("text_chars", "int64"),
+        ("text_ref", "string"), ("text", "string"),
+    ],
+    "response_papers": [
+        ("project", "string"), ("cycle_num", "int64"), ("question_num", "int64"),
+        ("paper_key", "string"), ("arxiv_id", "string"), ("title", "string"), ("url", "string"),
+    ],
+    "papers": [
+        ("project", "string"), ("paper_key", "string"), ("arxiv_id", "string"),
+        ("title", "string"), ("url", "string"), ("added", "timestamp"),
+    ],
+    "gaps": [
+        ("project", "string"), ("gap_id", "int64"), ("status", "string"), ("priority", "string"),
+        ("description", "string"), ("created", "timestamp"), ("resolved", "timestamp"),
+        ("resolution", "string"),
+    ],
+}
+CYCLE_TABLES = ("cycles", "responses", "response_papers")
+PROJECT_TABLES = ("papers", "gaps")
+
+
+@dataclass
+class ExportResult:
+    """Outcome of one export_columnar() run."""
+    output: Path
+    format: str
+    cycles_written: int = 0
+    cycles_total: int = 0
+    rows: Dict[str, int] = field(default_factory=dict)  # Rows written per table this run
+    parts_replaced: int = 0
+    project_tables: bool = False  # Whether papers/gaps were rewritten
+    seconds: float = 0.0
+
+
+def _schema(table: str):
+    types = {
+        "string": pyarrow.string(),
+        "int64": pyarrow.int64(),
+        "float64": pyarrow.float64(),
+        "bool": pyarrow.bool_(),
+        "timestamp": pyarrow.timestamp("us"),
+    }
+    return pyarrow.schema([(name, types[kind]) for name, kind in TABLES[table]])
+
+
+def _timestamp(value) -> Optional[datetime]:
+    if isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(str(value)) if value else None
+    except ValueError:
+        return None
+
+
+def _fingerprint(value) -> str:
+    return hashlib.sha256(json.dumps(value, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def _stat(path: Path) -> Optional[list]:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+class _PartWriter:
+    """One part file of one table, written in record batches."""
+
+    def __init__(self, path: Path, table: str, fmt: str):
+        self.path = path
+        self.tmp = path.with_name(f".{path.name}.tmp")
+        self.schema = _schema(table)
+        self.timestamps = [name for name, kind in TABLES[table] if kind == "timestamp"]
+        self.fmt = fmt
+        self.rows = 0
+        self._writer = None
+        self._sink = None
+
+    def write(self, rows: List[dict]):
+        if not rows:
+            return
+        for row in rows:
+            for name in self.timestamps:
+                row[name] = _timestamp(row.get(name))
+        batch = pyarrow.RecordBatch.from_pylist(rows, schema=self.schema)
+        if self._writer is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            if self.fmt == "parquet":
+                self._writer = pyarrow.parquet.ParquetWriter(str(self.tmp), self.schema, compression="zstd")
+            else:
+                self._sink = pyarrow.OSFile(str(self.tmp), "wb")
+                self._writer = pyarrow.ipc.new_file(self._sink, self.schema)
+        self._writer.write_batch(batch)
+        self.rows += len(rows)
+
+    def close(self) -> bool:
+        """Finish the file. Returns False if no rows were written (no file)."""
+        if self._writer is None:
+            return False
+        self._writer.close()
+        if self._sink is not None:
+            self._sink.close()
+        os.replace(self.tmp, self.path)
+        return True
+
+
+class _Buffers:
+    """Row buffers per table, flushed to their writers every BATCH_ROWS rows."""
+
+    BATCH_ROWS = 2048
+
+    def __init__(self, writers: Dict[str, _PartWriter]):
+        self.writers = writers
+        self.rows: Dict[str, List[dict]] = {table: [] for table in writers}
+
+    def add(self, table: str, row: dict):
+        self.rows[table].append(row)
+        if len(self.rows[table]) >= self.BATCH_ROWS:
+            self.flush(table)
+
+    def flush(self, table: Optional[str] = None):
+        for name in [table] if table else list(self.rows):
+            self.writers[name].write(self.rows[name])
+            self.rows[name] = []
+
+
+def export_columnar(pm: "ProjectManager", fmt: str = "parquet", output: Optional[Path] = None,
+                    full: bool = False) -> ExportResult:
+    """
+    Export (or bring up to date) a project's analytics tables.
+
+    Args:
+        pm: ProjectManager of the project
+        fmt: "parquet" or "arrow"
+        output: Export directory (default: <project>/results/export)
+        full: Discard earlier parts and export everything again
+
+    Raises:
+        RuntimeError: If pyarrow is not installed
+        ValueError: For an unknown format
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format '{fmt}'. Choose from: {', '.join(EXPORT_FORMATS)}")
+    if pyarrow is None:
+        raise RuntimeError('pyarrow is required for Parquet/Arrow export (pip install -e ".[analytics]")')
+
+    started = time.perf_counter()
+    output = Path(output) if output else pm.root / "results" / "export"
+    manifest_path = output / "_manifest.json"
+    suffix = SUFFIXES[fmt]
+    result = ExportResult(output=output, format=fmt)
+
+    manifest = {}
+    if manifest_path.exists() and not full:
+        try:
+            manifest = json.loads(manifest_path.read_text())
+        except ValueError:
+            manifest = {}
+    if manifest.get("format") != fmt:
+        manifest = {}
+    parts: Dict[str, dict] = manifest.get("parts", {})
+    exported: Dict[str, dict] = manifest.get("cycles", {})
+
+    # Files no manifest lists are left over from an interrupted run
+    listed = {f"{table}/{name}{suffix}" for name in parts for table in CYCLE_TABLES}
+    listed |= {f"{table}/{table}{suffix}" for table in PROJECT_TABLES} if manifest else set()
+    for table in TABLES:
+        for path in (output / table).glob("*"):
+            if f"{table}/{path.name}" not in listed:
+                path.unlink()
+    for name in [n for n in parts if not (output / "cycles" / f"{n}{suffix}").exists()]:
+        # A part went missing: export its cycles again
+        for num in parts.pop(name)["cycles"]:
+            exported.pop(str(num), None)
+
+    # Stamps are taken before reading, so a cycle written meanwhile is picked up next run
+    catalog = {c["cycle_num"]: c for c in pm.catalog.list()}
+    stamps = {num: _fingerprint(entry) for num, entry in catalog.items()}
+    changed = {num for num in catalog if exported.get(str(num), {}).get("stamp") != stamps[num]}
+    changed |= {int(num) for num in exported if int(num) not in catalog}
+    stale = {exported[str(num)]["part"] for num in changed if str(num) in exported}
+    dirty = sorted((changed | {num for part in stale for num in parts.get(part, {}).get("cycles", [])})
+                   & set(catalog))
+    result.cycles_total = len(catalog)
+    result.parts_replaced = len(stale)
+
+    project = pm.state.project_name
+    part_name = f"part-{datetime.now().strftime('%Y%m%dT%H%M%S%f')}"
+    if dirty:
+        writers = {t: _PartWriter(output / t / f"{part_name}{suffix}", t, fmt) for t in CYCLE_TABLES}
+        buffers = _Buffers(writers)
+        for num in dirty:
+            _export_cycle(pm, project, catalog[num], buffers)
+        buffers.flush()
+        for table, writer in writers.items():
+            if not writer.close():
+                # Every table gets the part, so the manifest's parts are complete
+                _write_empty(writer.path, table, fmt)
+            result.rows[table] = writer.rows
+        result.cycles_written = len(dirty)
+
+    project_stamp = _fingerprint(_project_inputs(pm))
+    if manifest.get("project_stamp") != project_stamp or not all(
+            (output / t / f"{t}{suffix}").exists() for t in PROJECT_TABLES):
+        for table, rows in (("papers", _paper_rows(pm, project)), ("gaps", _gap_rows(pm, project))):
+            writer = _PartWriter(output / table / f"{table}{suffix}", table, fmt)
+            buffers = _Buffers({table: writer})
+            for row in rows:
+                buffers.add(table, row)
+            buffers.flush()
+            if not writer.close():
+                _write_empty(output / table / f"{table}{suffix}", table, fmt)
+            result.rows[table] = writer.rows
+        result.project_tables = True
+
+    # Record the new part, then drop the parts it replaces
+    for part in stale:
+        parts.pop(part, None)
+    for num in changed - set(catalog):
+        exported.pop(str(num), None)
+    if dirty:
+        parts[part_name] = {"cycles": dirty, "written": datetime.now().isoformat()}
+        for num in dirty:
+            exported[str(num)] = {"stamp": stamps[num], "part": part_name}
+    output.mkdir(parents=True, exist_ok=True)
+    atomic_write(manifest_path, json.dumps({
+        "format": fmt,
+        "project": project,
+        "updated": datetime.now().isoformat(),
+        "project_stamp": project_stamp,
+        "parts": parts,
+        "cycles": exported,
+    }, indent=1))
+    for part in stale:
+        for table in CYCLE_TABLES:
+            (output / table / f"{part}{suffix}").unlink(missing_ok=True)
+
+    result.seconds = time.perf_counter() - started
+    return result
+
+
+def _export_cycle(pm: "ProjectManager", project: str, entry: dict, buffers: _Buffers):
+    num, phase = entry["cycle_num"], entry.get("phase")
+    query_seconds = 0.0
+    for record in pm.iter_responses([num]):
+        papers = record.get("papers") or []
+        text = record.get("text") or ""
+        duration = record.get("duration_seconds")
+        query_seconds += duration or 0.0
+        buffers.add("responses", {
+            "project": project, "cycle_num": num, "question_num": record["question_num"],
+            "phase": phase, "question": record.get("question", ""), "timestamp": record.get("timestamp"),
+            "duration_seconds": duration, "papers": len(papers), "text_chars": len(text),
+            "text_ref": record.get("text_ref"), "text": text,
+        })
+        for paper in papers:
+            buffers.add("response_papers", {
+                "project": project, "cycle_num": num, "question_num": record["question_num"],
+                "paper_key": paper_key(paper), "arxiv_id": paper.get("arxiv_id"),
+                "title": paper.get("title"), "url": paper.get("url"),
+            })
+    buffers.add("cycles", {
+        "project": project, "cycle_num": num, "phase": phase,
+        "started": entry.get("started"), "updated": entry.get("updated"),
+        "completed": entry.get("completed"), "synthesized": entry.get("synthesized"),
+        "questions": entry.get("questions", 0), "responses": entry.get("responses", 0),
+        "papers": entry.get("papers", 0), "new_gaps": entry.get("new_gaps", 0),
+        "synthesis": bool(entry.get("synthesis")), "archived": entry.get("archived"),
+        "query_seconds": round(query_seconds, 2),
+    })
+
+
+def _project_inputs(pm: "ProjectManager") -> list:
+    """Cheap stamp of the paper registry and gaps: counts plus file stats."""
+    state = pm.state
+    paths = ["resources/papers.yaml", "resources/papers.log.jsonl", "gaps/active.yaml",
+             "gaps/resolved.yaml", "project.db"]
+    return [state.papers_collected, state.gaps_count] + [_stat(pm.root / p) for p in paths]
+
+
+def _paper_rows(pm: "ProjectManager", project: str):
+    for paper in pm.get_papers():
+        yield {"project": project, "paper_key": paper_key(paper), "arxiv_id": paper.get("arxiv_id"),
+               "title": paper.get("title"), "url": paper.get("url"), "added": paper.get("added")}
+
+
+def _gap_rows(pm: "ProjectManager", project: str):
+    for status, gaps in (("active", pm.get_active_gaps()), ("resolved", pm.backend.list_resolved_gaps())):
+        for gap in gaps:
+            yield {"project": project, "gap_id": gap.get("id"), "status": status,
+                   "priority": gap.get("priority"), "description": gap.get("description"),
+                   "created": gap.get("created"), "resolved": gap.get("resolved"),
+                   "resolution": gap.get("resolution")}
+
+
+def _write_empty(path: Path, table: str, fmt: str):
+    """A table file with the schema and no rows."""
+    schema = _schema(table)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.tmp")
+    if fmt == "parquet":
+        pyarrow.parquet.write_table(schema.empty_table(), str(tmp))
+    else:
+        with pyarrow.OSFile(str(tmp), "wb") as sink, pyarrow.ipc.new_file(sink, schema):
+            pass
+    os.replace(tmp, path)
@@ -0,0 +1,428 @@
+"""
+Paper Dedupe - Finding registry entries that are the same paper.
+
+Handles:
+- Title normalisation (case, accents, punctuation, trailing "..." of
+  truncated link text)
+- A MinHash/LSH index over title shingles, so finding a paper's likely
+  duplicates costs a few bucket lookups instead of a scan of the registry;
+  added and removed papers are appended to resources/papers.lsh.log.jsonl
+  and folded into the resources/papers.lsh.json snapshot once the log grows
+- Signatures vectorised with NumPy when it is installed
+- Verifying candidates: title similarity, truncated titles, and
+  "Paper 2401.12345" placeholders that name another entry's arXiv ID
+- Grouping duplicates and choosing which entry to keep (rv papers dedupe)
+"""
+
+import hashlib
+import json
+import random
+import re
+import unicodedata
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional, Set, Tuple
+
+from .fileops import atomic_write, durable_append, read_log, truncate_partial_line
+from .papers import canonical_arxiv_id, paper_key
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+if TYPE_CHECKING:
+    from .project import ProjectManager
+
+
+_PLACEHOLDER = re.compile(r"^(?:paper|arxiv)\s*:?\s*\S+$", re.IGNORECASE)
+_MASK64 = (1 << 64) - 1
+_rng = random.Random(0x5EED)
+# (odd multiplier, offset) for each of the 64 MinHash permutations
+_PERMS = [(_rng.getrandbits(64) | 1, _rng.getrandbits(64)) for _ in range(64)]
+if numpy is not None:
+    _PERM_A = numpy.array([a for a, _ in _PERMS], dtype=numpy.uint64)
+    _PERM_B = numpy.array([b for _, b in _PERMS], dtype=numpy.uint64)
+
+
+def normalize_title(title: Optional[str]) -> str:
+    """Lower-case ASCII words separated by single spaces."""
+    text = unicodedata.normalize("NFKD", title or "").encode("ascii", "ignore").decode("ascii")
+    text = re.sub(r"(\.\.\.|…)\s*$", "", text.strip())
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", text.lower()).split())
+
+
+def is_placeholder_title(title: Optional[str]) -> bool:
+    """Titles such as "Paper 2401.12345" that only restate an ID."""
+    title = (title or "").strip()
+    return not title or bool(_PLACEHOLDER.match(title) and canonical_arxiv_id(title))
+
+
+def _shingles(norm: str, k: int = 3) -> Set[str]:
+    padded = f" {norm} "
+    return {padded[i:i + k] for i in range(max(1, len(padded) - k + 1))}
+
+
+def title_similarity(a: str, b: str, min_prefix: int = 20) -> Tuple[float, str]:
+    """
+    Similarity of two normalised titles.
+
+    Returns:
+        (score between 0 and 1, reason) - a title cut short where the other
+        continues counts as a match
+    """
+    if a == b:
+        return 1.0, "same title"
+    shorter, longer = sorted((a, b), key=len)
+    if len(shorter) >= min_prefix and longer.startswith(shorter):
+        return 1.0, "truncated title"
+    sa, sb = _shingles(a), _shingles(b)
+    return len(sa & sb) / len(sa | sb), "similar title"
+
+
+@dataclass
+class DuplicateGroup:
+    """Registry entries judged to be one paper."""
+    keep: dict
+    duplicates: List[dict] = field(default_factory=list)
+    reasons: List[str] = field(default_factory=list)  # One per duplicate
+
+    def merged(self) -> dict:
+        """The kept entry, filled in from its duplicates and remembering their keys."""
+        paper = dict(self.keep)
+        aliases = list(paper.get("aliases", []))
+        for dup in self.duplicates:
+            for name, value in dup.items():
+                if name not in ("aliases", "added") and value and not paper.get(name):
+                    paper[name] = value
+            # Only a real title replaces a placeholder or truncated one
+            if _title_rank(dup)[:2] > _title_rank(paper)[:2]:
+                paper["title"] = dup["title"]
+            for key in [paper_key(dup), *dup.get("aliases", [])]:
+                if key not in aliases and key != paper_key(paper):
+                    aliases.append(key)
+        paper["aliases"] = aliases
+        return paper
+
+
+def _title_rank(paper: dict) -> tuple:
+    title = paper.get("title") or ""
+    return (not is_placeholder_title(title), not title.rstrip().endswith(("...", "…")), len(title))
+
+
+def _keep_order(papers: List[dict]) -> List[dict]:
+    """Entries best-first: with an arXiv ID, then a full title, then the oldest."""
+    papers = sorted(papers, key=lambda p: str(p.get("added") or "~"))
+    return sorted(papers, key=lambda p: (bool(p.get("arxiv_id")), _title_rank(p)), reverse=True)
+
+
+class TitleIndex:
+    """MinHash/LSH index of registry titles for one project."""
+
+    INDEX_FILE = "papers.lsh.json"
+    LOG_FILE = "papers.lsh.log.jsonl"
+    REBUILD_HINT = "run 'rv papers dedupe --rebuild'"
+
+    # 16 bands x 4 rows: pairs with Jaccard ~0.5 and up usually share a band
+    NUM_PERM = len(_PERMS)
+    BANDS = 16
+    # Titles also bucket by their opening characters, to catch truncation
+    PREFIX_CHARS = 24
+    THRESHOLD = 0.8
+    # Logged changes folded into the snapshot once this many have accumulated
+    COMPACT_AFTER = 1000
+
+    def __init__(self, project_manager: "ProjectManager"):
+        """
+        Initialize title index.
+
+        Args:
+            project_manager: ProjectManager of the project whose registry is indexed
+        """
+        self.pm = project_manager
+        self._index: Optional[dict] = None
+        self._buckets: Optional[Dict[str, List[str]]] = None
+        self._aliases: Set[str] = set()
+        self._snapshot_sig: Optional[tuple] = None
+        self._log_offset = 0
+        self._log_records = 0  # Log lines on top of the snapshot
+
+    @property
+    def path(self) -> Path:
+        return self.pm.root / "resources" / self.INDEX_FILE
+
+    @property
+    def log_path(self) -> Path:
+        return self.pm.root / "resources" / self.LOG_FILE
+
+    # === Signatures ===
+
+    def signature(self, norm: str) -> List[int]:
+        """MinHash signature of a normalised title's shingles."""
+        hashes = [int.from_bytes(hashlib.blake2b(s.encode(), digest_size=8).digest(), "little")
+                  for s in _shingles(norm)]
+        # Multiply-shift hashing: ((a * h + b) mod 2^64) >> 32 per permutation
+        if numpy is not None:
+            values = numpy.array(hashes, dtype=numpy.uint64)
+            mixed = (_PERM_A[:, None] * values[None, :] + _PERM_B[:, None]) >> numpy.uint64(32)
+            return mixed.min(axis=1).tolist()
+        return [min([(a * h + b) & _MASK64 for h in hashes]) >> 32 for a, b in _PERMS]
+
+    def band_keys(self, norm: str) -> List[str]:
+        """LSH bucket keys for a normalised title."""
+        if not norm:
+            return []
+        signature = self.signature(norm)
+        rows = self.NUM_PERM // self.BANDS
+        keys = []
+        for band in range(self.BANDS):
+            chunk = ",".join(map(str, signature[band * rows:(band + 1) * rows]))
+            keys.append(f"{band}:{hashlib.blake2b(chunk.encode(), digest_size=6).hexdigest()}")
+        keys.append("p:" + norm[:self.PREFIX_CHARS])
+        return keys
+
+    # === Queries ===
+
+    def candidates(self, paper: dict) -> List[str]:
+        """Keys of indexed papers sharing an LSH bucket with paper."""
+        index = self._load()
+        key = paper_key(paper)
+        entry = index["papers"].get(key)
+        bands = entry["bands"] if entry else self._bands(paper)
+        return self._bucket_members(bands, exclude=key)
+
+    def _bucket_members(self, bands: List[str], exclude: str) -> List[str]:
+        found = {}
+        for band_key in bands:
+            for other in self._buckets.get(band_key, ()):
+                if other != exclude:
+                    found[other] = True
+        return list(found)
+
+    def match(self, paper: dict, other: dict, threshold: Optional[float] = None) -> Optional[str]:
+        """Reason the two entries are one paper, or None."""
+        id_a, id_b = paper.get("arxiv_id"), other.get("arxiv_id")
+        if id_a and id_b:
+            return "same arXiv ID" if id_a == id_b else None
+        a, b = normalize_title(paper.get("title")), normalize_title(other.get("title"))
+        if not a or not b or is_placeholder_title(paper.get("title")) or is_placeholder_title(other.get("title")):
+            return None
+        score, reason = title_similarity(a, b)
+        return f"{reason} ({score:.2f})" if score >= (threshold or self.THRESHOLD) else None
+
+    def find_duplicates(self, papers: List[dict], threshold: Optional[float] = None) -> List[DuplicateGroup]:
+        """
+        Group registry entries that are probably one paper.
+
+        Args:
+            papers: The registry
+            threshold: Title similarity needed (default THRESHOLD)
+        """
+        by_key = {paper_key(p): p for p in papers}
+        by_id = {p["arxiv_id"]: k for k, p in by_key.items() if p.get("arxiv_id")}
+        parent = {k: k for k in by_key}
+        # arXiv IDs within each group, keyed by the group's root
+        group_ids = {k: {p["arxiv_id"]} if p.get("arxiv_id") else set() for k, p in by_key.items()}
+        reasons: Dict[str, str] = {}
+
+        def root(k):
+            while parent[k] != k:
+                parent[k] = parent[parent[k]]
+                k = parent[k]
+            return k
+
+        def union(a, b, reason):
+            ra, rb = root(a), root(b)
+            if ra == rb:
+                return
+            # Never merge two different arXiv papers through a chain of titles
+            if group_ids[ra] and group_ids[rb] and group_ids[ra] != group_ids[rb]:
+                return
+            parent[rb] = ra
+            group_ids[ra] |= group_ids.pop(rb)
+            reasons.setdefault(a, reason)
+            reasons.setdefault(b, reason)
+
+        self._ensure_indexed(papers)
+        for key, paper in by_key.items():
+            # "Paper 2401.12345": the entry that has that ID
+            named = canonical_arxiv_id(paper.get("title")) if is_placeholder_title(paper.get("title")) else None
+            if named and by_id.get(named) not in (None, key) and not paper.get("arxiv_id"):
+                union(by_id[named], key, "placeholder title names its arXiv ID")
+            for other_key in self.candidates(paper):
+                other = by_key.get(other_key)
+                if other is None:
+                    continue
+                reason = self.match(paper, other, threshold)
+                if reason:
+                    union(other_key, key, reason)
+
+        members: Dict[str, List[str]] = {}
+        for key in by_key:
+            members.setdefault(root(key), []).append(key)
+
+        groups = []
+        for keys in members.values():
+            if len(keys) < 2:
+                continue
+            entries = _keep_order([by_key[k] for k in keys])
+            groups.append(DuplicateGroup(
+                keep=entries[0],
+                duplicates=entries[1:],
+                reasons=[reasons.get(paper_key(p), "similar title") for p in entries[1:]],
+            ))
+        groups.sort(key=lambda g: (g.keep.get("title") or "").lower())
+        return groups
+
+    # === Incremental updates ===
+
+    def papers_added(self, papers: List[dict]) -> int:
+        """
+        Index papers (already indexed keys are skipped).
+
+        Returns:
+            How many of them look like duplicates of indexed papers
+        """
+        flagged = 0
+        with self.pm.backend.lock.exclusive():
+            index = self._load()
+            records = []
+            for paper in papers:
+                key = paper_key(paper)
+                if key in index["papers"] or key in self._aliases:
+                    continue
+                bands = self._bands(paper)
+                if any(self.match(paper, index["papers"][k])
+                       for k in self._bucket_members(bands, exclude=key) if k in index["papers"]):
+                    flagged += 1
+                records.append(self._insert(key, paper, bands))
+            self._append(records)
+        if flagged:
+            print(f"  ⚠ {flagged} new paper{'s' if flagged != 1 else ''} may duplicate registry "
+                  f"entries (rv papers dedupe --dry-run)")
+        return flagged
+
+    def papers_removed(self, keys: List[str]):
+        with self.pm.backend.lock.exclusive():
+            self._load()
+            record = {"remove": list(keys)}
+            self._apply(record)
+            self._append([record])
+
+    def rebuild(self) -> int:
+        """Re-index the whole registry. Returns the number of papers indexed."""
+        with self.pm.backend.lock.exclusive():
+            self._index = {"papers": {}, "aliases": []}
+            self._buckets = {}
+            self._aliases = set()
+            for paper in self.pm.get_papers():
+                self._insert(paper_key(paper), paper)
+            self._write_snapshot()
+            return len(self._index["papers"])
+
+    def _ensure_indexed(self, papers: List[dict]):
+        """Index registry entries added while the index wasn't looking (e.g. by hand)."""
+        index = self._load()
+        missing = [p for p in papers if paper_key(p) not in index["papers"]]
+        if missing:
+            with self.pm.backend.lock.exclusive():
+                self._append([self._insert(paper_key(paper), paper) for paper in missing])
+
+    def _bands(self, paper: dict) -> List[str]:
+        if is_placeholder_title(paper.get("title")):
+            return []
+        return self.band_keys(normalize_title(paper.get("title")))
+
+    def _insert(self, key: str, paper: dict, bands: Optional[List[str]] = None) -> dict:
+        """Index a paper in memory; returns its log record."""
+        if bands is None:
+            bands = self._bands(paper)
+        record = {"key": key, "title": paper.get("title") or "", "arxiv_id": paper.get("arxiv_id"),
+                  "bands": bands, "aliases": paper.get("aliases", [])}
+        self._apply(record)
+        return record
+
+    def _apply(self, record: dict):
+        """Apply one logged change to the in-memory index."""
+        papers = self._index["papers"]
+        for key in record.get("remove", ()):
+            entry = papers.pop(key, None)
+            for band_key in (entry or {}).get("bands", []):
+                bucket = self._buckets.get(band_key, [])
+                if key in bucket:
+                    bucket.remove(key)
+        if "key" not in record:
+            return
+
+        key = record["key"]
+        if key not in papers:
+            for band_key in record["bands"]:
+                self._buckets.setdefault(band_key, []).append(key)
+        papers[key] = {"title": record["title"], "arxiv_id": record["arxiv_id"], "bands": record["bands"]}
+        # Keys merged into this paper are known, not new
+        for alias in record.get("aliases", []):
+            if alias not in self._aliases:
+                self._aliases.add(alias)
+                self._index.setdefault("aliases", []).append(alias)
+
+    # === Storage ===
+
+    def _load(self) -> dict:
+        """The snapshot plus every logged change; re-read if another rv process wrote since."""
+        snapshot_sig = _signature(self.path)
+        log_size = self.log_path.stat().st_size if self.log_path.exists() else 0
+
+        if self._index is None or snapshot_sig != self._snapshot_sig or log_size < self._log_offset:
+            if snapshot_sig is None:
+                self.rebuild()
+                return self._index
+            self._index = json.loads(self.path.read_text())
+            self._snapshot_sig = snapshot_sig
+            self._log_offset = 0
+            self._log_records = 0
+            self._buckets = {}
+            self._aliases = set(self._index.get("aliases", []))
+            for key, entry in self._index["papers"].items():
+                for band_key in entry["bands"]:
+                    self._buckets.setdefault(band_key, []).append(key)
+
+        if log_size > self._log_offset:
+            records, self._log_offset = read_log(self.log_path, self._log_offset)
+            for record in records:
+                self._apply(record)
+            self._log_records += len(records)
+        return self._index
+
+    def _append(self, records: List[dict]):
+        """Log changes already applied in memory (caller holds the exclusive lock)."""
+        if not records:
+            return
+        if self._log_records + len(records) >= self.COMPACT_AFTER:
+            self._write_snapshot()
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        log_size = truncate_partial_line(self.log_path)
+        size = durable_append(self.log_path, "".join(
+            json.dumps(record, separators=(",", ":")) + "\n" for record in records))
+        # Skip our own lines on the next load unless someone else wrote in between
+        if self._log_offset == log_size:
+            self._log_offset = size
+        self._log_records += len(records)
+
+    def _write_snapshot(self):
+        """Write the whole index as the snapshot and drop the log it contains."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write(self.path, json.dumps(self._index, separators=(",", ":")))
+        # A crash before this unlink only means the log is applied again on top: it is idempotent
+        self.log_path.unlink(missing_ok=True)
+        self._snapshot_sig = _signature(self.path)
+        self._log_offset = 0
+        self._log_records = 0
+
+
+def _signature(path: Path) -> Optional[tuple]:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
@@ -0,0 +1,468 @@
+"""
+Paper Downloads - Concurrent, resumable PDF fetching into resources/downloads/.
+
+Handles:
+- Download targets for the registry's papers: arXiv papers from
+  https://arxiv.org/pdf/<id> (or --base-url), other papers only when their
+  URL points at a .pdf
+- A bounded pool of keep-alive HTTP connections shared by the async
+  workers (blocking transfers run in threads)
+- A per-host rate limit: a minimum interval between requests to one host
+- HTTP range resume: an interrupted download stays as <file>.part and
+  continues with a Range request (If-Range on its ETag, so a changed
+  file is fetched again from the start); a body shorter than its
+  Content-Length (or Content-Range total) also stays a .part and is retried
+- A checksum manifest (manifest.json: size and sha256 of each file) used
+  to skip finished papers and to --verify them
+- An offline mirror directory consulted before the network (--mirror DIR)
+"""
+
+import asyncio
+import hashlib
+import http.client
+import json
+import os
+import re
+import shutil
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
+
+from .fileops import atomic_write
+from .papers import canonical_arxiv_id
+
+
+ARXIV_PDF_URL = "https://arxiv.org/pdf/"
+DEFAULT_RATE = 1 / 3  # Requests per second per host; arXiv asks for one every 3 s
+MANIFEST_FILE = "manifest.json"
+USER_AGENT = "research-verifier (rv papers fetch)"
+CHUNK_BYTES = 64 * 1024
+MAX_REDIRECTS = 5
+_REDIRECTS = (301, 302, 303, 307, 308)
+
+
+class DownloadError(Exception):
+    """A paper could not be downloaded."""
+
+    def __init__(self, message: str, retry: bool = False):
+        super().__init__(message)
+        self.retry = retry  # Worth trying again (server error, dropped connection)
+
+
+@dataclass
+class DownloadTarget:
+    """One PDF to fetch."""
+    key: str  # Canonical arXiv ID, or "url:<url>" for other papers
+    url: str
+    filename: str
+    title: str = ""
+
+
+@dataclass
+class FetchResult:
+    """Outcome of PaperFetcher.fetch."""
+    downloaded: int = 0
+    resumed: int = 0  # Downloads that continued a .part file
+    from_mirror: int = 0
+    skipped: int = 0  # Already in the manifest
+    failed: List[Tuple[str, str]] = field(default_factory=list)  # (key, error)
+    bytes: int = 0
+    wall_seconds: float = 0.0
+
+
+def pdf_filename(key: str) -> str:
+    """File name for a target key: the arXiv ID ('/' → '_'), else a URL hash."""
+    if key.startswith("url:"):
+        return f"url-{hashlib.sha1(key[4:].encode()).hexdigest()[:16]}.pdf"
+    return key.replace("/", "_") + ".pdf"
+
+
+def download_targets(papers: List[dict], base_url: str = ARXIV_PDF_URL) -> List[DownloadTarget]:
+    """
+    Download targets for registry papers, one per paper with a PDF source.
+
+    Args:
+        papers: Registry entries (pm.get_papers())
+        base_url: Where arXiv PDFs are fetched from; the ID is appended
+    """
+    targets = {}
+    for paper in papers:
+        arxiv_id = canonical_arxiv_id(paper.get("arxiv_id")) or canonical_arxiv_id(paper.get("url"))
+        if arxiv_id:
+            key, url = arxiv_id, base_url.rstrip("/") + "/" + arxiv_id
+        else:
+            url = (paper.get("url") or "").strip()
+            if not urlsplit(url).path.lower().endswith(".pdf"):
+                continue
+            key = f"url:{url}"
+        if key not in targets:
+            targets[key] = DownloadTarget(key=key, url=url, filename=pdf_filename(key),
+                                          title=paper.get("title", ""))
+    return list(targets.values())
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class DownloadManifest:
+    """manifest.json: what was downloaded, from where, with its size and sha256."""
+
+    def __init__(self, directory: Path):
+        self.path = Path(directory) / MANIFEST_FILE
+        self.files: Dict[str, dict] = {}
+        self._lock = threading.Lock()  # Downloads finish on worker threads
+        self._save_lock = threading.Lock()
+        if self.path.exists():
+            self.files = json.loads(self.path.read_text()).get("files", {})
+
+    def record(self, target: DownloadTarget, path: Path, source: str, sha256: str):
+        entry = {
+            "file": target.filename,
+            "url": target.url,
+            "bytes": path.stat().st_size,
+            "sha256": sha256,
+            "source": source,
+            "fetched": datetime.now().isoformat(),
+        }
+        with self._lock:
+            self.files[target.key] = entry
+
+    def forget(self, key: str):
+        with self._lock:
+            self.files.pop(key, None)
+
+    def save(self):
+        with self._save_lock:
+            with self._lock:
+                data = json.dumps({"files": self.files}, indent=1, sort_keys=True)
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write(self.path, data)
+
+
+class ConnectionPool:
+    """Keep-alive HTTP(S) connections reused across downloads, per host."""
+
+    def __init__(self, max_idle_per_host: int, timeout: float):
+        self.max_idle_per_host = max_idle_per_host
+        self.timeout = timeout
+        self._idle: Dict[Tuple[str, str], List[http.client.HTTPConnection]] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, scheme: str, netloc: str) -> Tuple[http.client.HTTPConnection, bool]:
+        """A connection to the host, and whether it was reused from the pool."""
+        with self._lock:
+            idle = self._idle.get((scheme, netloc))
+            if idle:
+                return idle.pop(), True
+        return self.connect(scheme, netloc), False
+
+    def connect(self, scheme: str, netloc: str) -> http.client.HTTPConnection:
+        """A new connection to the host, bypassing the pool."""
+        cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        return cls(netloc, timeout=self.timeout)
+
+    def release(self, scheme: str, netloc: str, conn: http.client.HTTPConnection, reusable: bool):
+        with self._lock:
+            idle = self._idle.setdefault((scheme, netloc), [])
+            if reusable and len(idle) < self.max_idle_per_host:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def close(self):
+        with self._lock:
+            for idle in self._idle.values():
+                for conn in idle:
+                    conn.close()
+            self._idle.clear()
+
+
+class HostRateLimiter:
+    """Spaces out request starts to each host by at least 1/rate seconds."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next: Dict[str, float] = {}
+
+    async def wait(self, host: str):
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        start = max(now, self._next.get(host, now))
+        self._next[host] = start + self.interval  # Reserve the slot before sleeping
+        if start > now:
+            await asyncio.sleep(start - now)
+
+
+class PaperFetcher:
+    """Downloads PDFs into a directory with bounded concurrency."""
+
+    def __init__(self, directory: Path, concurrency: int = 4, rate: float = DEFAULT_RATE,
+                 mirror: Optional[Path] = None, offline: bool = False,
+                 timeout: float = 60.0, retries: int = 2):
+        """
+        Initialize fetcher.
+
+        Args:
+            directory: Download directory (resources/downloads/)
+            concurrency: Downloads in flight at once
+            rate: Requests per second per host (0 for no limit)
+            mirror: Directory of already-downloaded PDFs to copy from first
+            offline: Only use the mirror, never the network
+            timeout: Socket timeout in seconds
+            retries: Extra attempts after a dropped connection or server error
+        """
+        self.dir = Path(directory)
+        self.concurrency = max(1, concurrency)
+        self.mirror = Path(mirror) if mirror else None
+        self.offline = offline
+        self.retries = retries
+        self.manifest = DownloadManifest(self.dir)
+        self.pool = ConnectionPool(self.concurrency, timeout)
+        self.limiter = HostRateLimiter(rate)
+
+    async def fetch(self, targets: List[DownloadTarget], verify: bool = False,
+                    progress: Optional[Callable[[DownloadTarget, str, str], None]] = None) -> FetchResult:
+        """
+        Fetch every target not already downloaded.
+
+        Args:
+            targets: What to fetch
+            verify: Re-hash finished files and fetch again any that don't match
+            progress: Called with (target, status, detail) as each one finishes;
+                status is "downloaded", "resumed", "mirror" or "failed"
+
+        Returns:
+            FetchResult
+        """
+        self.dir.mkdir(parents=True, exist_ok=True)
+        result = FetchResult()
+        pending = []
+        for target in targets:
+            if await asyncio.to_thread(self._is_done, target, verify):
+                result.skipped += 1
+            else:
+                pending.append(target)
+
+        queue: asyncio.Queue = asyncio.Queue()
+        for target in pending:
+            queue.put_nowait(target)
+        start = time.perf_counter()
+        last_save = start
+
+        async def worker():
+            nonlocal last_save
+            while not queue.empty():
+                target = queue.get_nowait()
+                try:
+                    status, size = await self._fetch_one(target)
+                except DownloadError as e:
+                    result.failed.append((target.key, str(e)))
+                    if progress:
+                        progress(target, "failed", str(e))
+                    continue
+                result.bytes += size
+                if status == "mirror":
+                    result.from_mirror += 1
+                else:
+                    result.downloaded += 1
+                    result.resumed += status == "resumed"
+                if progress:
+                    progress(target, status, f"{size / 1024:.0f} KB" if size < 1e6 else f"{size / 1e6:.1f} MB")
+                # The manifest may lag: finished files missing from it are adopted on the next run
+                if time.perf_counter() - last_save > 2.0:
+                    last_save = time.perf_counter()
+                    await asyncio.to_thread(self.manifest.save)
+
+        try:
+            await asyncio.gather(*(worker() for _ in range(min(self.concurrency, len(pending)))))
+        finally:
+            self.pool.close()
+            await asyncio.to_thread(self.manifest.save)
+        result.wall_seconds = round(time.perf_counter() - start, 3)
+        return result
+
+    # === One target ===
+
+    def _is_done(self, target: DownloadTarget, verify: bool) -> bool:
+        path = self.dir / target.filename
+        entry = self.manifest.files.get(target.key)
+        if not path.exists():
+            self.manifest.forget(target.key)
+            return False
+        if entry is None:
+            # Finished (renamed from .part) but not yet in the manifest
+            self.manifest.record(target, path, "http", file_sha256(path))
+            return True
+        if entry.get("bytes") != path.stat().st_size or (verify and file_sha256(path) != entry.get("sha256")):
+            path.unlink()
+            self.manifest.forget(target.key)
+            return False
+        return True
+
+    async def _fetch_one(self, target: DownloadTarget) -> Tuple[str, int]:
+        """Fetch a target. Returns (status, size in bytes)."""
+        path = self.dir / target.filename
+        part = path.with_name(path.name + ".part")
+
+        source = self._mirror_file(target)
+        if source is not None:
+            await asyncio.to_thread(shutil.copyfile, source, part)
+            return "mirror", await asyncio.to_thread(self._finish, target, part, "mirror")
+        if self.offline:
+            raise DownloadError("not in the mirror (offline)")
+
+        host = urlsplit(target.url).netloc
+        for attempt in range(self.retries + 1):
+            await self.limiter.wait(host)
+            try:
+                resumed = await asyncio.to_thread(self._download, target.url, part)
+                break
+            except DownloadError as e:
+                if not e.retry or attempt == self.retries:
+                    raise
+            except (OSError, http.client.HTTPException) as e:
+                if attempt == self.retries:
+                    raise DownloadError(f"{type(e).__name__}: {e}") from e
+            await asyncio.sleep(2 ** attempt)
+        size = await asyncio.to_thread(self._finish, target, part, "http")
+        return ("resumed" if resumed else "downloaded"), size
+
+    def _mirror_file(self, target: DownloadTarget) -> Optional[Path]:
+        if self.mirror is None:
+            return None
+        candidates = [self.mirror / target.filename]
+        if not target.key.startswith("url:"):
+            candidates.append(self.mirror / f"{target.key}.pdf")  # hep-th/9901001.pdf
+        return next((c for c in candidates if c.is_file()), None)
+
+    def _finish(self, target: DownloadTarget, part: Path, source: str) -> int:
+        """Check a completed .part is a PDF, move it into place and record it."""
+        with open(part, "rb") as f:
+            head = f.read(5)
+        if head != b"%PDF-":
+            part.unlink()
+            _meta_path(part).unlink(missing_ok=True)
+            raise DownloadError(f"not a PDF ({source}: {target.url})")
+        sha256 = file_sha256(part)
+        path = self.dir / target.filename
+        os.replace(part, path)
+        _meta_path(part).unlink(missing_ok=True)
+        self.manifest.record(target, path, source, sha256)
+        return path.stat().st_size
+
+    def _download(self, url: str, part: Path) -> bool:
+        """
+        Stream url into part, continuing it with a Range request if it exists.
+
+        Returns:
+            True if an existing .part was continued
+
+        Raises:
+            DownloadError: HTTP error, too many redirects
+        """
+        meta_path = _meta_path(part)
+        for _ in range(MAX_REDIRECTS + 1):
+            offset = part.stat().st_size if part.exists() else 0
+            headers = {"User-Agent": USER_AGENT, "Accept": "application/pdf"}
+            if offset:
+                headers["Range"] = f"bytes={offset}-"
+                meta = _read_meta(meta_path)
+                validator = meta.get("etag") or meta.get("last_modified")
+                if validator:
+                    headers["If-Range"] = validator
+
+            parts = urlsplit(url)
+            path = parts.path + (f"?{parts.query}" if parts.query else "")
+            conn, reused = self.pool.acquire(parts.scheme, parts.netloc)
+            reusable = False
+            try:
+                try:
+                    conn.request("GET", path or "/", headers=headers)
+                    response = conn.getresponse()
+                except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                    if not reused:
+                        raise
+                    # A pooled connection the server had closed: retry on a fresh one
+                    conn.close()
+                    conn = self.pool.connect(parts.scheme, parts.netloc)
+                    conn.request("GET", path or "/", headers=headers)
+                    response = conn.getresponse()
+
+                if response.status in _REDIRECTS:
+                    response.read()
+                    reusable = not response.will_close
+                    url = urljoin(url, response.getheader("Location", ""))
+                    continue
+                if response.status == 416 and offset:
+                    # Nothing left to send: the .part is stale or already complete
+                    response.read()
+                    reusable = not response.will_close
+                    part.unlink()
+                    meta_path.unlink(missing_ok=True)
+                    continue
+                if response.status not in (200, 206):
+                    response.read()
+                    reusable = not response.will_close
+                    raise DownloadError(f"HTTP {response.status} from {url}",
+                                        retry=response.status == 429 or response.status >= 500)
+
+                append = response.status == 206 and offset > 0 and \
+                    _range_start(response.getheader("Content-Range")) == offset
+                if not append:
+                    atomic_write(meta_path, json.dumps({
+                        "etag": response.getheader("ETag"),
+                        "last_modified": response.getheader("Last-Modified"),
+                    }))
+                expected = _expected_size(response, offset if append else 0)
+                with open(part, "ab" if append else "wb") as f:
+                    while True:
+                        chunk = response.read(CHUNK_BYTES)
+                        if not chunk:
+                            break
+                        f.write(chunk)
+                    size = f.tell()
+                if expected is not None and size < expected:
+                    # The server closed early: keep the .part so the retry resumes it
+                    raise DownloadError(f"incomplete download ({size} of {expected} bytes) from {url}",
+                                        retry=True)
+                reusable = not response.will_close
+                return append
+            finally:
+                self.pool.release(parts.scheme, parts.netloc, conn, reusable)
+        raise DownloadError(f"too many redirects from {url}")
+
+
+def _meta_path(part: Path) -> Path:
+    """Sidecar holding the validators (ETag, Last-Modified) of a .part file."""
+    return part.with_name(part.name + ".json")
+
+
+def _read_meta(meta_path: Path) -> dict:
+    try:
+        return json.loads(meta_path.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def _range_start(content_range: Optional[str]) -> Optional[int]:
+    match = re.match(r"bytes (\d+)-", content_range or "")
+    return int(match.group(1)) if match else None
+
+
+def _expected_size(response: http.client.HTTPResponse, offset: int) -> Optional[int]:
+    """Size the .part should reach: a 206's Content-Range total, else offset + Content-Length."""
+    if response.status == 206:
+        match = re.match(r"bytes \d+-\d+/(\d+)", response.getheader("Content-Range") or "")
+        if match:
+            return int(match.group(1))
+    length = response.getheader("Content-Length")
+    return offset + int(length) if length and length.isdigit() else None
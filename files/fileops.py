@@ -0,0 +1,205 @@
+"""
+File Operations - Crash-safe writes for project files.
+
+Handles:
+- Atomic replacement: write a temp file, fsync it, rename it over the
+  target and fsync the directory, so readers see the old or the new
+  contents and never a truncated file
+- Durable appends for append-only JSON-lines logs, reading them from a
+  byte offset, and cutting off a final line left partial by a crashed append
+- Advisory project locks (shared for reads, exclusive for writes) so
+  several rv processes can work on one project without losing updates
+"""
+
+import contextlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+
+try:
+    import fcntl
+except ImportError:  # Windows: locks only coordinate threads of one process
+    fcntl = None
+
+
+def atomic_write(path: Path, data: Union[str, bytes]):
+    """
+    Replace path with data atomically and durably.
+
+    Args:
+        path: File to write
+        data: New contents (str is written as UTF-8)
+    """
+    path = Path(path)
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    _fsync_dir(path.parent)
+
+
+def durable_append(path: Path, data: Union[str, bytes]) -> int:
+    """
+    Append data to path and fsync it.
+
+    Returns:
+        Size of the file after the append
+    """
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    with open(path, "ab") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+        return f.tell()
+
+
+def read_log(path: Path, offset: int = 0) -> Tuple[List[dict], int]:
+    """
+    Records of a JSON-lines log from a byte offset on.
+
+    A partially written final line is left for the next read, and lines
+    that aren't valid JSON are skipped.
+
+    Returns:
+        (records, offset after the last complete line)
+    """
+    path = Path(path)
+    if not path.exists():
+        return [], 0
+    records = []
+    with open(path, "rb") as f:
+        f.seek(offset)
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            offset += len(line)
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue
+    return records, offset
+
+
+def truncate_partial_line(path: Path) -> int:
+    """
+    Cut a line-oriented log back to its last newline.
+
+    Call under the lock its writers hold, so the partial line can only be
+    left over from a crashed append.
+
+    Returns:
+        Size of the file afterwards (0 if it doesn't exist)
+    """
+    path = Path(path)
+    if not path.exists():
+        return 0
+    with open(path, "r+b") as f:
+        end = size = f.seek(0, os.SEEK_END)
+        keep = 0
+        while end > 0:
+            start = max(0, end - 4096)
+            f.seek(start)
+            newline = f.read(end - start).rfind(b"\n")
+            if newline >= 0:
+                keep = start + newline + 1
+                break
+            end = start
+        if keep < size:
+            f.truncate(keep)
+            os.fsync(f.fileno())
+    return keep
+
+
+class ProjectLock:
+    """
+    Advisory inter-process lock on a project directory (flock on a lock file).
+
+    Re-entrant within a process: nested acquisitions by the holding thread
+    are free, and other threads of the process wait their turn. Taking the
+    exclusive lock while holding the shared one upgrades it for the nested
+    block.
+    """
+
+    LOCK_FILE = ".research.lock"
+
+    def __init__(self, root: Path):
+        """
+        Initialize lock.
+
+        Args:
+            root: Project root; the lock file is created there on first use
+        """
+        self.path = Path(root) / self.LOCK_FILE
+        self._thread_lock = threading.RLock()
+        self._fd: Optional[int] = None
+        self._exclusive = False
+        self._depth = 0
+
+    def shared(self):
+        """Hold the lock for reading; other readers may hold it too."""
+        return self._hold(exclusive=False)
+
+    def exclusive(self):
+        """Hold the lock for a read-modify-write; no other holder is allowed."""
+        return self._hold(exclusive=True)
+
+    @property
+    def held(self) -> bool:
+        return self._depth > 0
+
+    @contextlib.contextmanager
+    def _hold(self, exclusive: bool):
+        with self._thread_lock:
+            previous = self._exclusive if self._depth else None
+            if previous is None or (exclusive and not previous):
+                self._flock(exclusive)
+            self._depth += 1
+            try:
+                yield
+            finally:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._unlock()
+                elif exclusive and not previous:
+                    self._flock(False)  # Back down to the outer shared lock
+
+    def _flock(self, exclusive: bool):
+        self._exclusive = exclusive
+        if fcntl is None or not self.path.parent.exists():
+            return
+        if self._fd is None:
+            self._fd = os.open(str(self.path), os.O_RDWR | os.O_CREAT, 0o644)
+        fcntl.flock(self._fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+
+    def _unlock(self):
+        self._exclusive = False
+        if self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+
+
+def _fsync_dir(directory: Path):
+    """Persist a rename; not every platform lets you open a directory."""
+    try:
+        fd = os.open(str(directory), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
@@ -0,0 +1,322 @@
+"""
+Paper Full Text - Text of the downloaded PDFs, chunked and indexed by arXiv ID.
+
+Handles:
+- Extracting text from resources/downloads/*.pdf in a process pool, with
+  pypdf (pip install -e ".[fulltext]") or the pdftotext command
+- Splitting each paper into overlapping chunks of about CHUNK_WORDS words,
+  each remembering the page it starts on
+- A compact SQLite store (resources/fulltext.db) keyed by arXiv ID, with
+  zlib-compressed chunk text
+- Incremental runs: a PDF is only extracted again when its sha256 (from
+  the download manifest) changes; papers whose PDF is gone are dropped
+- Feeding the chunks to the search index, so rv search covers papers
+"""
+
+import logging
+import os
+import re
+import shutil
+import sqlite3
+import subprocess
+import threading
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .downloads import DownloadManifest, file_sha256
+from .papers import canonical_arxiv_id
+
+try:
+    import pypdf
+except ImportError:
+    pypdf = None
+
+if TYPE_CHECKING:
+    from .project import ProjectManager
+
+
+CHUNK_WORDS = 200
+CHUNK_OVERLAP = 40  # Words repeated at the start of the next chunk
+
+
+@dataclass
+class Chunk:
+    """A passage of a paper."""
+    seq: int
+    page: int  # 1-based page the chunk starts on
+    text: str
+
+
+@dataclass
+class ExtractResult:
+    """Outcome of FullTextIndex.extract."""
+    extracted: int = 0
+    unchanged: int = 0
+    removed: int = 0
+    chunks: int = 0
+    failed: List[Tuple[str, str]] = field(default_factory=list)  # (key, error)
+    wall_seconds: float = 0.0
+
+
+def extractor_name() -> Optional[str]:
+    """The available PDF text extractor: "pypdf", "pdftotext" or None."""
+    if pypdf is not None:
+        return "pypdf"
+    if shutil.which("pdftotext"):
+        return "pdftotext"
+    return None
+
+
+def extract_pages(path: Path) -> List[str]:
+    """Text of each page of a PDF."""
+    if pypdf is not None:
+        reader = pypdf.PdfReader(str(path))
+        return [page.extract_text() or "" for page in reader.pages]
+    if shutil.which("pdftotext"):
+        output = subprocess.run(["pdftotext", "-enc", "UTF-8", str(path), "-"],
+                                capture_output=True, check=True).stdout
+        return output.decode("utf-8", errors="replace").split("\f")
+    raise RuntimeError("No PDF text extractor. Install pypdf: pip install -e \".[fulltext]\"")
+
+
+def chunk_pages(pages: List[str], words: int = CHUNK_WORDS,
+                overlap: int = CHUNK_OVERLAP) -> List[Chunk]:
+    """Split page texts into overlapping chunks of about `words` words."""
+    tokens: List[Tuple[str, int]] = []
+    for page_num, text in enumerate(pages, 1):
+        text = re.sub(r"(\w)-\n(\w)", r"\1\2", text)  # Re-join words hyphenated across lines
+        tokens.extend((word, page_num) for word in text.split())
+
+    chunks = []
+    step = max(1, words - overlap)
+    for start in range(0, len(tokens), step):
+        window = tokens[start:start + words]
+        chunks.append(Chunk(seq=len(chunks), page=window[0][1],
+                            text=" ".join(word for word, _ in window)))
+        if start + words >= len(tokens):
+            break
+    return chunks
+
+
+def _extract_worker(path: str) -> Tuple[int, List[Chunk]]:
+    """Process-pool task: (page count, chunks) of one PDF."""
+    logging.getLogger("pypdf").setLevel(logging.ERROR)  # Failures are reported by the caller
+    pages = extract_pages(Path(path))
+    return len(pages), chunk_pages(pages)
+
+
+class FullTextIndex:
+    """Chunked full text of one project's downloaded papers."""
+
+    INDEX_FILE = "fulltext.db"
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS papers (
+        key TEXT PRIMARY KEY,
+        file TEXT NOT NULL,
+        sha256 TEXT NOT NULL,
+        pages INTEGER NOT NULL DEFAULT 0,
+        chunks INTEGER NOT NULL DEFAULT 0,
+        extracted TEXT NOT NULL,
+        error TEXT
+    );
+    CREATE TABLE IF NOT EXISTS chunks (
+        key TEXT NOT NULL,
+        seq INTEGER NOT NULL,
+        page INTEGER NOT NULL,
+        text BLOB NOT NULL,
+        PRIMARY KEY (key, seq)
+    ) WITHOUT ROWID;
+    """
+
+    def __init__(self, project_manager: "ProjectManager"):
+        """
+        Initialize full-text index.
+
+        Args:
+            project_manager: ProjectManager of the project
+        """
+        self.pm = project_manager
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+
+    @property
+    def path(self) -> Path:
+        return self.pm.root / "resources" / self.INDEX_FILE
+
+    @property
+    def downloads_dir(self) -> Path:
+        return self.pm.root / "resources" / "downloads"
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False,
+                                         isolation_level=None, timeout=30)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(self.SCHEMA)
+        return self._conn
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    # === Extraction ===
+
+    def pdf_files(self) -> Dict[str, Tuple[Path, str]]:
+        """
+        Downloaded PDFs: key -> (path, sha256).
+
+        Checksums come from the download manifest; PDFs put into the
+        directory by hand are hashed here.
+        """
+        manifest = DownloadManifest(self.downloads_dir)
+        files = {}
+        for key, entry in manifest.files.items():
+            path = self.downloads_dir / entry["file"]
+            if path.exists():
+                files[key] = (path, entry["sha256"])
+        known = {path.name for path, _ in files.values()}
+        for path in sorted(self.downloads_dir.glob("*.pdf")) if self.downloads_dir.exists() else []:
+            if path.name not in known:
+                key = canonical_arxiv_id(path.stem.replace("_", "/")) or f"file:{path.name}"
+                files.setdefault(key, (path, file_sha256(path)))
+        return files
+
+    def extract(self, jobs: Optional[int] = None, force: bool = False,
+                progress: Optional[Callable[[str, Optional[str]], None]] = None) -> ExtractResult:
+        """
+        Extract and chunk every new or changed PDF.
+
+        Args:
+            jobs: Worker processes (default: CPU count)
+            force: Extract every PDF again
+            progress: Called with (key, error or None) as each PDF finishes
+
+        Returns:
+            ExtractResult
+        """
+        start = time.perf_counter()
+        result = ExtractResult()
+        files = self.pdf_files()
+        with self._lock:
+            stored = dict(self.conn.execute("SELECT key, sha256 FROM papers").fetchall())
+
+        for key in set(stored) - set(files):
+            self._delete(key)
+            result.removed += 1
+        todo = {key: path for key, (path, sha256) in files.items()
+                if force or stored.get(key) != sha256}
+        result.unchanged = len(files) - len(todo)
+
+        if todo:
+            if extractor_name() is None:
+                raise RuntimeError("No PDF text extractor. Install pypdf: pip install -e \".[fulltext]\"")
+            titles = self.titles()
+            workers = min(jobs or os.cpu_count() or 1, len(todo))
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = {pool.submit(_extract_worker, str(path)): key for key, path in todo.items()}
+                for future in as_completed(futures):
+                    key = futures[future]
+                    path, sha256 = files[key]
+                    try:
+                        pages, chunks = future.result()
+                        error = None
+                    except Exception as e:
+                        pages, chunks, error = 0, [], f"{type(e).__name__}: {e}"
+                    # Failures are stored too, so they aren't retried until the PDF changes
+                    self._store(key, path.name, sha256, pages, chunks, error)
+                    self.pm.search_index.paper_extracted(key, titles.get(key, ""), chunks)
+                    if error:
+                        result.failed.append((key, error))
+                    else:
+                        result.extracted += 1
+                        result.chunks += len(chunks)
+                    if progress:
+                        progress(key, error)
+
+        with self._lock:
+            self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        result.wall_seconds = round(time.perf_counter() - start, 3)
+        return result
+
+    def _store(self, key: str, filename: str, sha256: str, pages: int,
+               chunks: List[Chunk], error: Optional[str]):
+        with self._lock:
+            conn = self.conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute("DELETE FROM chunks WHERE key = ?", (key,))
+                conn.executemany(
+                    "INSERT INTO chunks (key, seq, page, text) VALUES (?, ?, ?, ?)",
+                    [(key, c.seq, c.page, zlib.compress(c.text.encode("utf-8"))) for c in chunks],
+                )
+                conn.execute(
+                    "INSERT OR REPLACE INTO papers (key, file, sha256, pages, chunks, extracted, error) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (key, filename, sha256, pages, len(chunks), datetime.now().isoformat(), error),
+                )
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def _delete(self, key: str):
+        with self._lock:
+            conn = self.conn
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("DELETE FROM chunks WHERE key = ?", (key,))
+            conn.execute("DELETE FROM papers WHERE key = ?", (key,))
+            conn.execute("COMMIT")
+        self.pm.search_index.paper_extracted(key, "", [])
+
+    def titles(self) -> Dict[str, str]:
+        """Registry titles by key, for labelling search hits."""
+        titles = {}
+        for paper in self.pm.get_papers():
+            arxiv_id = canonical_arxiv_id(paper.get("arxiv_id")) or canonical_arxiv_id(paper.get("url"))
+            key = arxiv_id or f"url:{(paper.get('url') or '').strip()}"
+            titles.setdefault(key, paper.get("title", ""))
+        return titles
+
+    # === Reading ===
+
+    def keys(self) -> List[str]:
+        """Keys of papers with extracted text."""
+        if not self.path.exists():
+            return []
+        with self._lock:
+            return [row[0] for row in self.conn.execute(
+                "SELECT key FROM papers WHERE chunks > 0 ORDER BY key")]
+
+    def chunks(self, key: str) -> List[Chunk]:
+        """A paper's chunks in order (empty if it has no text)."""
+        if not self.path.exists():
+            return []
+        lookup = canonical_arxiv_id(key) or key
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT seq, page, text FROM chunks WHERE key = ? ORDER BY seq", (lookup,)).fetchall()
+        return [Chunk(seq=seq, page=page, text=zlib.decompress(text).decode("utf-8"))
+                for seq, page, text in rows]
+
+    def iter_chunks(self) -> Iterator[Tuple[str, List[Chunk]]]:
+        """(key, chunks) for every paper with text."""
+        for key in self.keys():
+            yield key, self.chunks(key)
+
+    def stats(self) -> dict:
+        if not self.path.exists():
+            return {"papers": 0, "failed": 0, "chunks": 0, "pages": 0, "bytes": 0}
+        with self._lock:
+            papers, failed, chunks, pages = self.conn.execute(
+                "SELECT count(*), count(error), coalesce(sum(chunks), 0), coalesce(sum(pages), 0) "
+                "FROM papers").fetchone()
+        return {"papers": papers, "failed": failed, "chunks": chunks, "pages": pages,
+                "bytes": self.path.stat().st_size}
@@ -0,0 +1,331 @@
+"""
+Hypothesis History - Hypothesis versions stored as a base plus deltas.
+
+Handles:
+- hypotheses/history.jsonl: one record per finished version; v1 holds the
+  full component list, later versions only the components added, removed
+  or changed since the version before
+- Freezing a version when the next one is created: its files become
+  read-only, and any file identical to the previous version's is replaced
+  by a hardlink to it, so unchanged files are stored once
+- Reconstructing a version's components, diffs between any two versions
+  and a log of how the hypothesis evolved (rv hypothesis diff / log)
+"""
+
+import difflib
+import json
+import os
+import stat
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import yaml
+
+from .fileops import durable_append
+
+
+VERSION_FILES = ("hypothesis.md", "components.yaml", "status.yaml")
+_READ_ONLY = stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH
+
+
+def component_id(component: dict, position: int):
+    """A component's identity across versions: its id, else its position."""
+    return component.get("id", f"#{position + 1}")
+
+
+def component_delta(before: List[dict], after: List[dict]) -> dict:
+    """
+    Component-level changes from one component list to another.
+
+    Returns:
+        {"added": [component], "removed": [component],
+         "changed": [{"id", "fields": {name: [old, new]}, "component": new}]}
+    """
+    old = {component_id(c, i): c for i, c in enumerate(before)}
+    new = {component_id(c, i): c for i, c in enumerate(after)}
+    delta = {"added": [], "removed": [], "changed": []}
+    for cid, component in new.items():
+        if cid not in old:
+            delta["added"].append(component)
+        elif component != old[cid]:
+            fields = {name: [old[cid].get(name), component.get(name)]
+                      for name in sorted(set(old[cid]) | set(component), key=str)
+                      if old[cid].get(name) != component.get(name)}
+            delta["changed"].append({"id": cid, "fields": fields, "component": component})
+    delta["removed"] = [c for cid, c in old.items() if cid not in new]
+    return delta
+
+
+def compose_deltas(deltas: List[dict]) -> dict:
+    """Net effect of consecutive deltas, as one delta (only the deltas are read)."""
+    # id -> [component before the first delta, component after the last]
+    net: Dict[object, list] = {}
+    for delta in deltas:
+        steps = []
+        for component in delta.get("added", []):
+            steps.append((component_id(component, 0), None, component))
+        for component in delta.get("removed", []):
+            steps.append((component_id(component, 0), component, None))
+        for change in delta.get("changed", []):
+            after = change["component"]
+            before = dict(after)
+            for name, (old_value, _) in change["fields"].items():
+                if old_value is None:
+                    before.pop(name, None)
+                else:
+                    before[name] = old_value
+            steps.append((change["id"], before, after))
+        for cid, before, after in steps:
+            if cid in net:
+                net[cid][1] = after
+            else:
+                net[cid] = [before, after]
+
+    result = {"added": [], "removed": [], "changed": []}
+    for cid, (before, after) in net.items():
+        if before is None and after is not None:
+            result["added"].append(after)
+        elif after is None and before is not None:
+            result["removed"].append(before)
+        elif before != after and before is not None:
+            result["changed"].extend(component_delta([before], [after])["changed"])
+    return result
+
+
+def invert_delta(delta: dict) -> dict:
+    """The delta that undoes delta."""
+    return {
+        "added": delta.get("removed", []),
+        "removed": delta.get("added", []),
+        "changed": [
+            {"id": c["id"], "fields": {n: [new, old] for n, (old, new) in c["fields"].items()},
+             "component": _apply_fields(c["component"], c["fields"], use_old=True)}
+            for c in delta.get("changed", [])
+        ],
+    }
+
+
+def apply_delta(components: List[dict], delta: dict) -> List[dict]:
+    """Components after applying delta."""
+    removed = {component_id(c, 0) for c in delta.get("removed", [])}
+    changed = {c["id"]: c["component"] for c in delta.get("changed", [])}
+    result = []
+    for i, component in enumerate(components):
+        cid = component_id(component, i)
+        if cid in removed:
+            continue
+        result.append(changed.get(cid, component))
+    return result + list(delta.get("added", []))
+
+
+def _apply_fields(component: dict, fields: dict, use_old: bool) -> dict:
+    result = dict(component)
+    for name, (old_value, new_value) in fields.items():
+        value = old_value if use_old else new_value
+        if value is None:
+            result.pop(name, None)
+        else:
+            result[name] = value
+    return result
+
+
+@dataclass
+class VersionInfo:
+    """One entry of the hypothesis log."""
+    version: int
+    created: str
+    reason: str
+    components_total: int
+    added: int = 0
+    removed: int = 0
+    changed: int = 0
+    current: bool = False
+    linked: List[str] = field(default_factory=list)  # Files hardlinked to the previous version
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class HypothesisHistory:
+    """Delta history of one project's hypothesis versions."""
+
+    HISTORY_FILE = "history.jsonl"
+
+    def __init__(self, root: Path):
+        """
+        Initialize history.
+
+        Args:
+            root: Project root
+        """
+        self.dir = Path(root) / "hypotheses"
+        self._records: Optional[List[dict]] = None
+        self._mtime: Optional[float] = None
+
+    @property
+    def path(self) -> Path:
+        return self.dir / self.HISTORY_FILE
+
+    def version_dir(self, version: int) -> Path:
+        return self.dir / f"v{version}"
+
+    # === Reading ===
+
+    def records(self) -> List[dict]:
+        """Records of frozen versions, oldest first."""
+        mtime = self.path.stat().st_mtime if self.path.exists() else None
+        if self._records is None or mtime != self._mtime:
+            self._records = []
+            if mtime is not None:
+                for line in self.path.read_text().splitlines():
+                    if line.strip():
+                        self._records.append(json.loads(line))
+            self._mtime = mtime
+        return self._records
+
+    def frozen_versions(self) -> List[int]:
+        return [r["version"] for r in self.records()]
+
+    def components(self, version: int, current_version: int) -> List[dict]:
+        """
+        Components of a version: from the version's file if it is the
+        current one, else replayed from the base and deltas.
+        """
+        if version == current_version or version not in self.frozen_versions():
+            return self._read_components(version)
+        components: List[dict] = []
+        for record in self.records():
+            if record["version"] > version:
+                break
+            components = list(record["base"]) if "base" in record else apply_delta(components, record["delta"])
+        return components
+
+    def diff(self, from_version: int, to_version: int, current_version: int) -> dict:
+        """
+        Component changes between two versions (either order).
+
+        Only the deltas between the two are composed; the current version,
+        which has no delta yet, is compared against its predecessor's file.
+        """
+        if from_version > to_version:
+            return invert_delta(self.diff(to_version, from_version, current_version))
+        deltas = [r["delta"] for r in self.records()
+                  if from_version < r["version"] <= to_version and "delta" in r]
+        if to_version == current_version and to_version not in self.frozen_versions() \
+                and to_version > from_version:
+            deltas.append(self._live_delta(to_version))
+        return compose_deltas(deltas)
+
+    def statement_diff(self, from_version: int, to_version: int) -> List[str]:
+        """Unified diff of the two versions' hypothesis.md."""
+        def lines(version):
+            path = self.version_dir(version) / "hypothesis.md"
+            return path.read_text().splitlines(keepends=True) if path.exists() else []
+        return list(difflib.unified_diff(lines(from_version), lines(to_version),
+                                         f"v{from_version}/hypothesis.md", f"v{to_version}/hypothesis.md"))
+
+    def log(self, current_version: int) -> List[VersionInfo]:
+        """Every version, newest first."""
+        entries = []
+        for record in self.records():
+            delta = record.get("delta", {})
+            entries.append(VersionInfo(
+                version=record["version"], created=record.get("created", ""),
+                reason=record.get("reason", ""), components_total=record.get("components_total", 0),
+                added=len(delta.get("added", [])), removed=len(delta.get("removed", [])),
+                changed=len(delta.get("changed", [])), linked=record.get("linked", []),
+            ))
+        if current_version not in self.frozen_versions() and self.version_dir(current_version).exists():
+            status = self._read_status(current_version)
+            delta = self._live_delta(current_version) if current_version > 1 else {}
+            entries.append(VersionInfo(
+                version=current_version, created=str(status.get("last_updated") or ""),
+                reason=status.get("version_reason", ""),
+                components_total=len(self._read_components(current_version)),
+                added=len(delta.get("added", [])), removed=len(delta.get("removed", [])),
+                changed=len(delta.get("changed", [])), current=True,
+            ))
+        return list(reversed(entries))
+
+    # === Freezing ===
+
+    def freeze(self, version: int):
+        """
+        Record a finished version and make its files read-only, hardlinking
+        files unchanged since the previous version. Earlier versions that
+        were never recorded are frozen first.
+        """
+        frozen = set(self.frozen_versions())
+        for v in range(1, version + 1):
+            if v not in frozen and self.version_dir(v).exists():
+                self._freeze_one(v)
+
+    def _freeze_one(self, version: int):
+        components = self._read_components(version)
+        status = self._read_status(version)
+        record = {
+            "version": version,
+            "created": str(status.get("last_updated") or ""),
+            "frozen": datetime.now().isoformat(),
+            "reason": status.get("version_reason", ""),
+            "components_total": len(components),
+        }
+        previous = [r for r in self.records() if r["version"] < version]
+        if previous:
+            prior_components = self.components(previous[-1]["version"], current_version=-1)
+            record["delta"] = component_delta(prior_components, components)
+            record["linked"] = self._link_unchanged(previous[-1]["version"], version)
+        else:
+            record["base"] = components
+
+        for name in VERSION_FILES:
+            path = self.version_dir(version) / name
+            if path.exists():
+                os.chmod(path, _READ_ONLY)
+        self.dir.mkdir(parents=True, exist_ok=True)
+        durable_append(self.path, json.dumps(record, default=str) + "\n")
+
+    def _link_unchanged(self, previous: int, version: int) -> List[str]:
+        """Hardlink files identical to the previous version's. Returns their names."""
+        linked = []
+        for name in VERSION_FILES:
+            old, new = self.version_dir(previous) / name, self.version_dir(version) / name
+            if not (old.exists() and new.exists()) or os.path.samefile(old, new):
+                continue
+            if old.read_bytes() != new.read_bytes():
+                continue
+            tmp = new.with_name(f".{name}.{os.getpid()}.link")
+            try:
+                os.link(old, tmp)
+                os.replace(tmp, new)
+            except OSError:
+                # No hardlinks on this filesystem: keep the copy
+                tmp.unlink(missing_ok=True)
+                continue
+            linked.append(name)
+        return linked
+
+    # === Helpers ===
+
+    def _live_delta(self, version: int) -> dict:
+        return component_delta(self.components(version - 1, current_version=-1),
+                               self._read_components(version))
+
+    def _read_components(self, version: int) -> List[dict]:
+        path = self.version_dir(version) / "components.yaml"
+        data = yaml.safe_load(path.read_text()) if path.exists() else None
+        return (data or {}).get("components") or []
+
+    def _read_status(self, version: int) -> dict:
+        path = self.version_dir(version) / "status.yaml"
+        return (yaml.safe_load(path.read_text()) if path.exists() else None) or {}
+
+
+def parse_version(text: str) -> int:
+    """'v3' or '3' -> 3."""
+    value = text.strip().lower().lstrip("v")
+    if not value.isdigit() or int(value) < 1:
+        raise ValueError(f"Invalid version '{text}'. Use e.g. v2 or 2.")
+    return int(value)
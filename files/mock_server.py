@@ -0,0 +1,338 @@
+"""
+Mock Alphaxiv Server - Local stand-in for the assistant chat page.
+
+Handles:
+- Serving a chat page with the DOM shapes AlphaxivClient targets
+  (textarea input, send button, div.prose answers, Copy button, arxiv
+  links); answers are cloned from <template>s in the page source, so the
+  shapes can be checked without a browser
+- Streaming answers client-side at a configurable speed and size
+- Counting queries so benchmarks can check what the server saw
+- Serving a small, deterministic PDF per arXiv ID under /pdf/<id>, with
+  ETag and Range support, as a stand-in download source for rv papers fetch
+
+Used by `rv bench e2e`, or standalone with `rv bench serve`.
+"""
+
+import hashlib
+import json
+import random
+import re
+import threading
+from dataclasses import asdict, dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional
+from urllib.parse import urlparse
+
+
+@dataclass
+class MockConfig:
+    """Answer shape and streaming speed for the mock assistant."""
+    answer_chars: int = 3000
+    stream_chars_per_second: float = 2000.0
+    first_token_delay: float = 0.5
+    papers_per_answer: int = 5
+    gap_indicator_rate: float = 0.3  # Fraction of answers mentioning an "open question"
+    pdf_pages: int = 3  # Pages per mock paper PDF
+
+
+_WORDS = (
+    "inference scaling compute reasoning model language transformer benchmark "
+    "evaluation search verifier reward policy training data optimal budget sampling "
+    "chain thought latency accuracy empirical theoretical analysis method results"
+).split()
+
+
+_PAGE = """<!DOCTYPE html>
+<html>
+<head><meta charset="utf-8"><title>alphaXiv Assistant (mock)</title>
+<style>
+  body { font-family: sans-serif; margin: 0; }
+  main { max-width: 860px; margin: 0 auto; padding: 16px; }
+  .user-message { background: #eef; padding: 8px; margin: 8px 0; }
+  .prose { padding: 8px; margin: 8px 0; }
+  textarea { width: 100%; height: 64px; }
+</style>
+</head>
+<body>
+<main>
+  <div id="chat"></div>
+  <form id="ask-form">
+    <textarea placeholder="Ask a research question..."></textarea>
+    <button type="submit" aria-label="Send"><svg width="16" height="16"></svg></button>
+  </form>
+</main>
+<template id="answer-template">
+  <div class="prose"><p></p><ul></ul></div>
+</template>
+<template id="actions-template">
+  <div class="actions"><button type="button" aria-label="Copy">Copy</button></div>
+</template>
+<script>
+const CONFIG = __CONFIG__;
+const input = document.querySelector('textarea');
+const chat = document.getElementById('chat');
+
+// Answers are built from the <template>s, so the page source shows every
+// element shape AlphaxivClient looks for
+function clone(id) {
+  return document.getElementById(id).content.firstElementChild.cloneNode(true);
+}
+
+function escapeHtml(s) {
+  return s.replace(/[&<>"]/g, c => ({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;'}[c]));
+}
+
+async function ask(question) {
+  const user = document.createElement('div');
+  user.className = 'user-message';
+  user.textContent = question;
+  chat.appendChild(user);
+
+  const res = await fetch('/api/answer', {method: 'POST', body: JSON.stringify({question})});
+  const answer = await res.json();
+
+  const prose = clone('answer-template');
+  const body = prose.querySelector('p');
+  chat.appendChild(prose);
+
+  const chunk = Math.max(1, Math.round(CONFIG.stream_chars_per_second / 20));
+  let shown = 0;
+  await new Promise(r => setTimeout(r, CONFIG.first_token_delay * 1000));
+  await new Promise(done => {
+    const timer = setInterval(() => {
+      shown = Math.min(answer.text.length, shown + chunk);
+      body.textContent = answer.text.slice(0, shown);
+      if (shown >= answer.text.length) { clearInterval(timer); done(); }
+    }, 50);
+  });
+
+  const list = prose.querySelector('ul');
+  for (const paper of answer.papers) {
+    const li = document.createElement('li');
+    li.innerHTML = '<a href="' + escapeHtml(paper.url) + '">' + escapeHtml(paper.title) + '</a>';
+    list.appendChild(li);
+  }
+
+  chat.appendChild(clone('actions-template'));
+}
+
+function submit() {
+  const question = input.value.trim();
+  input.value = '';
+  if (question) ask(question);
+}
+
+input.addEventListener('keydown', e => {
+  if (e.key === 'Enter' && !e.shiftKey) {
+    e.preventDefault();
+    submit();
+  }
+});
+document.getElementById('ask-form').addEventListener('submit', e => {
+  e.preventDefault();
+  submit();
+});
+</script>
+</body>
+</html>
+"""
+
+
+def make_pdf(lines_per_page: List[List[str]]) -> bytes:
+    """A minimal valid PDF with one text line per entry, one page per list."""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None,
+               "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_ids = []
+    for lines in lines_per_page:
+        text = "".join(f"({line.replace(chr(92), '').replace('(', '').replace(')', '')}) Tj T* "
+                       for line in lines)
+        stream = f"BT /F1 11 Tf 14 TL 72 720 Td {text}ET"
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>")
+        page_ids.append(len(objects))
+    objects[1] = (f"<< /Type /Pages /Kids [{' '.join(f'{i} 0 R' for i in page_ids)}] "
+                  f"/Count {len(page_ids)} >>")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for num, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{num} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return bytes(out)
+
+
+class MockAlphaxivServer:
+    """Threaded local HTTP server imitating the Alphaxiv assistant."""
+
+    def __init__(self, config: Optional[MockConfig] = None, host: str = "127.0.0.1",
+                 port: int = 0, seed: int = 0):
+        """
+        Initialize mock server.
+
+        Args:
+            config: Answer size and streaming settings
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+            seed: Seed for generated answers
+        """
+        self.config = config or MockConfig()
+        self.seed = seed
+        self.queries = 0
+        self.pdf_requests = 0
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Assistant page URL, suitable for AlphaxivClient(url=...)."""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/assistant"
+
+    @property
+    def pdf_url(self) -> str:
+        """PDF base URL, suitable for rv papers fetch --base-url."""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/pdf/"
+
+    def start(self) -> "MockAlphaxivServer":
+        """Serve in a background thread."""
+        self._thread = threading.Thread(target=self._httpd.serve_forever,
+                                        name="rv-mock-alphaxiv", daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        """Serve in the calling thread until interrupted."""
+        self._httpd.serve_forever()
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "MockAlphaxivServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def make_answer(self, question: str) -> dict:
+        """Deterministic answer text and papers for a question."""
+        digest = hashlib.sha256(f"{self.seed}:{question}".encode()).hexdigest()
+        rng = random.Random(int(digest[:16], 16))
+
+        words = []
+        length = 0
+        while length < self.config.answer_chars:
+            word = rng.choice(_WORDS)
+            words.append(word)
+            length += len(word) + 1
+        if rng.random() < self.config.gap_indicator_rate:
+            words.append("- this remains an open question.")
+        text = " ".join(words)
+
+        papers = []
+        for _ in range(self.config.papers_per_answer):
+            arxiv_id = f"{rng.randint(2301, 2512)}.{rng.randint(1, 29999):05d}"
+            papers.append({
+                "title": " ".join(rng.choice(_WORDS) for _ in range(6)).title(),
+                "url": f"https://arxiv.org/abs/{arxiv_id}",
+            })
+        return {"text": text, "papers": papers}
+
+    def make_paper_pdf(self, arxiv_id: str) -> bytes:
+        """Deterministic PDF for an arXiv ID: a title line and a few pages of words."""
+        digest = hashlib.sha256(f"{self.seed}:pdf:{arxiv_id}".encode()).hexdigest()
+        rng = random.Random(int(digest[:16], 16))
+        pages = []
+        for page in range(max(1, self.config.pdf_pages)):
+            lines = [f"arXiv:{arxiv_id}"] if page == 0 else []
+            lines += [" ".join(rng.choice(_WORDS) for _ in range(10)) for _ in range(40)]
+            pages.append(lines)
+        return make_pdf(pages)
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # Keep-alive, so download pools can reuse connections
+
+            def do_GET(self):
+                path = urlparse(self.path).path
+                if path.startswith("/pdf/"):
+                    self._send_pdf(path[len("/pdf/"):].removesuffix(".pdf"))
+                elif path in ("/", "/assistant") or path.startswith("/assistant/"):
+                    page = _PAGE.replace("__CONFIG__", json.dumps(asdict(server.config)))
+                    self._send(200, page.encode(), "text/html; charset=utf-8")
+                elif path == "/stats":
+                    self._send_json({"queries": server.queries, "config": asdict(server.config)})
+                else:
+                    self._send(404, b"not found", "text/plain")
+
+            def do_POST(self):
+                if urlparse(self.path).path != "/api/answer":
+                    self._send(404, b"not found", "text/plain")
+                    return
+                length = int(self.headers.get("Content-Length", 0))
+                try:
+                    question = json.loads(self.rfile.read(length) or b"{}").get("question", "")
+                except ValueError:
+                    self._send(400, b"bad request", "text/plain")
+                    return
+                with server._lock:
+                    server.queries += 1
+                self._send_json(server.make_answer(question))
+
+            def _send_pdf(self, arxiv_id: str):
+                with server._lock:
+                    server.pdf_requests += 1
+                if not arxiv_id:
+                    self._send(404, b"not found", "text/plain")
+                    return
+                body = server.make_paper_pdf(arxiv_id)
+                etag = '"%s"' % hashlib.sha256(body).hexdigest()[:16]
+                match = re.fullmatch(r"bytes=(\d+)-", self.headers.get("Range", ""))
+                if_range = self.headers.get("If-Range")
+                if match and (if_range is None or if_range == etag):
+                    start = int(match.group(1))
+                    if start >= len(body):
+                        self.send_response(416)
+                        self.send_header("Content-Range", f"bytes */{len(body)}")
+                        self.send_header("Content-Length", "0")
+                        self.end_headers()
+                        return
+                    self.send_response(206)
+                    self.send_header("Content-Range", f"bytes {start}-{len(body) - 1}/{len(body)}")
+                    body = body[start:]
+                else:
+                    self.send_response(200)
+                self.send_header("Content-Type", "application/pdf")
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("ETag", etag)
+                self.send_header("Accept-Ranges", "bytes")
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _send_json(self, data: dict):
+                self._send(200, json.dumps(data).encode(), "application/json")
+
+            def _send(self, status: int, body: bytes, content_type: str):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # Keep benchmark output clean
+
+        return Handler
@@ -10,27 +10,57 @@ Handles:
 """
 
 import asyncio
-import json
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Optional, Callable
-from dataclasses import dataclass
+from typing import List, Dict, Iterator, Optional, Callable
+from dataclasses import dataclass, field
 
 from .alphaxiv import AlphaxivClient, AlphaxivResponse
+from .budget import BudgetTracker, resume_limits
+from .cocitation import PaperRank
+from .persistence import AsyncPersistence
+from .profiling import CycleProfiler, NULL_PROFILER
 from .project import ProjectManager
 
 
 @dataclass
 class CycleResult:
-    """Result of a single verification cycle."""
+    """
+    Result of a single verification cycle.
+
+    Responses and the synthesis are already saved in the project, so only
+    the numbers of the answered questions and the counts are kept; the rest
+    is read back from the project when accessed.
+    """
     cycle_num: int
     phase: str
     questions: List[str]
-    responses: List[AlphaxivResponse]
-    synthesis: str
-    new_gaps: List[dict]
-    papers_found: List[dict]
+    question_nums: List[int]  # Questions whose response was saved
     duration_seconds: float
+    papers_count: int = 0
+    new_gaps_count: int = 0
+    deferred_questions: List[str] = field(default_factory=list)
+    budget_exhausted: bool = False
+    pm: Optional[ProjectManager] = field(default=None, repr=False, compare=False)
+
+    @property
+    def response_count(self) -> int:
+        return len(self.question_nums)
+
+    def iter_responses(self) -> Iterator[dict]:
+        """This cycle's saved responses, read from the project one at a time."""
+        wanted = set(self.question_nums)
+        for response in self.pm.iter_responses([self.cycle_num]):
+            if response["question_num"] in wanted:
+                yield response
+
+    @property
+    def papers_found(self) -> List[dict]:
+        return [paper for response in self.iter_responses() for paper in response["papers"]]
+
+    @property
+    def synthesis(self) -> str:
+        return self.pm.cycle_files.read_text(self.cycle_num, "synthesis.md") or ""
 
 
 class ResearchOrchestrator:
@@ -52,18 +82,33 @@ class ResearchOrchestrator:
         },
     }
     
-    def __init__(self, project_manager: ProjectManager, debug: bool = False):
+    # Pause between questions (seconds)
+    QUERY_DELAY = 2.0
+    
+    def __init__(self, project_manager: ProjectManager, debug: bool = False,
+                 client: Optional[AlphaxivClient] = None,
+                 profile: bool = False, profile_cpu: bool = False):
         """
         Initialize orchestrator.
 
         Args:
             project_manager: ProjectManager instance for the current project
             debug: Enable debug mode for troubleshooting selectors
+            client: Alphaxiv client to use (default: a visible browser client)
+            profile: Write a trace.json of each cycle's phases into its directory
+            profile_cpu: Also write a cProfile profile.prof per cycle
         """
         self.pm = project_manager
+        self.persistence = AsyncPersistence(project_manager)
         self.debug = debug
-        self.client = AlphaxivClient(headless=False, debug=debug)  # Visible for debugging
+        self.client = client or AlphaxivClient(headless=False, debug=debug)  # Visible for debugging
+        self.query_delay = self.QUERY_DELAY
+        self.profile = profile or profile_cpu
+        self.profile_cpu = profile_cpu
+        self._profiler = NULL_PROFILER
         self._question_generator: Optional[Callable] = None
+        self.budget: Optional[BudgetTracker] = None
+        self._carried_questions: List[str] = []
     
     def set_question_generator(self, generator: Callable):
         """
@@ -81,18 +126,32 @@ class ResearchOrchestrator:
         self._question_generator = generator
     
     async def run_cycles(self, num_cycles: int = 2, 
-                        phase_override: Optional[str] = None) -> List[CycleResult]:
+                        phase_override: Optional[str] = None,
+                        max_minutes: Optional[float] = None,
+                        max_queries: Optional[int] = None,
+                        deadline: Optional[datetime] = None,
+                        carried_questions: Optional[List[str]] = None) -> List[CycleResult]:
         """
         Run multiple verification cycles.
         
         Args:
             num_cycles: Number of cycles to run
             phase_override: Force a specific phase for all cycles
+            max_minutes: Stop once this much wall-clock time has been used
+            max_queries: Stop once this many Alphaxiv queries have been sent
+            deadline: Stop before this point in time
+            carried_questions: Questions deferred by an earlier run, asked
+                first in the first cycle
             
         Returns:
             List of CycleResult objects
         """
         results = []
+        self._carried_questions = list(carried_questions or [])
+        loop = asyncio.get_running_loop()
+        self.budget = BudgetTracker(max_minutes=max_minutes, max_queries=max_queries,
+                                    deadline=deadline, query_overhead=self.query_delay,
+                                    clock=loop.time)
         
         try:
             # Start new Alphaxiv conversation
@@ -100,13 +159,22 @@ class ResearchOrchestrator:
 
             # Only send context recap if we have previous cycles (something to recap)
             if self.pm.state.total_cycles_completed > 0:
-                recap = self.pm.get_context_recap()
-                print("📋 Sending context recap to Alphaxiv...")
-                await self.client.send_context_recap(recap)
+                if self.budget.can_afford(1):
+                    recap = await self.persistence.run(self.pm.get_context_recap)
+                    print("📋 Sending context recap to Alphaxiv...")
+                    start = loop.time()
+                    await self.client.send_context_recap(recap)
+                    self.budget.record_query(loop.time() - start)
+                else:
+                    print("📋 Skipping context recap (budget too tight)")
             else:
                 print("📋 Starting fresh research session...")
             
             for i in range(num_cycles):
+                if self.budget.exhausted() or not self.budget.can_afford(1):
+                    print(f"\n⏱  Budget exhausted before cycle {self.pm.state.total_cycles_completed + 1} - stopping")
+                    break
+
                 cycle_num = self.pm.state.total_cycles_completed + 1
                 
                 # Determine phase
@@ -121,91 +189,160 @@ class ResearchOrchestrator:
                 print(f"🔄 Cycle {cycle_num} | Phase: {phase}")
                 print(f"{'='*60}")
                 
+                if self.profile:
+                    self._profiler = CycleProfiler(cpu=self.profile_cpu)
+                    self.persistence.profiler = self._profiler
+                self._profiler.start()
+
                 result = await self._run_single_cycle(cycle_num, phase)
                 results.append(result)
                 
-                # Update state
-                self.pm.update_state(
-                    current_cycle=cycle_num,
-                    current_phase=phase,
-                    total_cycles_completed=cycle_num
-                )
-                
-                # Checkpoint
-                self._save_checkpoint(cycle_num, result)
+                with self._profiler.span("checkpoint", "persistence"):
+                    # Update state
+                    self.persistence.update_state(
+                        current_cycle=cycle_num,
+                        current_phase=phase,
+                        total_cycles_completed=cycle_num
+                    )
+                    
+                    # Checkpoint (flush so the cycle is fully on disk before moving on)
+                    await self.persistence.run(self._save_checkpoint, cycle_num, result)
+                    await self.persistence.flush()
+
+                self._profiler.stop()
+                if self.profile:
+                    cycle_dir = self.pm.root / "research" / f"cycle-{cycle_num:03d}"
+                    await self.persistence.run(self._profiler.write, cycle_dir)
+                    print(f"  🔬 Profile saved to research/cycle-{cycle_num:03d}/")
+                    self._profiler = NULL_PROFILER
+                    self.persistence.profiler = NULL_PROFILER
                 
                 # Check for hypothesis versioning triggers
                 if self._should_version_hypothesis(results):
                     print("\n⚡ Significant findings detected - consider versioning hypothesis")
+
+                if result.budget_exhausted:
+                    print(f"\n⏱  Budget exhausted during cycle {cycle_num} - checkpoint saved, stopping")
+                    break
                 
         finally:
             await self.client.close()
+            await self.persistence.close()
+
+        if self.budget.is_limited:
+            usage = self.budget.summary()
+            print(f"\n⏱  Budget used: {usage['queries_used']} queries in "
+                  f"{usage['elapsed_seconds'] / 60:.1f} min "
+                  f"(~{usage['expected_query_seconds']:.0f}s per query)")
         
         return results
     
     async def _run_single_cycle(self, cycle_num: int, phase: str) -> CycleResult:
         """Run a single verification cycle."""
-        start_time = datetime.now()
+        loop = asyncio.get_running_loop()
+        start_time = loop.time()
         
         # 1. Generate questions
         print(f"\n📝 Generating questions for {phase} phase...")
-        questions = self._generate_questions(phase, cycle_num)
+        with self._profiler.span("generate_questions", phase=phase):
+            questions = await self.persistence.run(self._generate_questions, phase, cycle_num)
+
+        # Questions deferred by the previous run go first
+        if self._carried_questions:
+            carried, self._carried_questions = self._carried_questions, []
+            questions = carried + [q for q in questions if q not in carried]
+            print(f"  ↩  Re-queued {len(carried)} deferred question(s)")
+
+        # Defer the lower-value tail if the budget can't cover every question
+        deferred = []
+        if self.budget is not None:
+            questions, deferred = self.budget.fit(questions)
+            if deferred:
+                print(f"  ⏱  Deferring {len(deferred)} question(s) to fit the budget")
         
         # Save questions
-        self.pm.save_cycle_questions(cycle_num, questions)
+        self.persistence.save_cycle_questions(cycle_num, questions, phase)
         
         # 2. Query Alphaxiv for each question
         responses = []
+        answered = []
         all_papers = []
+        budget_exhausted = False
         
         for q_num, question in enumerate(questions, 1):
+            if self.budget is not None and not self.budget.can_afford(1):
+                # Out of budget mid-cycle: keep what we have and defer the rest
+                deferred = questions[q_num - 1:] + deferred
+                budget_exhausted = True
+                break
+
             print(f"\n  Q{q_num}/{len(questions)}: {question[:60]}...")
+
+            timeout = self.budget.query_timeout(120) if self.budget is not None else 120
+            start = loop.time()
             
             try:
-                response = await self.client.query(question)
+                with self._profiler.span(f"query Q{q_num}", "alphaxiv", question=question[:80]):
+                    response = await self.client.query(question, timeout_seconds=timeout)
+                latency = loop.time() - start
                 responses.append(response)
+                answered.append(q_num)
                 all_papers.extend(response.papers)
                 
                 # Save individual response
-                self.pm.save_cycle_response(
+                self.persistence.save_cycle_response(
                     cycle_num, q_num, question,
                     {
                         "text": response.text,
                         "papers": response.papers,
                         "timestamp": response.timestamp,
+                        "duration_seconds": round(latency, 2),
                     }
                 )
                 
-                print(f"    ✓ Response received ({len(response.papers)} papers)")
+                print(f"    ✓ Response received ({len(response.papers)} papers, {latency:.0f}s)")
                 
             except Exception as e:
+                latency = loop.time() - start
                 print(f"    ✗ Error: {e}")
                 responses.append(AlphaxivResponse(
                     text=f"[Error: {e}]",
                     papers=[]
                 ))
+
+            if self.budget is not None:
+                self.budget.record_query(latency)
             
             # Small delay between questions
-            await asyncio.sleep(2)
+            with self._profiler.span("pacing", "alphaxiv"):
+                await asyncio.sleep(self.query_delay)
+
+        if self.budget is not None and deferred and not budget_exhausted:
+            budget_exhausted = not self.budget.can_afford(1)
         
         # 3. Synthesize responses
         print(f"\n🔮 Synthesizing {len(responses)} responses...")
-        synthesis, new_gaps = self._synthesize_responses(responses, phase)
+        with self._profiler.span("synthesize"):
+            # The graph is read on the writer thread, after this cycle's responses are logged
+            central = await self.persistence.run(self.pm.paper_graph.top, 5)
+            synthesis, new_gaps = self._synthesize_responses(responses, phase, central)
         
         # 4. Save cycle artifacts
-        self.pm.save_cycle_synthesis(cycle_num, synthesis, new_gaps, all_papers)
+        self.persistence.save_cycle_synthesis(cycle_num, synthesis, new_gaps, all_papers)
         
-        duration = (datetime.now() - start_time).total_seconds()
+        duration = loop.time() - start_time
         
         return CycleResult(
             cycle_num=cycle_num,
             phase=phase,
             questions=questions,
-            responses=responses,
-            synthesis=synthesis,
-            new_gaps=new_gaps,
-            papers_found=all_papers,
+            question_nums=answered,
             duration_seconds=duration,
+            papers_count=len(all_papers),
+            new_gaps_count=len(new_gaps),
+            deferred_questions=deferred,
+            budget_exhausted=budget_exhausted,
+            pm=self.pm,
         )
     
     def _extract_topic_from_concept(self, concept: str) -> str:
@@ -304,6 +441,14 @@ class ResearchOrchestrator:
                 f"connect to or contradict each other? What patterns emerge?"
             )
             
+            # Ask how the most co-cited papers fit together
+            central = [p for p in self.pm.paper_graph.top(2) if p.degree and p.title]
+            if len(central) == 2:
+                questions.append(
+                    f"How do \"{central[0].title}\" and \"{central[1].title}\" relate to each other "
+                    f"and to {key_terms[0] if key_terms else 'this field'}? Which later work builds on both?"
+                )
+
             if gaps:
                 gap_descs = [g.get('description', '') for g in gaps[:3] if g.get('description')]
                 if gap_descs:
@@ -332,10 +477,13 @@ class ResearchOrchestrator:
         return questions
     
     def _synthesize_responses(self, responses: List[AlphaxivResponse], 
-                             phase: str) -> tuple[str, List[dict]]:
+                             phase: str, central: Optional[List[PaperRank]] = None) -> tuple[str, List[dict]]:
         """
         Synthesize multiple responses into a coherent summary.
         Also identifies new gaps.
+
+        Args:
+            central: Most central papers of the co-citation graph, listed in the template
         
         Note: In full implementation, this would be done by Claude Code.
         Here we provide a structured template for Claude Code to fill.
@@ -364,6 +512,12 @@ class ResearchOrchestrator:
 """
         for paper in all_papers[:10]:
             synthesis += f"- [{paper['title']}]({paper['url']})\n"
+
+        central = [p for p in central or [] if p.degree]
+        if central:
+            synthesis += "\n## Most Central Papers (co-citation)\n\n"
+            for paper in central:
+                synthesis += f"- [{paper.title}]({paper.url}) - cited with {paper.degree} other papers\n"
         
         synthesis += """
 ## Patterns Identified
@@ -405,8 +559,8 @@ class ResearchOrchestrator:
         3. Contradicting evidence found
         """
         # Simple heuristic: lots of papers + identified gaps
-        total_papers = sum(len(r.papers_found) for r in results)
-        total_gaps = sum(len(r.new_gaps) for r in results)
+        total_papers = sum(r.papers_count for r in results)
+        total_gaps = sum(r.new_gaps_count for r in results)
         
         return total_papers > 10 and total_gaps > 0
     
@@ -416,33 +570,61 @@ class ResearchOrchestrator:
             "cycle_num": cycle_num,
             "phase": result.phase,
             "timestamp": datetime.now().isoformat(),
-            "papers_found": len(result.papers_found),
-            "new_gaps": len(result.new_gaps),
+            "papers_found": result.papers_count,
+            "new_gaps": result.new_gaps_count,
         }
+        if result.deferred_questions:
+            checkpoint["deferred_questions"] = result.deferred_questions
+        if self.budget is not None and self.budget.is_limited:
+            checkpoint["budget"] = self.budget.summary()
         
-        checkpoint_path = self.pm.root / "research" / f"cycle-{cycle_num:03d}" / "checkpoint.json"
-        checkpoint_path.write_text(json.dumps(checkpoint, indent=2))
+        self.pm.save_checkpoint(cycle_num, checkpoint)
     
-    async def resume(self):
-        """Resume from the last checkpoint."""
+    async def resume(self, max_minutes: Optional[float] = None,
+                     max_queries: Optional[int] = None,
+                     deadline: Optional[datetime] = None):
+        """
+        Resume from the last checkpoint.
+
+        Questions the last cycle deferred are asked first, and the run keeps
+        the budget limits it was started with unless new ones are given.
+
+        Args:
+            max_minutes: Override the checkpointed --max-minutes
+            max_queries: Override the checkpointed --max-queries
+            deadline: Override the checkpointed --deadline
+        """
         # Find latest checkpoint
-        research_dir = self.pm.root / "research"
-        checkpoints = sorted(research_dir.glob("cycle-*/checkpoint.json"))
+        latest = self.pm.catalog.latest_checkpoint()
         
-        if not checkpoints:
+        if latest is None:
             print("No checkpoints found. Starting fresh.")
-            await self.run_cycles()
+            await self.run_cycles(max_minutes=max_minutes, max_queries=max_queries,
+                                  deadline=deadline)
             return
         
-        latest = checkpoints[-1]
-        with open(latest) as f:
-            checkpoint = json.load(f)
+        checkpoint = self.pm.load_checkpoint(latest["cycle_num"])
         
         print(f"📍 Resuming from cycle {checkpoint['cycle_num']}")
+
+        limits = resume_limits(checkpoint.get("budget"))
+        if (checkpoint.get("budget") or {}).get("deadline") and limits["deadline"] is None:
+            print(f"  ⚠ Deadline {checkpoint['budget']['deadline']} has passed - ignoring it")
+        if max_minutes is not None:
+            limits["max_minutes"] = max_minutes
+        if max_queries is not None:
+            limits["max_queries"] = max_queries
+        if deadline is not None:
+            limits["deadline"] = deadline
+        
+        deferred = checkpoint.get("deferred_questions", [])
         
         # Continue from next cycle
         remaining = 20 - checkpoint['cycle_num']
         if remaining > 0:
-            await self.run_cycles(num_cycles=remaining)
+            await self.run_cycles(num_cycles=remaining, carried_questions=deferred, **limits)
         else:
             print("All 20 cycles completed.")
+            if deferred:
+                print(f"  ⚠ {len(deferred)} deferred question(s) were never asked "
+                      f"(see checkpoint.json; ask them with rv cycle)")
@@ -0,0 +1,48 @@
+"""
+Alphaxiv page selectors.
+
+Handles:
+- CSS/Playwright selectors for each element AlphaxivClient looks for,
+  with fallbacks tried in order
+- Keeping them importable without Playwright, so the mock page can be
+  checked against them without a browser
+"""
+
+# Multiple selector fallbacks for resilience to UI changes
+# Each entry is a list of selectors to try in order
+SELECTOR_FALLBACKS = {
+    "input_box": [
+        'textarea[placeholder*="Ask"]',
+        'textarea[placeholder*="ask"]',
+        'textarea[placeholder*="research"]',
+        'textarea[placeholder*="question"]',
+        'textarea[placeholder*="Search"]',
+        'textarea',  # Last resort: any textarea
+        'input[type="text"][placeholder*="Ask"]',
+        'input[type="text"][placeholder*="Search"]',
+        '[contenteditable="true"]',
+    ],
+    "send_button": [
+        'button[type="submit"]:not([disabled])',
+        'button:has(svg):not([disabled])',
+        'button[aria-label*="send" i]:not([disabled])',
+        'button[aria-label*="submit" i]:not([disabled])',
+        'form button:not([disabled])',
+    ],
+    "response_container": [
+        "div.prose",
+        "div[class*='message']",
+        "div[class*='assistant']",
+        "div[class*='response']",
+        "div[class*='chat']",
+        "div[class*='answer']",
+    ],
+    "completion_indicator": [
+        "button:has-text('Copy')",
+        "[aria-label*='Copy']",
+        "button:has-text('👍')",
+        "button:has-text('👎')",
+        "[class*='feedback']",
+        "[class*='actions']",
+    ],
+}
@@ -0,0 +1,257 @@
+"""
+Paper Registry - Append-only paper log keyed by canonical arXiv ID.
+
+Handles:
+- Canonical arXiv IDs from URLs and text (version-stripped; new-style
+  2401.12345 and old-style hep-th/9901001 IDs)
+- An append-only JSON-lines log (resources/papers.log.jsonl) on top of the
+  papers.yaml snapshot, so adding a paper is a single O(1) append
+- A lazily rebuilt in-memory index of known papers
+- Compaction that folds the log into a de-duplicated snapshot
+- Buffering appends inside a transaction so they land as one durable write
+- Merging duplicates (rv papers dedupe); a merged entry keeps the other
+  entries' keys as aliases so they aren't registered again
+"""
+
+import json
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import yaml
+
+from .fileops import atomic_write, durable_append, read_log, truncate_partial_line
+
+
+# New-style IDs (0704.0001 onwards): YYMM.NNNN or YYMM.NNNNN, optional version
+_NEW_STYLE = re.compile(r"(?<![\d.])(\d{4}\.\d{4,5})(?:v\d+)?(?![\d])")
+# Old-style IDs: archive(.SUBJECT)/YYMMNNN, optional version
+_OLD_STYLE = re.compile(r"(?<![\w.-])([a-z]+(?:-[a-z]+)?(?:\.[A-Z]{2})?/\d{7})(?:v\d+)?(?!\d)")
+# Where an ID sits in arxiv/alphaxiv URLs
+_URL_ID = re.compile(
+    r"(?:arxiv|alphaxiv)\.org/(?:abs|pdf|html|overview)/([^?#\s]+?)(?:\.pdf)?/?(?:[?#]|$)"
+)
+
+
+def canonical_arxiv_id(text: Optional[str]) -> Optional[str]:
+    """
+    Canonical, version-stripped arXiv ID from a URL or free text.
+
+    >>> canonical_arxiv_id("https://www.alphaxiv.org/abs/2401.01234v3")
+    '2401.01234'
+    >>> canonical_arxiv_id("arxiv.org/pdf/hep-th/9901001v2.pdf")
+    'hep-th/9901001'
+    """
+    if not text:
+        return None
+    candidates = []
+    url_match = _URL_ID.search(text)
+    if url_match:
+        candidates.append(url_match.group(1))
+    candidates.append(text)
+
+    for candidate in candidates:
+        match = _NEW_STYLE.search(candidate) or _OLD_STYLE.search(candidate)
+        if match:
+            return match.group(1)
+    return None
+
+
+def paper_key(paper: dict) -> str:
+    """Registry key: the canonical arXiv ID, else the normalised URL."""
+    arxiv_id = canonical_arxiv_id(paper.get("arxiv_id")) or canonical_arxiv_id(paper.get("url"))
+    if arxiv_id:
+        return f"arxiv:{arxiv_id}"
+    url = (paper.get("url") or "").strip().lower()
+    url = re.sub(r"^https?://(www\.)?", "", url).rstrip("/")
+    return f"url:{url}" if url else f"title:{(paper.get('title') or '').strip().lower()}"
+
+
+def _keys_of(paper: dict) -> List[str]:
+    """A paper's key plus the keys of duplicates merged into it (rv papers dedupe)."""
+    return [paper_key(paper), *paper.get("aliases", [])]
+
+
+class PaperRegistry:
+    """papers.yaml snapshot plus an append-only log of papers added since."""
+
+    SNAPSHOT_FILE = "papers.yaml"
+    LOG_FILE = "papers.log.jsonl"
+
+    def __init__(self, resources_dir: Path):
+        """
+        Initialize registry.
+
+        Args:
+            resources_dir: The project's resources/ directory
+        """
+        self.dir = Path(resources_dir)
+        # Every known key (aliases included), and each registered paper's own key
+        self._keys: Optional[set] = None
+        self._primary: set = set()
+        self._snapshot_mtime: Optional[float] = None
+        self._log_offset = 0
+        # Lines added inside a transaction, written by commit()
+        self._pending: Optional[List[str]] = None
+
+    @property
+    def snapshot_path(self) -> Path:
+        return self.dir / self.SNAPSHOT_FILE
+
+    @property
+    def log_path(self) -> Path:
+        return self.dir / self.LOG_FILE
+
+    # === Reading ===
+
+    def list(self) -> List[dict]:
+        """All registered papers: snapshot first, then the log (duplicates dropped)."""
+        seen = set()
+        papers = []
+        pending = [json.loads(line) for line in self._pending or []]
+        for paper in self._read_snapshot() + self._read_log(0)[0] + pending:
+            key = paper_key(paper)
+            if key not in seen:
+                seen.add(key)
+                papers.append(paper)
+        return papers
+
+    def __len__(self) -> int:
+        self._refresh()
+        return len(self._primary)
+
+    def __contains__(self, paper: dict) -> bool:
+        self._refresh()
+        return paper_key(paper) in self._keys
+
+    # === Writing ===
+
+    def add(self, new_papers: List[dict]) -> int:
+        """
+        Append papers not already registered.
+
+        Returns:
+            Number of registered papers
+        """
+        self._refresh()
+        lines = []
+        for paper in new_papers:
+            key = paper_key(paper)
+            if key in self._keys:
+                continue
+            arxiv_id = canonical_arxiv_id(paper.get("arxiv_id")) or canonical_arxiv_id(paper.get("url"))
+            if arxiv_id:
+                paper["arxiv_id"] = arxiv_id
+            paper["added"] = datetime.now().isoformat()
+            self._keys.add(key)
+            self._primary.add(key)
+            lines.append(json.dumps(paper, default=str) + "\n")
+
+        if self._pending is not None:
+            self._pending.extend(lines)
+        elif lines:
+            self._append(lines)
+        return len(self._primary)
+
+    def begin(self):
+        """Start buffering appends until commit()."""
+        self._pending = []
+
+    def commit(self):
+        """Write the buffered appends in one durable append."""
+        lines, self._pending = self._pending, None
+        if lines:
+            self._append(lines)
+
+    def rollback(self):
+        """Drop the buffered appends."""
+        self._pending = None
+        self._keys = None
+
+    def replace(self, papers: List[dict]):
+        """Replace the whole registry with papers (written as a fresh snapshot)."""
+        self._write_snapshot(papers)
+        if self.log_path.exists():
+            self.log_path.unlink()
+        if self._pending is not None:
+            self._pending = []
+        self._keys = None
+
+    def compact(self) -> Tuple[int, int]:
+        """
+        Fold the log into a de-duplicated snapshot.
+
+        Returns:
+            (entries before, papers after)
+        """
+        before = len(self._read_snapshot()) + len(self._read_log(0)[0]) + len(self._pending or [])
+        papers = self.list()
+        self.replace(papers)
+        return before, len(papers)
+
+    def merge(self, merges: List[Tuple[dict, List[str]]]) -> int:
+        """
+        Replace duplicate entries with merged ones (written as a fresh snapshot).
+
+        Args:
+            merges: (merged paper, keys of the entries it replaces) pairs;
+                the merged paper keeps the key of the entry it was kept from
+
+        Returns:
+            Number of entries removed
+        """
+        merged = {paper_key(paper): paper for paper, _ in merges}
+        removed = {key for _, keys in merges for key in keys}
+        current = self.list()
+        papers = [merged.get(paper_key(p), p) for p in current if paper_key(p) not in removed]
+        self.replace(papers)
+        return len(current) - len(papers)
+
+    def _append(self, lines: List[str]):
+        """
+        Append lines to the log, keeping the index offset in step if nobody else wrote.
+
+        Called under the project's exclusive lock, so a partial final line
+        can only be left over from a crashed write; it is cut off first so
+        the new lines don't get glued onto it.
+        """
+        log_size = truncate_partial_line(self.log_path)
+        size = durable_append(self.log_path, "".join(lines))
+        if self._log_offset == log_size:
+            self._log_offset = size
+
+    # === Index maintenance ===
+
+    def _refresh(self):
+        """Build the key index lazily; pick up appends or compactions by other processes."""
+        snapshot_mtime = self.snapshot_path.stat().st_mtime if self.snapshot_path.exists() else None
+        log_size = self.log_path.stat().st_size if self.log_path.exists() else 0
+
+        if self._keys is None or snapshot_mtime != self._snapshot_mtime or log_size < self._log_offset:
+            snapshot = self._read_snapshot()
+            self._keys = {k for p in snapshot for k in _keys_of(p)}
+            self._primary = {paper_key(p) for p in snapshot}
+            self._snapshot_mtime = snapshot_mtime
+            self._log_offset = 0
+
+        if log_size > self._log_offset:
+            papers, self._log_offset = self._read_log(self._log_offset)
+            for paper in papers:
+                if paper_key(paper) not in self._keys:
+                    self._primary.add(paper_key(paper))
+                self._keys.update(_keys_of(paper))
+
+    def _read_snapshot(self) -> List[dict]:
+        if not self.snapshot_path.exists():
+            return []
+        with open(self.snapshot_path) as f:
+            data = yaml.safe_load(f) or {}
+        return data.get("papers") or []
+
+    def _read_log(self, offset: int) -> Tuple[List[dict], int]:
+        """Papers logged from a byte offset on, and the offset after the last full line."""
+        return read_log(self.log_path, offset)
+
+    def _write_snapshot(self, papers: List[dict]):
+        atomic_write(self.snapshot_path, yaml.dump({"papers": papers}, default_flow_style=False))
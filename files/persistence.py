@@ -0,0 +1,233 @@
+"""
+Async Persistence - Keeps ProjectManager disk I/O off the asyncio event loop.
+
+Handles:
+- A dedicated writer thread that applies ProjectManager writes in FIFO order
+- Batching: queued writes are drained together and committed as one
+  ProjectManager transaction, and adjacent state/paper updates are
+  coalesced into a single call
+- Failure isolation: if one write in a batch fails, the batch is rolled
+  back and its writes are committed one transaction each, so the failed
+  write leaves nothing behind and the rest still land
+- Explicit flush() at checkpoints, surfacing any write error
+- Ordered reads (run()) that observe every write queued before them and
+  run outside the batch transaction, without the exclusive project lock
+"""
+
+import asyncio
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, List, Optional
+
+from .profiling import NULL_PROFILER
+from .project import ProjectManager
+
+
+class _WriteOp:
+    """A queued call, optionally mergeable with an adjacent op of the same kind."""
+
+    __slots__ = ("fn", "args", "kwargs", "future", "merge_key", "awaited")
+
+    def __init__(self, fn: Callable, args: tuple, kwargs: dict,
+                 merge_key: Optional[str] = None, awaited: bool = False):
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.future: Future = Future()
+        self.merge_key = merge_key
+        self.awaited = awaited
+
+
+def _flush_barrier():
+    """No-op queued by flush(); completes once everything before it has."""
+
+
+class AsyncPersistence:
+    """
+    Async facade over ProjectManager writes.
+
+    Write methods enqueue and return immediately; the writer thread applies
+    them in submission order. Call flush() before reading state that queued
+    writes may change (e.g. at cycle checkpoints).
+    """
+
+    _STOP = object()
+
+    def __init__(self, project_manager: ProjectManager):
+        """
+        Initialize persistence facade.
+
+        Args:
+            project_manager: ProjectManager whose writes should move off the loop
+        """
+        self.pm = project_manager
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._error: Optional[BaseException] = None
+        # Swapped for a CycleProfiler to trace writes on the writer thread
+        self.profiler = NULL_PROFILER
+        self.batches_written = 0
+        self.ops_written = 0
+
+    # === Lifecycle ===
+
+    def start(self):
+        """Start the writer thread (idempotent)."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._writer, name="rv-writer", daemon=True)
+        self._thread.start()
+
+    async def close(self):
+        """Flush outstanding writes and stop the writer thread."""
+        if self._thread is None:
+            return
+        try:
+            await self.flush()
+        finally:
+            self._queue.put(self._STOP)
+            await asyncio.get_running_loop().run_in_executor(None, self._thread.join)
+            self._thread = None
+
+    # === Queueing ===
+
+    def submit(self, fn: Callable, *args, merge_key: Optional[str] = None, **kwargs) -> Future:
+        """Queue a call on the writer thread without waiting for it."""
+        return self._enqueue(_WriteOp(fn, args, kwargs, merge_key))
+
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """Run a call on the writer thread after all queued writes, and await its result."""
+        return await asyncio.wrap_future(self._enqueue(_WriteOp(fn, args, kwargs, awaited=True)))
+
+    def _enqueue(self, op: _WriteOp) -> Future:
+        self.start()
+        self._queue.put(op)
+        return op.future
+
+    async def flush(self):
+        """
+        Wait until every write queued so far has been applied.
+
+        Raises:
+            The first exception raised by a fire-and-forget write since the last flush
+        """
+        await self.run(_flush_barrier)
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    # === ProjectManager facade ===
+
+    def save_cycle_questions(self, cycle_num: int, questions: List[str],
+                             phase: Optional[str] = None) -> Future:
+        return self.submit(self.pm.save_cycle_questions, cycle_num, list(questions), phase)
+
+    def save_cycle_response(self, cycle_num: int, question_num: int,
+                            question: str, response: dict) -> Future:
+        return self.submit(self.pm.save_cycle_response, cycle_num, question_num,
+                           question, dict(response))
+
+    def save_cycle_synthesis(self, cycle_num: int, synthesis: str,
+                             new_gaps: List[dict], papers: List[dict]) -> Future:
+        return self.submit(self.pm.save_cycle_synthesis, cycle_num, synthesis,
+                           [dict(g) for g in new_gaps], [dict(p) for p in papers])
+
+    def update_papers(self, papers: List[dict]) -> Future:
+        return self.submit(self.pm._update_papers, [dict(p) for p in papers],
+                           merge_key="papers")
+
+    def update_state(self, **kwargs) -> Future:
+        return self.submit(self.pm.update_state, merge_key="state", **kwargs)
+
+    # === Writer thread ===
+
+    def _writer(self):
+        while True:
+            batch = [self._queue.get()]
+            # Drain whatever else is already queued so it is written as one batch
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = any(op is self._STOP for op in batch)
+            ops = [op for op in batch if op is not self._STOP]
+            self._commit(self._coalesce(ops))
+            self.batches_written += 1
+
+            if stop:
+                return
+
+    def _coalesce(self, ops: List[_WriteOp]) -> List[tuple]:
+        """Merge adjacent mergeable ops into (op, futures to resolve) pairs."""
+        merged: List[tuple] = []
+        for op in ops:
+            if merged and op.merge_key and merged[-1][0].merge_key == op.merge_key:
+                last, futures = merged[-1]
+                if op.merge_key == "state":
+                    combined = _WriteOp(last.fn, (), {**last.kwargs, **op.kwargs}, op.merge_key)
+                else:
+                    combined = _WriteOp(last.fn, (last.args[0] + op.args[0],), {}, op.merge_key)
+                merged[-1] = (combined, futures + [op.future])
+            else:
+                merged.append((op, [op.future]))
+        return merged
+
+    def _commit(self, merged: List[tuple]):
+        """Apply a drained batch; resolve futures once their writes are on disk."""
+        outcomes = []
+        writes: List[tuple] = []
+        for op, futures in merged:
+            if op.awaited:
+                # run() calls see the writes queued before them, committed first
+                outcomes.extend(self._write(writes))
+                writes = []
+                try:
+                    outcomes.append((op, futures, self._apply(op, len(futures)), None))
+                except Exception as e:
+                    outcomes.append((op, futures, None, e))
+            else:
+                writes.append((op, futures))
+        outcomes.extend(self._write(writes))
+
+        for op, futures, result, error in outcomes:
+            if error is not None:
+                # Fire-and-forget writes have nobody waiting; report them at flush()
+                if not op.awaited and self._error is None:
+                    self._error = error
+                for future in futures:
+                    future.set_exception(error)
+            else:
+                self.ops_written += len(futures)
+                for future in futures:
+                    future.set_result(result)
+
+    def _write(self, writes: List[tuple]) -> List[tuple]:
+        """
+        Commit writes in one transaction, returning (op, futures, result, error) each.
+
+        If a write raises, the transaction is rolled back and the writes
+        are applied again one transaction each, so only the failing one is
+        lost. A failure of the commit itself fails every write without a
+        retry, since some of them may already be on disk.
+        """
+        if not writes:
+            return []
+        results = []
+        try:
+            with self.pm.transaction():
+                for op, futures in writes:
+                    results.append(self._apply(op, len(futures)))
+        except Exception as e:
+            if len(writes) > 1 and len(results) < len(writes):
+                return [outcome for write in writes for outcome in self._write([write])]
+            return [(op, futures, None, e) for op, futures in writes]
+        return [(op, futures, result, None) for (op, futures), result in zip(writes, results)]
+
+    def _apply(self, op: _WriteOp, coalesced: int) -> Any:
+        """Run one op."""
+        with self.profiler.span(getattr(op.fn, "__name__", "write"), "persistence",
+                                coalesced=coalesced):
+            return op.fn(*op.args, **op.kwargs)
@@ -0,0 +1,101 @@
+"""
+Cycle Profiling - Span timing and optional cProfile capture per cycle.
+
+Handles:
+- Timing spans around cycle phases (questions, queries, synthesis, persistence)
+- Writing spans as a Chrome trace (trace.json) for chrome://tracing / Perfetto
+- Optional cProfile capture of the event loop thread (profile.prof)
+"""
+
+import contextlib
+import cProfile
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional
+
+
+class CycleProfiler:
+    """Collects timing spans for one cycle, from any thread."""
+
+    TRACE_FILE = "trace.json"
+    CPROFILE_FILE = "profile.prof"
+
+    def __init__(self, cpu: bool = False):
+        """
+        Initialize profiler.
+
+        Args:
+            cpu: Also run cProfile on the thread that calls start()/stop()
+        """
+        self.events: List[dict] = []
+        self._origin = time.perf_counter()
+        self._threads = {}
+        self._cprofile: Optional[cProfile.Profile] = cProfile.Profile() if cpu else None
+
+    def start(self):
+        self._origin = time.perf_counter()
+        if self._cprofile is not None:
+            self._cprofile.enable()
+
+    def stop(self):
+        if self._cprofile is not None:
+            self._cprofile.disable()
+
+    @contextlib.contextmanager
+    def span(self, name: str, category: str = "cycle", **args):
+        """Record the wall time of the enclosed block as a complete trace event."""
+        thread = threading.current_thread()
+        self._threads.setdefault(thread.ident, thread.name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            self.events.append({
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": round((start - self._origin) * 1e6, 1),
+                "dur": round((end - start) * 1e6, 1),
+                "pid": os.getpid(),
+                "tid": thread.ident,
+                "args": args,
+            })
+
+    def to_trace(self) -> dict:
+        """Events in Chrome trace-event format, with thread names."""
+        metadata = [
+            {"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": tid, "args": {"name": name}}
+            for tid, name in self._threads.items()
+        ]
+        return {"traceEvents": metadata + sorted(self.events, key=lambda e: e["ts"]),
+                "displayTimeUnit": "ms"}
+
+    def write(self, cycle_dir: Path) -> List[Path]:
+        """Write trace.json (and profile.prof if cProfile was enabled) into cycle_dir."""
+        written = [Path(cycle_dir) / self.TRACE_FILE]
+        written[0].write_text(json.dumps(self.to_trace()))
+        if self._cprofile is not None:
+            prof_path = Path(cycle_dir) / self.CPROFILE_FILE
+            self._cprofile.dump_stats(str(prof_path))
+            written.append(prof_path)
+        return written
+
+
+class NullProfiler:
+    """Profiler stand-in used when profiling is off; spans cost nothing."""
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def span(self, name: str, category: str = "cycle", **args):
+        return contextlib.nullcontext()
+
+
+NULL_PROFILER = NullProfiler()
@@ -6,15 +6,45 @@ Manages:
 - State tracking (current cycle, phase, gaps)
 - File I/O for research artifacts
 - Hypothesis versioning
+- Transactions that commit a block of state, paper and gap updates at once,
+  under the project lock so concurrent rv processes don't lose updates;
+  derived views are updated after the commit, and a view that fails to
+  update is reported rather than failing the commit
 """
 
+import contextlib
 import json
+import re
 import yaml
 from pathlib import Path
 from datetime import datetime
 from typing import Optional, List, Dict, Any
 from dataclasses import dataclass, asdict
 
+from .archive import CycleFiles
+from .blobs import BlobStore, IntegrityReport
+from .catalog import CycleCatalog, format_cycle_line
+from .cocitation import PaperGraph
+from .dedupe import DuplicateGroup, TitleIndex
+from .fileops import atomic_write
+from .fulltext import FullTextIndex
+from .hypotheses import HypothesisHistory, VersionInfo
+from .papers import paper_key
+from .recap import RecapView
+from .search import SearchIndex
+from .storage import SqliteBackend, open_backend
+
+
+def _run_hook(fn, args: tuple):
+    """Run an after-commit hook, warning (with the view's rebuild hint) if it fails."""
+    try:
+        fn(*args)
+    except Exception as e:
+        view = getattr(fn, "__self__", None)
+        hint = getattr(view, "REBUILD_HINT", "rebuild it")
+        name = type(view).__name__ if view is not None else getattr(fn, "__name__", "view")
+        print(f"  ⚠ {name} not updated ({type(e).__name__}: {e}); {hint}")
+
 
 @dataclass
 class ProjectState:
@@ -79,18 +109,87 @@ class ProjectManager:
         """
         self.root = Path(project_path) if project_path else Path.cwd()
         self._state: Optional[ProjectState] = None
+        self._recap: Optional[RecapView] = None
+        self._search_index: Optional[SearchIndex] = None
+        self._catalog: Optional[CycleCatalog] = None
+        self._paper_graph: Optional[PaperGraph] = None
+        self._title_index: Optional[TitleIndex] = None
+        self._hypothesis_history: Optional[HypothesisHistory] = None
+        self._fulltext: Optional[FullTextIndex] = None
+        self._cycle_files: Optional[CycleFiles] = None
+        self._backend = None
+        # Open transaction state (see transaction())
+        self._txn_depth = 0
+        self._state_dirty = False
+        self._after_commit_calls: List[tuple] = []
     
     def is_project_dir(self) -> bool:
         """Check if current directory is a research project."""
-        return (self.root / self.STATE_FILE).exists()
+        return (self.root / self.STATE_FILE).exists() or (self.root / SqliteBackend.DB_FILE).exists()
+
+    def get_config(self) -> dict:
+        """Load config.yaml (empty if missing)."""
+        config_path = self.root / "config.yaml"
+        if not config_path.exists():
+            return {}
+        return yaml.safe_load(config_path.read_text()) or {}
+
+    def set_setting(self, key: str, value: Any):
+        """Update one entry under settings in config.yaml."""
+        config = self.get_config()
+        config.setdefault("settings", {})[key] = value
+        atomic_write(self.root / "config.yaml", yaml.dump(config, default_flow_style=False))
+
+    @property
+    def backend(self):
+        """Storage backend from config.yaml settings.storage (yaml or sqlite)."""
+        if self._backend is None:
+            storage = self.get_config().get("settings", {}).get("storage", "yaml")
+            self._backend = open_backend(self.root, storage)
+        return self._backend
+
+    def use_backend(self, name: str):
+        """Switch this project's storage backend (data is not migrated; see rv import)."""
+        self.set_setting("storage", name)
+        self._backend = open_backend(self.root, name)
+    
+    def import_yaml(self) -> dict:
+        """
+        Load the YAML layout into project.db and switch the project to SQLite storage.
+
+        Returns:
+            Counts of imported records
+        """
+        snapshot = open_backend(self.root, "yaml").snapshot()
+        open_backend(self.root, "sqlite").restore(snapshot)
+        self.use_backend("sqlite")
+        self._state = None
+        return self._snapshot_counts(snapshot)
+
+    def export_yaml(self) -> dict:
+        """
+        Write the current store out as the human-readable YAML layout.
+
+        Returns:
+            Counts of exported records
+        """
+        snapshot = self.backend.snapshot()
+        if self.backend.name != "yaml":
+            open_backend(self.root, "yaml").restore(snapshot)
+        return self._snapshot_counts(snapshot)
+
+    @staticmethod
+    def _snapshot_counts(snapshot: dict) -> dict:
+        return {key: len(snapshot[key]) for key in ("papers", "gaps", "resolved", "responses", "cycles")}
     
-    def create_project(self, name: str, parent_dir: str = ".") -> Path:
+    def create_project(self, name: str, parent_dir: str = ".", storage: str = "yaml") -> Path:
         """
         Create a new research project with standard structure.
         
         Args:
             name: Project name (used as directory name)
             parent_dir: Parent directory to create project in
+            storage: Storage backend for papers, gaps, responses and state
             
         Returns:
             Path to created project
@@ -110,10 +209,6 @@ class ProjectManager:
             last_updated=datetime.now().isoformat()
         )
         
-        # Save state
-        self.root = project_path
-        self._save_state(state)
-        
         # Create config file
         config = {
             "project_name": name,
@@ -122,10 +217,19 @@ class ProjectManager:
                 "cycles_per_run": 20,
                 "checkpoint_interval": 5,
                 "alphaxiv_timeout": 120,
+                "storage": storage,
             }
         }
         (project_path / "config.yaml").write_text(yaml.dump(config, default_flow_style=False))
         
+        # Save state
+        self.root = project_path
+        self._backend = None
+        if storage != "yaml":
+            # Seed the backend from the template files (e.g. the starter gap)
+            self.backend.restore(open_backend(project_path, "yaml").snapshot())
+        self._save_state(state)
+        
         return project_path
     
     def _create_structure(self, base: Path, structure: dict):
@@ -154,13 +258,10 @@ class ProjectManager:
     
     def _load_state(self) -> ProjectState:
         """Load state from disk."""
-        state_path = self.root / self.STATE_FILE
-        if not state_path.exists():
+        data = self.backend.load_state() if self.is_project_dir() else None
+        if data is None:
             raise ValueError(f"Not a research project: {self.root}")
         
-        with open(state_path) as f:
-            data = yaml.safe_load(f)
-        
         return ProjectState.from_dict(data)
     
     def _save_state(self, state: Optional[ProjectState] = None):
@@ -171,20 +272,138 @@ class ProjectManager:
             raise ValueError("No state to save")
         
         state.last_updated = datetime.now().isoformat()
-        
-        state_path = self.root / self.STATE_FILE
-        with open(state_path, 'w') as f:
-            yaml.dump(state.to_dict(), f, default_flow_style=False)
-        
         self._state = state
+
+        if self._txn_depth:
+            # Written once when the transaction commits
+            self._state_dirty = True
+            return
+
+        self.backend.save_state(state.to_dict())
+
+    @contextlib.contextmanager
+    def transaction(self):
+        """
+        Group state, paper and gap updates into one commit.
+
+        Inside the block, update_state() and registry changes are buffered;
+        when it exits each touched file is written once (fsync'd temp file,
+        then rename), or one SQLite transaction is committed. If the block
+        raises, none of its updates are written. Nested transactions join
+        the outermost one.
+
+        The block holds the project's exclusive lock, and state is re-read
+        when it starts, so updates from other rv processes are never lost.
+
+        Example:
+            with pm.transaction():
+                pm.add_gap("...")
+                pm.update_state(current_phase="integrative")
+        """
+        with self.backend.lock.exclusive():
+            if self._txn_depth == 0:
+                # Another process may have committed since state was loaded
+                self._state = None
+
+            with self.backend.batch():
+                self._txn_depth += 1
+                try:
+                    yield self
+                    if self._txn_depth == 1 and self._state_dirty:
+                        self.backend.save_state(self._state.to_dict())
+                except BaseException:
+                    self._txn_depth -= 1
+                    if self._txn_depth == 0:
+                        # Forget uncommitted changes; state reloads from disk
+                        self._state = None
+                        self._state_dirty = False
+                        self._after_commit_calls = []
+                    raise
+                self._txn_depth -= 1
+
+            if self._txn_depth == 0:
+                self._state_dirty = False
+                calls, self._after_commit_calls = self._after_commit_calls, []
+                for fn, args in calls:
+                    _run_hook(fn, args)
+
+    def _after_commit(self, fn, *args):
+        """
+        Call fn once the current transaction has committed (now, outside one).
+
+        fn updates a derived view (catalog, search index, graph, ...). The
+        data is already on disk by then, so a failing hook only warns how to
+        rebuild that view; it never fails the committed transaction.
+        """
+        if self._txn_depth:
+            self._after_commit_calls.append((fn, args))
+        else:
+            _run_hook(fn, args)
+    
+    @property
+    def recap(self) -> RecapView:
+        """Incrementally maintained context recap view."""
+        if self._recap is None:
+            self._recap = RecapView(self)
+        return self._recap
     
+    @property
+    def cycle_files(self) -> CycleFiles:
+        """Cycle file reader that also sees archived cycles."""
+        if self._cycle_files is None:
+            self._cycle_files = CycleFiles(self.root)
+        return self._cycle_files
+
+    @property
+    def catalog(self) -> CycleCatalog:
+        """Index of the project's cycles."""
+        if self._catalog is None:
+            self._catalog = CycleCatalog(self)
+        return self._catalog
+
+    @property
+    def paper_graph(self) -> PaperGraph:
+        """Co-citation graph of the papers found so far."""
+        if self._paper_graph is None:
+            self._paper_graph = PaperGraph(self)
+        return self._paper_graph
+
+    @property
+    def title_index(self) -> TitleIndex:
+        """MinHash/LSH index of paper titles, for finding duplicates."""
+        if self._title_index is None:
+            self._title_index = TitleIndex(self)
+        return self._title_index
+
+    @property
+    def hypothesis_history(self) -> HypothesisHistory:
+        """Delta history of the hypothesis versions."""
+        if self._hypothesis_history is None:
+            self._hypothesis_history = HypothesisHistory(self.root)
+        return self._hypothesis_history
+
+    @property
+    def fulltext(self) -> FullTextIndex:
+        """Chunked text of the downloaded paper PDFs."""
+        if self._fulltext is None:
+            self._fulltext = FullTextIndex(self)
+        return self._fulltext
+
+    @property
+    def search_index(self) -> SearchIndex:
+        """Full-text index over responses and syntheses."""
+        if self._search_index is None:
+            self._search_index = SearchIndex(self)
+        return self._search_index
+
     def update_state(self, **kwargs):
         """Update state fields and save."""
-        state = self.state
-        for key, value in kwargs.items():
-            if hasattr(state, key):
-                setattr(state, key, value)
-        self._save_state(state)
+        with self.transaction():
+            state = self.state
+            for key, value in kwargs.items():
+                if hasattr(state, key):
+                    setattr(state, key, value)
+            self._save_state(state)
     
     # === Cycle Management ===
     
@@ -201,7 +420,7 @@ class ProjectManager:
         
         return cycle_dir
     
-    def save_cycle_questions(self, cycle_num: int, questions: List[str]):
+    def save_cycle_questions(self, cycle_num: int, questions: List[str], phase: Optional[str] = None):
         """Save questions for a cycle."""
         cycle_dir = self.get_cycle_dir(cycle_num)
         
@@ -210,38 +429,80 @@ class ProjectManager:
             content += f"## Q{i}\n\n{q}\n\n"
         
         (cycle_dir / "questions.md").write_text(content)
+        self._after_commit(self.catalog.questions_saved, cycle_num, len(questions), phase)
     
+    def get_cycle_questions(self, cycle_num: int) -> List[str]:
+        """Questions saved for a cycle, in order (empty if none yet)."""
+        text = self.cycle_files.read_text(cycle_num, "questions.md") or ""
+        return [q.strip() for q in re.findall(r"^## Q\d+\n\n(.*?)(?=^## Q\d+|\Z)", text,
+                                               re.MULTILINE | re.DOTALL)]
+
     def save_cycle_response(self, cycle_num: int, question_num: int, 
                            question: str, response: dict):
         """Save a single question-response pair."""
-        cycle_dir = self.get_cycle_dir(cycle_num)
-        responses_dir = cycle_dir / "responses"
-        
-        # Save as markdown
-        content = f"""# Response to Q{question_num}
+        self.get_cycle_dir(cycle_num)
+        self.backend.save_response(cycle_num, question_num, question, response)
+        self._after_commit(self.search_index.response_saved, cycle_num, question_num, question, response)
+        self._after_commit(self.catalog.response_saved, cycle_num,
+                           self.backend.count_responses(cycle_num), len(response.get("papers", [])))
+        self._after_commit(self.paper_graph.response_saved, cycle_num, question_num,
+                           response.get("papers", []))
+
+    def save_checkpoint(self, cycle_num: int, checkpoint: dict):
+        """Save a cycle's resume checkpoint."""
+        checkpoint_path = self.get_cycle_dir(cycle_num) / "checkpoint.json"
+        atomic_write(checkpoint_path, json.dumps(checkpoint, indent=2))
+        self._after_commit(self.catalog.checkpoint_saved, cycle_num, checkpoint.get("phase"))
+
+    def load_checkpoint(self, cycle_num: int) -> dict:
+        """Load a cycle's resume checkpoint."""
+        return json.loads(self.cycle_files.read_text(cycle_num, "checkpoint.json"))
+
+    def iter_responses(self, cycle_nums: Optional[List[int]] = None):
+        """
+        Iterate over every saved response in cycle order.
 
-## Question
+        Args:
+            cycle_nums: Only responses of these cycles (default: all)
 
-{question}
+        Yields dicts with cycle_num, question_num, question, text, papers,
+        timestamp (and duration_seconds where recorded).
+        """
+        return self.backend.iter_responses(cycle_nums)
 
-## Response
+    # === Blob Store ===
 
-{response.get('text', '')}
+    @property
+    def blobs(self) -> BlobStore:
+        """Content-addressed store holding response text."""
+        return self.backend.blobs
 
-## Papers Found
+    def pack_responses(self) -> int:
+        """
+        Move response text saved inline (before the blob store) into blobs.
 
-"""
-        for paper in response.get('papers', []):
-            content += f"- [{paper['title']}]({paper['url']})\n"
-        
-        content += f"\n## Metadata\n\nTimestamp: {response.get('timestamp', '')}\n"
-        
-        (responses_dir / f"q{question_num:02d}-response.md").write_text(content)
-        
-        # Also save raw JSON for programmatic access
-        (responses_dir / f"q{question_num:02d}-response.json").write_text(
-            json.dumps(response, indent=2)
-        )
+        Returns:
+            Number of responses converted
+        """
+        with self.transaction():
+            return self.backend.pack_responses()
+
+    def collect_garbage(self, dry_run: bool = False) -> tuple:
+        """
+        Delete blobs no response refers to any more.
+
+        Returns:
+            (blobs removed, bytes freed)
+        """
+        # The write lock keeps a new reference from appearing mid-scan
+        with self.transaction():
+            live = {ref for _, ref in self.backend.iter_text_refs()}
+            return self.blobs.collect_garbage(live, dry_run=dry_run)
+
+    def check_blobs(self) -> IntegrityReport:
+        """Verify every blob's content hash and that every reference resolves."""
+        with self.backend.lock.shared():
+            return self.blobs.check(self.backend.iter_text_refs())
     
     def save_cycle_synthesis(self, cycle_num: int, synthesis: str, 
                             new_gaps: List[dict], papers: List[dict]):
@@ -250,70 +511,86 @@ class ProjectManager:
         
         # Save synthesis
         (cycle_dir / "synthesis.md").write_text(synthesis)
-        
-        # Update papers registry
-        self._update_papers(papers)
-        
-        # Update gaps
-        self._update_gaps(new_gaps)
-        
-        # Save cycle metadata
-        metadata = {
-            "cycle_num": cycle_num,
-            "completed": datetime.now().isoformat(),
-            "questions_count": len(list((cycle_dir / "responses").glob("*.md"))),
-            "papers_found": len(papers),
-            "new_gaps": len(new_gaps),
-        }
-        (cycle_dir / "metadata.json").write_text(json.dumps(metadata, indent=2))
+        self._after_commit(self.recap.synthesis_saved, cycle_num, synthesis)
+        self._after_commit(self.search_index.synthesis_saved, cycle_num, synthesis)
+        
+        # Registry, gaps, metadata and state commit together
+        with self.transaction():
+            # Update papers registry
+            self._update_papers(papers)
+        
+            # Update gaps
+            self._update_gaps(new_gaps)
+        
+            # Save cycle metadata
+            metadata = {
+                "cycle_num": cycle_num,
+                "completed": datetime.now().isoformat(),
+                "questions_count": self.backend.count_responses(cycle_num),
+                "papers_found": len(papers),
+                "new_gaps": len(new_gaps),
+            }
+            self.backend.save_cycle_metadata(cycle_num, metadata)
+            self._after_commit(self.catalog.synthesis_saved, cycle_num, len(new_gaps),
+                               len(papers), True)
     
     def _update_papers(self, new_papers: List[dict]):
         """Add new papers to the registry, avoiding duplicates."""
-        papers_path = self.root / "resources" / "papers.yaml"
-        
-        with open(papers_path) as f:
-            data = yaml.safe_load(f) or {"papers": []}
-        
-        existing_urls = {p.get("url") for p in data["papers"]}
-        
-        for paper in new_papers:
-            if paper.get("url") not in existing_urls:
-                paper["added"] = datetime.now().isoformat()
-                data["papers"].append(paper)
-                existing_urls.add(paper.get("url"))
-        
-        with open(papers_path, 'w') as f:
-            yaml.dump(data, f, default_flow_style=False)
-        
-        self.update_state(papers_collected=len(data["papers"]))
+        total = self.backend.add_papers(new_papers)
+        self.update_state(papers_collected=total)
+        self._after_commit(self.title_index.papers_added, new_papers)
     
     def _update_gaps(self, new_gaps: List[dict]):
         """Add new gaps to active gaps."""
-        gaps_path = self.root / "gaps" / "active.yaml"
-        
-        with open(gaps_path) as f:
-            data = yaml.safe_load(f) or {"gaps": []}
-        
-        # Get next ID
-        max_id = max([g.get("id", 0) for g in data["gaps"]], default=0)
-        
         for gap in new_gaps:
-            max_id += 1
-            gap["id"] = max_id
             gap["created"] = datetime.now().isoformat()
-            data["gaps"].append(gap)
+        active = self.backend.add_gaps(new_gaps)
         
-        with open(gaps_path, 'w') as f:
-            yaml.dump(data, f, default_flow_style=False)
-        
-        self.update_state(gaps_count=len(data["gaps"]))
+        self.update_state(gaps_count=active)
+        self._after_commit(self.recap.gaps_added, new_gaps)
     
     def get_active_gaps(self) -> List[dict]:
         """Get list of active gaps."""
-        gaps_path = self.root / "gaps" / "active.yaml"
-        with open(gaps_path) as f:
-            data = yaml.safe_load(f) or {"gaps": []}
-        return data["gaps"]
+        return self.backend.list_gaps()
+
+    def get_papers(self) -> List[dict]:
+        """Get the paper registry."""
+        return self.backend.list_papers()
+
+    def compact_papers(self) -> tuple:
+        """
+        Compact the paper registry, dropping duplicate entries.
+
+        Returns:
+            (entries before, papers after)
+        """
+        with self.transaction():
+            before, after = self.backend.compact_papers()
+            self.update_state(papers_collected=after)
+        # After the commit: SQLite can't VACUUM inside a transaction
+        with self.backend.lock.exclusive():
+            self.backend.reclaim_space()
+        return before, after
+
+    def find_duplicate_papers(self, threshold: Optional[float] = None) -> List[DuplicateGroup]:
+        """Groups of registry entries that are probably the same paper."""
+        return self.title_index.find_duplicates(self.get_papers(), threshold)
+
+    def merge_duplicate_papers(self, groups: List[DuplicateGroup]) -> int:
+        """
+        Merge each group into its kept entry.
+
+        Returns:
+            Number of entries removed
+        """
+        merges = [(group.merged(), [paper_key(p) for p in group.duplicates]) for group in groups]
+        with self.transaction():
+            removed = self.backend.merge_papers(merges)
+            self.update_state(papers_collected=len(self.get_papers()))
+            replaced = [key for merged, keys in merges for key in [paper_key(merged), *keys]]
+            self._after_commit(self.title_index.papers_removed, replaced)
+            self._after_commit(self.title_index.papers_added, [merged for merged, _ in merges])
+        return removed
 
     def save_synthesis(self, cycle_num: int, synthesis: str, new_gaps: List[str]):
         """
@@ -328,26 +605,22 @@ class ProjectManager:
 
         # Save synthesis markdown
         (cycle_dir / "synthesis.md").write_text(synthesis)
-
-        # Add gaps
-        for gap_desc in new_gaps:
-            self.add_gap(gap_desc, priority="medium")
-
-        # Save cycle metadata
-        metadata = {
-            "cycle_num": cycle_num,
-            "synthesized": datetime.now().isoformat(),
-            "new_gaps_added": len(new_gaps),
-        }
-
-        # Merge with existing metadata if present
-        metadata_path = cycle_dir / "metadata.json"
-        if metadata_path.exists():
-            existing = json.loads(metadata_path.read_text())
-            existing.update(metadata)
-            metadata = existing
-
-        metadata_path.write_text(json.dumps(metadata, indent=2))
+        self._after_commit(self.recap.synthesis_saved, cycle_num, synthesis)
+        self._after_commit(self.search_index.synthesis_saved, cycle_num, synthesis)
+
+        with self.transaction():
+            # Add gaps
+            for gap_desc in new_gaps:
+                self.add_gap(gap_desc, priority="medium")
+
+            # Save cycle metadata, merged with existing metadata if present
+            metadata = {
+                "cycle_num": cycle_num,
+                "synthesized": datetime.now().isoformat(),
+                "new_gaps_added": len(new_gaps),
+            }
+            self.backend.save_cycle_metadata(cycle_num, metadata, merge=True)
+            self._after_commit(self.catalog.synthesis_saved, cycle_num, len(new_gaps))
 
     def add_gap(self, description: str, priority: str = "medium") -> int:
         """
@@ -360,30 +633,19 @@ class ProjectManager:
         Returns:
             ID of the newly created gap
         """
-        gaps_path = self.root / "gaps" / "active.yaml"
-
-        with open(gaps_path) as f:
-            data = yaml.safe_load(f) or {"gaps": []}
-
-        # Get next ID
-        max_id = max([g.get("id", 0) for g in data["gaps"]], default=0)
-        new_id = max_id + 1
-
         gap = {
-            "id": new_id,
             "description": description,
             "priority": priority,
             "related_components": [],
             "created": datetime.now().isoformat(),
         }
-        data["gaps"].append(gap)
+        with self.transaction():
+            active = self.backend.add_gaps([gap])
 
-        with open(gaps_path, 'w') as f:
-            yaml.dump(data, f, default_flow_style=False)
+            self.update_state(gaps_count=active)
+            self._after_commit(self.recap.gaps_added, [gap])
 
-        self.update_state(gaps_count=len(data["gaps"]))
-
-        return new_id
+        return gap["id"]
 
     def resolve_gap(self, gap_id: int, reason: str):
         """
@@ -393,44 +655,11 @@ class ProjectManager:
             gap_id: ID of the gap to resolve
             reason: How the gap was resolved
         """
-        active_path = self.root / "gaps" / "active.yaml"
-        resolved_path = self.root / "gaps" / "resolved.yaml"
-
-        # Load active gaps
-        with open(active_path) as f:
-            active_data = yaml.safe_load(f) or {"gaps": []}
-
-        # Find and remove the gap
-        gap_to_resolve = None
-        remaining_gaps = []
-        for gap in active_data["gaps"]:
-            if gap.get("id") == gap_id:
-                gap_to_resolve = gap
-            else:
-                remaining_gaps.append(gap)
-
-        if gap_to_resolve is None:
-            raise ValueError(f"Gap #{gap_id} not found in active gaps")
-
-        # Add resolution info
-        gap_to_resolve["resolved"] = datetime.now().isoformat()
-        gap_to_resolve["resolution"] = reason
-
-        # Save updated active gaps
-        active_data["gaps"] = remaining_gaps
-        with open(active_path, 'w') as f:
-            yaml.dump(active_data, f, default_flow_style=False)
-
-        # Load and update resolved gaps
-        with open(resolved_path) as f:
-            resolved_data = yaml.safe_load(f) or {"resolved": []}
-
-        resolved_data["resolved"].append(gap_to_resolve)
+        with self.transaction():
+            active = self.backend.resolve_gap(gap_id, reason)
 
-        with open(resolved_path, 'w') as f:
-            yaml.dump(resolved_data, f, default_flow_style=False)
-
-        self.update_state(gaps_count=len(remaining_gaps))
+            self.update_state(gaps_count=active)
+            self._after_commit(self.recap.gap_resolved, gap_id)
 
     def get_concept(self) -> str:
         """Get the concept README content."""
@@ -449,38 +678,83 @@ class ProjectManager:
         }
     
     def create_hypothesis_version(self, new_statement: str, reason: str) -> int:
-        """Create a new hypothesis version."""
-        current = self.state.current_hypothesis_version
-        new_version = current + 1
-        
-        # Copy structure from current version
-        current_dir = self.root / "hypotheses" / f"v{current}"
-        new_dir = self.root / "hypotheses" / f"v{new_version}"
-        new_dir.mkdir(parents=True, exist_ok=True)
-        
-        # Write new hypothesis
-        (new_dir / "hypothesis.md").write_text(new_statement)
-        
-        # Copy and reset components/status
-        components = yaml.safe_load((current_dir / "components.yaml").read_text())
-        (new_dir / "components.yaml").write_text(
-            yaml.dump(components, default_flow_style=False)
-        )
-        
-        status = {
-            "overall": "untested",
-            "components_validated": 0,
-            "components_total": len(components.get("components", [])),
-            "last_updated": datetime.now().isoformat(),
-            "version_reason": reason,
-            "previous_version": current,
-        }
-        (new_dir / "status.yaml").write_text(yaml.dump(status, default_flow_style=False))
-        
-        self.update_state(current_hypothesis_version=new_version)
-        
+        """
+        Create a new hypothesis version.
+
+        The current version is frozen first: its component changes are
+        recorded in hypotheses/history.jsonl and its files become read-only,
+        hardlinked to the previous version's where unchanged. The new
+        version starts as an editable copy of the current components.
+        """
+        # Hold the lock so parallel runs can't claim the same version
+        with self.transaction():
+            current = self.state.current_hypothesis_version
+            new_version = current + 1
+
+            current_dir = self.root / "hypotheses" / f"v{current}"
+            new_dir = self.root / "hypotheses" / f"v{new_version}"
+            new_dir.mkdir(parents=True, exist_ok=True)
+
+            self.hypothesis_history.freeze(current)
+
+            # Copy components verbatim so unchanged files can be linked when frozen
+            components_text = (current_dir / "components.yaml").read_text()
+            components = yaml.safe_load(components_text) or {}
+            atomic_write(new_dir / "hypothesis.md", new_statement)
+            atomic_write(new_dir / "components.yaml", components_text)
+
+            status = {
+                "overall": "untested",
+                "components_validated": 0,
+                "components_total": len(components.get("components") or []),
+                "last_updated": datetime.now().isoformat(),
+                "version_reason": reason,
+                "previous_version": current,
+            }
+            atomic_write(new_dir / "status.yaml", yaml.dump(status, default_flow_style=False))
+
+            self.update_state(current_hypothesis_version=new_version)
+            self._after_commit(self.recap.hypothesis_changed, new_version, new_statement)
+
         return new_version
-    
+
+    def hypothesis_log(self) -> List[VersionInfo]:
+        """Every hypothesis version with its reason and component change counts, newest first."""
+        history, current = self._hypothesis_history_for_read()
+        return history.log(current)
+
+    def hypothesis_diff(self, from_version: int, to_version: Optional[int] = None) -> dict:
+        """
+        Component changes and statement diff between two hypothesis versions.
+
+        Args:
+            from_version: Version to compare from
+            to_version: Version to compare to (default: current)
+
+        Raises:
+            ValueError: If either version does not exist
+        """
+        history, current = self._hypothesis_history_for_read()
+        to_version = to_version or current
+        for version in (from_version, to_version):
+            if not 1 <= version <= current or not history.version_dir(version).exists():
+                raise ValueError(f"Hypothesis v{version} does not exist (current is v{current})")
+        return {
+            "from": from_version,
+            "to": to_version,
+            "components": history.diff(from_version, to_version, current),
+            "statement": history.statement_diff(from_version, to_version),
+        }
+
+    def _hypothesis_history_for_read(self):
+        # Projects from before the history log: record their earlier versions once
+        history = self.hypothesis_history
+        current = self.state.current_hypothesis_version
+        if current > 1 and (current - 1) not in history.frozen_versions():
+            with self.backend.lock.exclusive():
+                history.freeze(current - 1)
+        return history, current
+
     # === Status Display ===
     
     def print_status(self):
@@ -498,34 +772,38 @@ class ProjectManager:
         print(f"  Last updated: {state.last_updated}")
         
         # Show recent cycles
-        research_dir = self.root / "research"
-        cycles = sorted(research_dir.glob("cycle-*"))
+        cycles = self.catalog.list()
         if cycles:
             print(f"\n📁 Recent cycles:")
             for cycle in cycles[-3:]:
-                print(f"    {cycle.name}/")
+                print(f"    {format_cycle_line(cycle)}")
         
         print()
+
+    def status_dict(self) -> dict:
+        """Project state plus the cycle catalog, for rv status --json."""
+        cycles = self.catalog.list()
+        return {
+            "state": self.state.to_dict(),
+            "summary": self.catalog.summary(),
+            "recent_cycles": cycles[-3:],
+        }
     
-    def get_context_recap(self) -> str:
+    def get_context_recap(self, budget_chars: Optional[int] = None) -> str:
         """
         Generate a context recap for starting a new Alphaxiv conversation.
         Used per Option C (new conversation per phase).
+
+        Served from the recap view, so it does not re-read the hypothesis,
+        gaps or syntheses.
+
+        Args:
+            budget_chars: Character budget for the recap body (default ~500 tokens)
         """
         state = self.state
-        hypothesis = self.get_current_hypothesis()
-        gaps = self.get_active_gaps()
         
         recap = f"""Research Project: {state.project_name}
 Hypothesis Version: v{state.current_hypothesis_version}
 Cycles Completed: {state.total_cycles_completed}
-
-Current Hypothesis:
-{hypothesis['statement'][:500]}...
-
-Key Active Gaps ({len(gaps)} total):
 """
-        for gap in gaps[:5]:
-            recap += f"- {gap.get('description', 'No description')}\n"
-        
-        return recap
+        return recap + self.recap.render(budget_chars)
@@ -0,0 +1,251 @@
+"""
+Context Recap View - Incrementally maintained recap for new Alphaxiv conversations.
+
+Handles:
+- A materialised view (.research-recap.json) of the hypothesis, active gaps
+  and recent syntheses, updated as each of them changes
+- Ranking gaps by priority and recency, syntheses by recency
+- Rendering within a character budget, so reading the recap never touches
+  the hypothesis, gap or synthesis files
+"""
+
+import json
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, List, Optional
+
+from .fileops import atomic_write
+
+if TYPE_CHECKING:
+    from .project import ProjectManager
+
+
+class RecapView:
+    """Recap materialised view for one project."""
+
+    VIEW_FILE = ".research-recap.json"
+    REBUILD_HINT = "delete .research-recap.json and it is rebuilt on next use"
+
+    # Roughly 500 tokens; ~4 characters per token
+    DEFAULT_BUDGET_CHARS = 2000
+    MAX_SYNTHESES = 5
+    SUMMARY_CHARS = 300
+    PRIORITY_WEIGHT = {"high": 3, "medium": 2, "low": 1}
+
+    def __init__(self, project_manager: "ProjectManager"):
+        """
+        Initialize recap view.
+
+        Args:
+            project_manager: ProjectManager of the project the view belongs to
+        """
+        self.pm = project_manager
+        self._data: Optional[dict] = None
+        self._data_mtime: Optional[float] = None
+
+    @property
+    def path(self) -> Path:
+        return self.pm.root / self.VIEW_FILE
+
+    # === Reading ===
+
+    def render(self, budget_chars: Optional[int] = None) -> str:
+        """Render the recap body (without the state header) within budget_chars."""
+        data = self._load()
+        if self._is_stale(data):
+            data = self.rebuild()
+        budget = budget_chars or self.DEFAULT_BUDGET_CHARS
+        if budget == self.DEFAULT_BUDGET_CHARS and data.get("rendered") is not None:
+            return data["rendered"]
+        return self._render(data, budget)
+
+    # === Incremental updates ===
+
+    def hypothesis_changed(self, version: int, statement: str):
+        data = self._load()
+        data["hypothesis"] = {"version": version, "summary": _hypothesis_summary(statement)}
+        self._save(data)
+
+    def gaps_added(self, gaps: List[dict]):
+        data = self._load()
+        for gap in gaps:
+            if gap.get("description"):
+                data["gaps"][str(gap["id"])] = {
+                    "description": gap["description"],
+                    "priority": gap.get("priority", "medium"),
+                    "created": gap.get("created", ""),
+                }
+        self._save(data)
+
+    def gap_resolved(self, gap_id: int):
+        data = self._load()
+        data["gaps"].pop(str(gap_id), None)
+        self._save(data)
+
+    def synthesis_saved(self, cycle_num: int, synthesis: str):
+        data = self._load()
+        data["syntheses"][str(cycle_num)] = {
+            "summary": _synthesis_summary(synthesis),
+            "updated": datetime.now().isoformat(),
+        }
+        # Keep only the most recent cycles
+        recent = sorted(data["syntheses"], key=int)[-self.MAX_SYNTHESES:]
+        data["syntheses"] = {k: data["syntheses"][k] for k in recent}
+        self._save(data)
+
+    # === Storage ===
+
+    def rebuild(self) -> dict:
+        """Rebuild the view from the project files (for projects that predate it)."""
+        data = {"hypothesis": None, "gaps": {}, "syntheses": {}, "rendered": None}
+
+        version = self.pm.state.current_hypothesis_version
+        hyp_path = self.pm.root / "hypotheses" / f"v{version}" / "hypothesis.md"
+        if hyp_path.exists():
+            data["hypothesis"] = {"version": version, "summary": _hypothesis_summary(hyp_path.read_text())}
+
+        for gap in self.pm.get_active_gaps():
+            if gap.get("description"):
+                data["gaps"][str(gap["id"])] = {
+                    "description": gap["description"],
+                    "priority": gap.get("priority", "medium"),
+                    "created": str(gap.get("created", "")),
+                }
+
+        files = self.pm.cycle_files
+        for cycle_num in files.cycle_numbers()[-self.MAX_SYNTHESES:]:
+            synthesis = files.read_text(cycle_num, "synthesis.md")
+            if synthesis is not None:
+                synthesis_path = files.cycle_dir(cycle_num) / "synthesis.md"
+                updated = _mtime(synthesis_path)
+                data["syntheses"][str(cycle_num)] = {
+                    "summary": _synthesis_summary(synthesis),
+                    "updated": datetime.fromtimestamp(updated).isoformat() if updated else "",
+                }
+
+        self._save(data)
+        return data
+
+    def _load(self) -> dict:
+        # Re-read if another rv process has updated the view since
+        if self._data is None or _mtime(self.path) != self._data_mtime:
+            if self.path.exists():
+                self._data = json.loads(self.path.read_text())
+                self._data_mtime = _mtime(self.path)
+            else:
+                self._data = self.rebuild()
+        return self._data
+
+    def _save(self, data: dict):
+        data["rendered"] = self._render(data, self.DEFAULT_BUDGET_CHARS)
+        data["sources"] = {str(p): _mtime(p) for p in self._source_paths()}
+        atomic_write(self.path, json.dumps(data, indent=2))
+        self._data = data
+        self._data_mtime = _mtime(self.path)
+
+    def _source_paths(self) -> List[Path]:
+        version = self.pm.state.current_hypothesis_version
+        return [
+            self.pm.root / "hypotheses" / f"v{version}" / "hypothesis.md",
+            self.pm.root / "gaps" / "active.yaml",
+        ]
+
+    def _is_stale(self, data: dict) -> bool:
+        """True if the hypothesis or gaps were edited outside rv since the last update."""
+        sources = data.get("sources", {})
+        return any(sources.get(str(p)) != _mtime(p) for p in self._source_paths())
+
+    # === Ranking and rendering ===
+
+    def _ranked_gaps(self, data: dict) -> List[dict]:
+        gaps = list(data["gaps"].values())
+        # Highest priority first; newest first within a priority
+        gaps.sort(key=lambda g: g.get("created") or "", reverse=True)
+        gaps.sort(key=lambda g: self.PRIORITY_WEIGHT.get(g.get("priority"), 0), reverse=True)
+        return gaps
+
+    def _render(self, data: dict, budget: int) -> str:
+        parts = []
+        remaining = budget
+
+        def add(text: str) -> bool:
+            nonlocal remaining
+            if len(text) > remaining:
+                return False
+            parts.append(text)
+            remaining -= len(text)
+            return True
+
+        hypothesis = data.get("hypothesis")
+        if hypothesis and hypothesis.get("summary"):
+            # The hypothesis may use up to 40% of the budget
+            summary = _truncate(hypothesis["summary"], int(budget * 0.4))
+            add(f"\nCurrent Hypothesis:\n{summary}\n")
+
+        gaps = self._ranked_gaps(data)
+        if gaps:
+            add(f"\nKey Active Gaps ({len(gaps)} total):\n")
+            for gap in gaps:
+                if not add(f"- [{gap.get('priority', 'medium')}] {gap['description']}\n"):
+                    break
+
+        syntheses = sorted(data["syntheses"].items(), key=lambda kv: int(kv[0]), reverse=True)
+        lines = [f"- Cycle {cycle}: {entry['summary']}\n" for cycle, entry in syntheses
+                 if entry.get("summary")]
+        header = "\nRecent Findings:\n"
+        if lines and len(header) + len(lines[0]) <= remaining:
+            add(header)
+            for line in lines:
+                if not add(line):
+                    break
+
+        return "".join(parts)
+
+
+_PLACEHOLDER = re.compile(r"^\[.*\]$", re.DOTALL)
+
+
+def _section(markdown: str, heading: str) -> Optional[str]:
+    """Body of the first '#... heading' section (any level), or None if absent."""
+    match = re.search(rf"^#+\s+{re.escape(heading)}\s*$(.*?)(?=^#+\s|\Z)", markdown,
+                      re.MULTILINE | re.DOTALL | re.IGNORECASE)
+    return match.group(1).strip() if match else None
+
+
+def _lead_text(markdown: str, limit: int) -> str:
+    """Leading prose of a markdown fragment, skipping headings and [placeholders]."""
+    text = ""
+    for block in re.split(r"\n\s*\n", markdown):
+        block = block.strip()
+        if not block or block.startswith("#") or _PLACEHOLDER.match(block):
+            continue
+        text = f"{text} {' '.join(block.split())}".strip()
+        if len(text) >= limit:
+            break
+    return _truncate(text, limit)
+
+
+def _mtime(path: Path) -> Optional[float]:
+    try:
+        return path.stat().st_mtime
+    except OSError:
+        return None
+
+
+def _truncate(text: str, limit: int) -> str:
+    return text if len(text) <= limit else text[:max(0, limit - 3)].rstrip() + "..."
+
+
+def _hypothesis_summary(statement: str) -> str:
+    section = _section(statement, "Statement")
+    return _lead_text(section if section is not None else statement, 2000)
+
+
+def _synthesis_summary(synthesis: str) -> str:
+    for heading in ("Summary", "Key Findings"):
+        section = _section(synthesis, heading)
+        summary = _lead_text(section or "", RecapView.SUMMARY_CHARS)
+        if summary:
+            return summary
+    return _lead_text(synthesis, RecapView.SUMMARY_CHARS)
@@ -0,0 +1,525 @@
+"""
+Report Builder - Renders REPORT_TEMPLATE.md from the project store.
+
+Handles:
+- Filling the template's sections from the project: hypothesis versions,
+  components and their evidence, central papers, gaps and the findings of
+  each cycle's synthesis
+- Keeping sections there is no data for (executive summary, experiments,
+  conclusion) as written in the previous report, or as the template has them
+- A dependency manifest (results/.report-manifest.json) holding a
+  fingerprint of each section's inputs and a content hash per cycle, so a
+  rebuild re-renders only the sections, and re-reads only the cycles, whose
+  inputs changed
+"""
+
+import hashlib
+import json
+import re
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+
+from .fileops import atomic_write
+
+if TYPE_CHECKING:
+    from .project import ProjectManager
+
+
+TEMPLATE_NAME = "REPORT_TEMPLATE.md"
+
+STATUS_LABELS = {
+    "supported": "✅ Supported",
+    "validated": "✅ Supported",
+    "contested": "⚠️ Contested",
+    "untested": "❓ Insufficient Evidence",
+    "insufficient": "❓ Insufficient Evidence",
+    "challenged": "❌ Challenged",
+    "refuted": "❌ Challenged",
+    "falsified": "❌ Challenged",
+}
+
+OVERALL_LABELS = {
+    "supported": "Well-Supported",
+    "well-supported": "Well-Supported",
+    "contested": "Contested",
+    "untested": "Speculative",
+    "speculative": "Speculative",
+    "partially_falsified": "Partially Falsified",
+    "partially-falsified": "Partially Falsified",
+    "falsified": "Falsified",
+}
+
+_PLACEHOLDER = re.compile(r"^\[.*\]$", re.DOTALL)
+_CONTRADICTION = re.compile(r"contradict|conflict|disagree|inconsistent", re.IGNORECASE)
+
+
+@dataclass
+class ReportResult:
+    """Outcome of one ReportBuilder.build()."""
+    path: Path
+    rendered: List[str] = field(default_factory=list)  # Sections regenerated
+    reused: List[str] = field(default_factory=list)  # Sections taken from the manifest
+    cycles_read: int = 0  # Cycles whose files were read
+    cycles_total: int = 0
+    changed: bool = False  # Whether the report file was rewritten
+    seconds: float = 0.0
+
+
+def find_template(project_root: Path, explicit: Optional[Path] = None) -> Path:
+    """
+    Locate REPORT_TEMPLATE.md: the given path, the project's templates/
+    directory, then the templates/ directory shipped next to the package.
+
+    Raises:
+        FileNotFoundError: If none exists
+    """
+    candidates = [Path(explicit)] if explicit else [
+        Path(project_root) / "templates" / TEMPLATE_NAME,
+        Path(__file__).resolve().parent.parent / "templates" / TEMPLATE_NAME,
+    ]
+    for path in candidates:
+        if path.is_file():
+            return path
+    raise FileNotFoundError(f"No {TEMPLATE_NAME} found (looked in: "
+                            f"{', '.join(str(p) for p in candidates)}). Pass --template PATH.")
+
+
+def split_sections(markdown: str) -> Tuple[str, List[Tuple[str, str]]]:
+    """
+    Split a report into its header (everything before the first '## '
+    heading) and (title, text) sections, each including its heading.
+    """
+    parts = re.split(r"(?m)^(?=## )", markdown)
+    header, sections = parts[0], []
+    for part in parts[1:]:
+        title = part.splitlines()[0][3:].strip()
+        sections.append((title, part))
+    return header, sections
+
+
+def _report_body(template: str) -> str:
+    """The template without its usage notes (the text before the report's own title)."""
+    titles = list(re.finditer(r"(?m)^# ", template))
+    if len(titles) < 2:
+        return template
+    return template[titles[1].start():]
+
+
+def _fingerprint(value) -> str:
+    return hashlib.sha256(json.dumps(value, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def _stat(path: Path) -> Optional[list]:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def _section_text(markdown: str, heading: str) -> str:
+    match = re.search(rf"^#+\s+{re.escape(heading)}[^\n]*$(.*?)(?=^#+\s|\Z)", markdown,
+                      re.MULTILINE | re.DOTALL | re.IGNORECASE)
+    return match.group(1).strip() if match else ""
+
+
+def _lead(markdown: str, limit: int) -> str:
+    """First prose of a markdown fragment, skipping headings and [placeholders]."""
+    for block in re.split(r"\n\s*\n", markdown):
+        block = block.strip()
+        if not block or block.startswith("#") or _PLACEHOLDER.match(block):
+            continue
+        text = " ".join(block.split())
+        return text if len(text) <= limit else text[:limit - 3].rstrip() + "..."
+    return ""
+
+
+def _cell(text) -> str:
+    return " ".join(str(text or "").split()).replace("|", "\\|")
+
+
+class ReportBuilder:
+    """Incremental renderer of a project's verification report."""
+
+    REPORT_FILE = Path("results") / "REPORT.md"
+    MANIFEST_FILE = Path("results") / ".report-manifest.json"
+
+    PAPER_ROWS = 15
+    FINDING_CHARS = 300
+    QUESTION_CHARS = 100
+
+    def __init__(self, project_manager: "ProjectManager", template: Optional[Path] = None):
+        """
+        Initialize report builder.
+
+        Args:
+            project_manager: ProjectManager of the project to report on
+            template: Template path (default: see find_template)
+        """
+        self.pm = project_manager
+        self.template_path = find_template(self.pm.root, template)
+        self._cache: Dict[str, object] = {}
+
+    @property
+    def path(self) -> Path:
+        return self.pm.root / self.REPORT_FILE
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.pm.root / self.MANIFEST_FILE
+
+    # === Building ===
+
+    def build(self, force: bool = False) -> ReportResult:
+        """
+        Render the report, regenerating only sections whose inputs changed.
+
+        Args:
+            force: Ignore the manifest and render every section
+        """
+        started = time.perf_counter()
+        result = ReportResult(path=self.path)
+        self._cache = {}
+
+        with self.pm.backend.lock.exclusive():
+            template = self.template_path.read_text()
+            manifest = {} if force else self._load_manifest()
+            if manifest.get("template") != _fingerprint(template):
+                manifest = {"cycles": manifest.get("cycles", {})}
+
+            cycles, result.cycles_read = self._cycle_fragments(manifest.get("cycles", {}), force)
+            result.cycles_total = len(cycles)
+            self._cache["cycles"] = cycles
+
+            previous = {}
+            if self.path.exists():
+                previous = dict(split_sections(self.path.read_text())[1])
+
+            header, sections = split_sections(_report_body(template))
+            old_sections = manifest.get("sections", {})
+            new_sections = {}
+            parts = []
+            for title, text in [("", header)] + sections:
+                renderer = self._renderers().get(title.lower())
+                if renderer is None:
+                    # Written by hand: keep the previous report's text
+                    parts.append(previous.get(title, text))
+                    continue
+                key_fn, render_fn = renderer
+                key = _fingerprint(key_fn())
+                name = title or "header"
+                cached = old_sections.get(name)
+                if cached and cached["inputs"] == key:
+                    rendered = cached["text"]
+                    result.reused.append(name)
+                else:
+                    rendered = render_fn(title, text)
+                    result.rendered.append(name)
+                new_sections[name] = {"inputs": key, "text": rendered}
+                parts.append(rendered)
+
+            report = "".join(parts)
+            if not self.path.exists() or self.path.read_text() != report:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                atomic_write(self.path, report)
+                result.changed = True
+            self._save_manifest({"template": _fingerprint(template), "sections": new_sections,
+                                 "cycles": cycles})
+
+        result.seconds = time.perf_counter() - started
+        return result
+
+    def _renderers(self) -> Dict[str, Tuple[Callable, Callable]]:
+        """Template section title (lower case) → (inputs fingerprint source, renderer)."""
+        return {
+            "": (self._header_inputs, self._render_header),
+            "hypothesis under evaluation": (self._hypothesis_inputs, self._render_hypothesis),
+            "component-by-component analysis": (self._components_inputs, self._render_components),
+            "evidence summary": (self._evidence_inputs, self._render_evidence),
+            "key findings": (self._findings_inputs, self._render_findings),
+            "remaining gaps": (self._gaps, self._render_gaps),
+            "appendix": (self._appendix_inputs, self._render_appendix),
+        }
+
+    # === Cycles ===
+
+    def _cycle_fragments(self, known: Dict[str, dict], force: bool) -> Tuple[Dict[str, dict], int]:
+        """
+        Per-cycle report fragments. A cycle's files are only read when its
+        catalog entry or file stamps changed, and its fragment is only
+        re-extracted when the content hash of those files changed.
+
+        Returns:
+            (cycle number → fragment, number of cycles read)
+        """
+        files = self.pm.cycle_files
+        fragments, read = {}, 0
+        for entry in self.pm.catalog.list():
+            num = entry["cycle_num"]
+            cycle_dir = files.cycle_dir(num)
+            stamp = _fingerprint([entry, _stat(cycle_dir / "questions.md"),
+                                  _stat(cycle_dir / "synthesis.md")])
+            old = known.get(str(num))
+            if old and old.get("stamp") == stamp and not force:
+                fragments[str(num)] = old
+                continue
+
+            read += 1
+            questions = files.read_text(num, "questions.md") or ""
+            synthesis = files.read_text(num, "synthesis.md") or ""
+            digest = hashlib.sha256(f"{questions}\0{synthesis}".encode("utf-8")).hexdigest()
+            if old and old.get("hash") == digest and not force:
+                fragment = dict(old)
+            else:
+                fragment = self._extract(questions, synthesis)
+                fragment["hash"] = digest
+            fragment.update(stamp=stamp, cycle_num=num, phase=entry.get("phase"),
+                            papers=entry.get("papers", 0), synthesis=bool(synthesis))
+            fragments[str(num)] = fragment
+        return fragments, read
+
+    def _extract(self, questions: str, synthesis: str) -> dict:
+        first_question = _lead(_section_text(questions, "Q1"), self.QUESTION_CHARS)
+        finding = (_lead(_section_text(synthesis, "Key Findings"), self.FINDING_CHARS)
+                   or _lead(_section_text(synthesis, "Summary"), self.FINDING_CHARS))
+        patterns = _lead(_section_text(synthesis, "Patterns Identified"), self.FINDING_CHARS)
+        return {
+            "question": first_question,
+            "finding": finding,
+            "patterns": patterns,
+            "contradiction": bool(patterns and _CONTRADICTION.search(patterns)),
+        }
+
+    def _cycles(self) -> List[dict]:
+        return sorted(self._cache["cycles"].values(), key=lambda c: c["cycle_num"])
+
+    # === Inputs (cheap fingerprint sources) ===
+
+    def _hypothesis(self) -> dict:
+        if "hypothesis" not in self._cache:
+            self._cache["hypothesis"] = self.pm.get_current_hypothesis()
+        return self._cache["hypothesis"]
+
+    def _components(self) -> List[dict]:
+        return (self._hypothesis().get("components") or {}).get("components") or []
+
+    def _gaps(self) -> List[dict]:
+        if "gaps" not in self._cache:
+            self._cache["gaps"] = self.pm.get_active_gaps()
+        return self._cache["gaps"]
+
+    def _header_inputs(self):
+        state = self.pm.state
+        return [self.pm.root.name, datetime.now().date(), state.total_cycles_completed,
+                state.papers_collected, self.pm.get_config().get("settings", {}).get("cycles_per_run"),
+                (self._hypothesis().get("status") or {}).get("overall")]
+
+    def _hypothesis_inputs(self):
+        hyp_dir = self.pm.root / "hypotheses"
+        version = self.pm.state.current_hypothesis_version
+        return [version, _stat(hyp_dir / "history.jsonl"), _stat(hyp_dir / "v1" / "hypothesis.md"),
+                self._hypothesis()["statement"], self._components()]
+
+    def _components_inputs(self):
+        return self._components()
+
+    def _evidence_inputs(self):
+        graph = self.pm.paper_graph
+        return [self._components(), self.pm.state.papers_collected, _stat(graph.path), _stat(graph.log_path)]
+
+    def _findings_inputs(self):
+        return [[c["cycle_num"], c.get("hash"), c.get("phase")] for c in self._cycles()]
+
+    def _appendix_inputs(self):
+        cycles = [[c["cycle_num"], c.get("hash"), c.get("phase"), c.get("papers")] for c in self._cycles()]
+        return [cycles, self.pm.state.papers_collected, self.pm.backend.name,
+                len(self.pm.backend.list_resolved_gaps())]
+
+    # === Rendering ===
+
+    def _render_header(self, title: str, text: str) -> str:
+        state = self.pm.state
+        overall = str((self._hypothesis().get("status") or {}).get("overall") or "untested")
+        status = OVERALL_LABELS.get(overall.lower(), overall.replace("_", " ").title())
+        total = self.pm.get_config().get("settings", {}).get("cycles_per_run", 20)
+        values = {
+            "Date": datetime.now().strftime("%Y-%m-%d"),
+            "Cycles Completed": f"{state.total_cycles_completed} / {total}",
+            "Papers Analyzed": str(state.papers_collected),
+            "Final Status": status,
+        }
+
+        lines = []
+        for line in text.splitlines(keepends=True):
+            line = line.replace("[Hypothesis Name]", self._hypothesis_name())
+            match = re.match(r"^\*\*(.+?):\*\*\s*(.*?)(\s*)$", line)
+            if match and match.group(1) in values:
+                # Keep the template's trailing double-space line breaks
+                ending = "  \n" if line.rstrip("\n").endswith("  ") else "\n"
+                line = f"**{match.group(1)}:** {values[match.group(1)]}{ending}"
+            lines.append(line)
+        return "".join(lines)
+
+    def _render_hypothesis(self, title: str, text: str) -> str:
+        hyp_dir = self.pm.root / "hypotheses"
+        original = _statement((hyp_dir / "v1" / "hypothesis.md").read_text()
+                              if (hyp_dir / "v1" / "hypothesis.md").exists() else "")
+        current = _statement(self._hypothesis()["statement"])
+        version = self.pm.state.current_hypothesis_version
+
+        out = [f"## {title}\n\n", "### Original Statement\n", f"> {original or '(not written yet)'}\n\n"]
+        if version > 1 and current != original:
+            out += ["### Final Refined Statement (if versioned)\n", f"> {current}\n\n"]
+        out.append("**Versioning History:**\n")
+        log = sorted(self.pm.hypothesis_log(), key=lambda v: v.version)
+        history = [f"- v{v.version - 1} → v{v.version}: {v.reason or 'no reason recorded'} "
+                   f"(+{v.added} -{v.removed} ~{v.changed} components)\n" for v in log if v.version > 1]
+        out += history or ["- v1 only (not refined yet)\n"]
+        return "".join(out) + _separator(text)
+
+    def _render_components(self, title: str, text: str) -> str:
+        components = self._components()
+        out = [f"## {title}\n\n"]
+        if not components:
+            out.append("No components defined yet (hypotheses/v*/components.yaml).\n\n")
+        for i, component in enumerate(components, 1):
+            cid = component.get("id", i)
+            claim = str(component.get("claim") or "").strip()
+            name = component.get("name") or (claim[:60] + ("..." if len(claim) > 60 else "")) or "(unnamed)"
+            status = str(component.get("status") or "untested")
+            out += [
+                f"### Component {cid}: {name}\n",
+                f"**Claim:** {claim or '(not stated)'}  \n",
+                f"**Status:** {STATUS_LABELS.get(status.lower(), status)}\n\n",
+                "**Evidence:**\n",
+            ]
+            evidence = component.get("evidence") or []
+            out += [f"- {_evidence_line(item)}\n" for item in evidence] or ["- None recorded yet\n"]
+            if component.get("assessment"):
+                out.append(f"\n**Assessment:** {component['assessment']}\n")
+            out.append("\n---\n\n")
+        return "".join(out)
+
+    def _render_evidence(self, title: str, text: str) -> str:
+        out = [f"## {title}\n\n", "### Papers by Relevance\n\n"]
+        top = self.pm.paper_graph.top(self.PAPER_ROWS)
+        if top:
+            out += ["| Paper | ArXiv ID | Responses | Relevance | Co-cited With |\n",
+                    "|-------|----------|-----------|-----------|---------------|\n"]
+            for n, paper in enumerate(top):
+                relevance = "High" if n < len(top) / 3 else "Medium" if n < 2 * len(top) / 3 else "Low"
+                out.append(f"| {_cell(paper.title or paper.url)} | {paper.arxiv_id or 'N/A'} | "
+                           f"{paper.mentions} | {relevance} | {paper.degree} papers |\n")
+            out.append(f"\nRanked by co-citation PageRank; {self.pm.state.papers_collected} papers "
+                       f"collected in total (`rv papers list`).\n\n")
+        else:
+            out.append("No papers collected yet.\n\n")
+
+        groups = {"strong": [], "moderate": [], "weak": [], "conflicting": []}
+        for i, component in enumerate(self._components(), 1):
+            label = f"Component {component.get('id', i)}"
+            count = len(component.get("evidence") or [])
+            if str(component.get("status") or "").lower() == "contested":
+                groups["conflicting"].append(label)
+            groups["strong" if count >= 3 else "moderate" if count else "weak"].append(label)
+        out += [
+            "### Evidence Quality Assessment\n\n",
+            f"- **Strong Evidence (≥3 credible sources agreeing):** {', '.join(groups['strong']) or 'None'}\n",
+            f"- **Moderate Evidence (1-2 sources):** {', '.join(groups['moderate']) or 'None'}\n",
+            f"- **Weak/No Evidence:** {', '.join(groups['weak']) or 'None'}\n",
+            f"- **Conflicting Evidence:** {', '.join(groups['conflicting']) or 'None'}\n",
+        ]
+        return "".join(out) + _separator(text)
+
+    def _render_findings(self, title: str, text: str) -> str:
+        cycles = [c for c in self._cycles() if c.get("synthesis")]
+        findings = [c for c in cycles if c.get("finding")]
+        patterns = [c for c in cycles if c.get("patterns")]
+        contradictions = [c for c in patterns if c.get("contradiction")]
+
+        out = [f"## {title}\n\n", "### Major Discoveries\n"]
+        out += [f"{n}. **Cycle {c['cycle_num']}** ({c.get('phase') or '-'}): {c['finding']}\n"
+                for n, c in enumerate(findings, 1)] or ["- No synthesized findings yet\n"]
+        out.append("\n### Unexpected Connections\n")
+        out += [f"- Cycle {c['cycle_num']}: {c['patterns']}\n" for c in patterns] \
+            or ["- None recorded in cycle syntheses\n"]
+        out.append("\n### Contradictions Identified\n")
+        out += [f"- Cycle {c['cycle_num']}: {c['patterns']}\n" for c in contradictions] \
+            or ["- None recorded in cycle syntheses\n"]
+        return "".join(out) + _separator(text)
+
+    def _render_gaps(self, title: str, text: str) -> str:
+        headings = [("high", "High Priority (Block Validation)"), ("medium", "Medium Priority (Would Strengthen)"),
+                    ("low", "Low Priority (Nice to Have)")]
+        out = [f"## {title}\n\n"]
+        for priority, heading in headings:
+            gaps = [g for g in self._gaps() if (g.get("priority") or "medium") == priority
+                    and str(g.get("description") or "").strip()]
+            out.append(f"### {heading}\n")
+            for n, gap in enumerate(gaps, 1):
+                related = gap.get("related_components") or []
+                suffix = f" - Required to validate component {', '.join(map(str, related))}" if related else ""
+                out.append(f"{n}. {gap['description']} (gap #{gap.get('id', '?')}){suffix}\n")
+            if not gaps:
+                out.append("- None\n")
+            out.append("\n")
+        return "".join(out).rstrip("\n") + "\n" + _separator(text)
+
+    def _render_appendix(self, title: str, text: str) -> str:
+        out = [f"## {title}\n\n", "### Research Cycle Summary\n\n",
+               "| Cycle | Phase | Key Question | Papers Found | Key Finding |\n",
+               "|-------|-------|--------------|--------------|-------------|\n"]
+        for c in self._cycles():
+            out.append(f"| {c['cycle_num']} | {(c.get('phase') or '-').capitalize()} | {_cell(c.get('question'))} | "
+                       f"{c.get('papers', 0)} | {_cell(c.get('finding'))[:120]} |\n")
+        storage = "project.db" if self.pm.backend.name == "sqlite" else "resources/papers.yaml"
+        resolved = len(self.pm.backend.list_resolved_gaps())
+        out += [
+            "\n### Full Paper Registry\n\n",
+            f"{self.pm.state.papers_collected} papers in `{storage}` (list them with `rv papers list`).\n\n",
+            "### Gap Resolution History\n\n",
+            f"{resolved} gap{'s' if resolved != 1 else ''} resolved (see `gaps/resolved.yaml`).\n",
+        ]
+        return "".join(out)
+
+    def _hypothesis_name(self) -> str:
+        title = re.search(r"^#\s+(.+)$", self._hypothesis()["statement"], re.MULTILINE)
+        name = title.group(1).strip() if title else ""
+        if not name or re.fullmatch(r"hypothesis( v\d+)?", name, re.IGNORECASE):
+            return self.pm.state.project_name
+        return name
+
+    # === Manifest ===
+
+    def _load_manifest(self) -> dict:
+        try:
+            return json.loads(self.manifest_path.read_text())
+        except (OSError, ValueError):
+            return {}
+
+    def _save_manifest(self, manifest: dict):
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write(self.manifest_path, json.dumps(manifest, separators=(",", ":")))
+
+
+def _statement(markdown: str) -> str:
+    section = _section_text(markdown, "Statement")
+    return _lead(section or markdown, 2000)
+
+
+def _evidence_line(item) -> str:
+    if isinstance(item, dict):
+        title = item.get("title") or item.get("paper") or item.get("url") or "Untitled"
+        arxiv = item.get("arxiv_id")
+        note = item.get("note") or item.get("summary") or item.get("finding") or ""
+        line = f"{title} ({arxiv})" if arxiv else str(title)
+        return f"{line}: {note}" if note else line
+    return str(item)
+
+
+def _separator(template_text: str) -> str:
+    """The template section's closing '---' rule, if it has one."""
+    return "\n---\n\n" if template_text.rstrip().endswith("---") else "\n"
@@ -0,0 +1,333 @@
+"""
+Search Index - Full-text search over cycle responses, syntheses and papers.
+
+Handles:
+- An SQLite FTS5 index (.research-index.db) kept up to date as responses
+  and syntheses are saved, backfilled from the project on first use
+- Chunks of the downloaded papers' text (rv papers extract), indexed as
+  "paper" documents with the paper's title and arXiv ID
+- BM25 ranking, weighting questions and paper titles above response text
+- Query syntax: words (all must match), "exact phrases", prefix*, OR, NOT
+- Snippets around the matching text
+"""
+
+import json
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import TYPE_CHECKING, List, Optional
+
+if TYPE_CHECKING:
+    from .project import ProjectManager
+
+
+@dataclass
+class SearchHit:
+    """One matching response, synthesis or paper passage."""
+    kind: str  # response, synthesis, paper
+    cycle_num: Optional[int]
+    question_num: Optional[int]
+    question: str  # For papers: the title
+    snippet: str
+    score: float
+    project: str = ""
+    paper: str = ""  # For papers: the arXiv ID (or other key)
+    page: Optional[int] = None  # For papers: page the passage starts on
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+_FTS5_AVAILABLE: Optional[bool] = None
+
+
+def fts5_available() -> bool:
+    """Whether this Python's SQLite was built with FTS5."""
+    global _FTS5_AVAILABLE
+    if _FTS5_AVAILABLE is None:
+        try:
+            sqlite3.connect(":memory:").execute("CREATE VIRTUAL TABLE t USING fts5(x)")
+            _FTS5_AVAILABLE = True
+        except sqlite3.OperationalError:
+            _FTS5_AVAILABLE = False
+    return _FTS5_AVAILABLE
+
+
+_OPERATORS = {"OR", "NOT", "AND"}
+
+
+def to_fts_query(query: str) -> str:
+    """
+    Translate user query text into an FTS5 MATCH expression.
+
+    Bare words are quoted (so punctuation such as arXiv IDs can't break
+    the syntax) and must all match; "quoted text" is a phrase; a trailing
+    * makes a prefix query; OR / NOT / AND pass through.
+    """
+    parts = []
+    for phrase, word in re.findall(r'"([^"]*)"|(\S+)', query):
+        if phrase:
+            parts.append(f'"{phrase}"')
+        elif word in _OPERATORS:
+            parts.append(word)
+        else:
+            prefix = word.endswith("*")
+            word = word.rstrip("*").replace('"', "")
+            if word:
+                parts.append(f'"{word}"' + ("*" if prefix else ""))
+
+    # Operators need a term on both sides
+    while parts and parts[0] in _OPERATORS:
+        parts.pop(0)
+    while parts and parts[-1] in _OPERATORS:
+        parts.pop()
+    return " ".join(parts)
+
+
+class SearchIndex:
+    """FTS5 index over one project's responses and syntheses."""
+
+    INDEX_FILE = ".research-index.db"
+    REBUILD_HINT = "run 'rv search --rebuild'"
+
+    # bm25() weights for the question, body and papers columns
+    WEIGHTS = (2.0, 1.0, 1.5)
+    SNIPPET_TOKENS = 16
+
+    SCHEMA = """
+    CREATE VIRTUAL TABLE IF NOT EXISTS documents USING fts5(
+        question, body, papers,
+        kind UNINDEXED, cycle_num UNINDEXED, question_num UNINDEXED,
+        tokenize = 'porter unicode61'
+    );
+    CREATE TABLE IF NOT EXISTS doc_ids (
+        doc_id TEXT PRIMARY KEY,
+        row INTEGER NOT NULL
+    );
+    """
+
+    def __init__(self, project_manager: "ProjectManager"):
+        """
+        Initialize search index.
+
+        Args:
+            project_manager: ProjectManager of the project to index
+        """
+        self.pm = project_manager
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+
+    @property
+    def path(self) -> Path:
+        return self.pm.root / self.INDEX_FILE
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if not fts5_available():
+                raise RuntimeError("Full-text search needs SQLite with FTS5 support")
+            backfill = not self.path.exists()
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False,
+                                         isolation_level=None, timeout=30)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(self.SCHEMA)
+            if backfill:
+                # Index everything saved before the index existed
+                self.rebuild()
+        return self._conn
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    # === Updates ===
+
+    def response_saved(self, cycle_num: int, question_num: int, question: str, response: dict):
+        self._update(lambda conn: self._add_response(conn, cycle_num, question_num, question, response))
+
+    def synthesis_saved(self, cycle_num: int, synthesis: str):
+        self._update(lambda conn: self._add_synthesis(conn, cycle_num, synthesis))
+
+    def paper_extracted(self, key: str, title: str, chunks: list):
+        """Replace a paper's passages (no chunks removes the paper)."""
+        self._update(lambda conn: self._add_paper(conn, key, title, chunks))
+
+    def rebuild(self) -> int:
+        """
+        Re-index the whole project.
+
+        Returns:
+            Number of documents indexed
+        """
+        count = 0
+        with self._lock:
+            conn = self.conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute("DELETE FROM documents")
+                conn.execute("DELETE FROM doc_ids")
+                for record in self.pm.iter_responses():
+                    self._add_response(conn, record["cycle_num"], record["question_num"],
+                                       record.get("question", ""), record)
+                    count += 1
+                files = self.pm.cycle_files
+                for cycle_num in files.cycle_numbers():
+                    synthesis = files.read_text(cycle_num, "synthesis.md")
+                    if synthesis is not None:
+                        self._add_synthesis(conn, cycle_num, synthesis)
+                        count += 1
+                fulltext = self.pm.fulltext
+                titles = fulltext.titles() if fulltext.path.exists() else {}
+                for key, chunks in fulltext.iter_chunks():
+                    self._add_paper(conn, key, titles.get(key, ""), chunks)
+                    count += len(chunks)
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+        return count
+
+    def _update(self, fn):
+        """Apply an index update; a failure must never lose the write it follows."""
+        if not fts5_available():
+            return
+        try:
+            with self._lock:
+                conn = self.conn
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    fn(conn)
+                except BaseException:
+                    conn.execute("ROLLBACK")
+                    raise
+                conn.execute("COMMIT")
+        except sqlite3.Error as e:
+            print(f"  ⚠ Search index not updated ({e}); run 'rv search --rebuild'")
+
+    def _add_response(self, conn: sqlite3.Connection, cycle_num: int, question_num: int,
+                      question: str, response: dict):
+        papers = " ".join(
+            f"{p.get('title', '')} {p.get('arxiv_id') or ''}" for p in response.get("papers", [])
+        )
+        self._upsert(conn, f"response:{cycle_num}:{question_num}", "response", cycle_num,
+                     question_num, question or "", response.get("text", ""), papers)
+
+    def _add_synthesis(self, conn: sqlite3.Connection, cycle_num: int, synthesis: str):
+        self._upsert(conn, f"synthesis:{cycle_num}", "synthesis", cycle_num, None, "", synthesis, "")
+
+    def _add_paper(self, conn: sqlite3.Connection, key: str, title: str, chunks: list):
+        prefix = f"paper:{key}:"
+        stale = conn.execute("SELECT doc_id, row FROM doc_ids WHERE doc_id >= ? AND doc_id < ?",
+                             (prefix, prefix + "\uffff")).fetchall()
+        live = {f"{prefix}{chunk.seq}" for chunk in chunks}
+        for doc_id, row in stale:
+            if doc_id not in live:
+                conn.execute("DELETE FROM documents WHERE rowid = ?", (row,))
+                conn.execute("DELETE FROM doc_ids WHERE doc_id = ?", (doc_id,))
+        for chunk in chunks:
+            # question_num holds the page the passage starts on
+            self._upsert(conn, f"{prefix}{chunk.seq}", "paper", None, chunk.page, title, chunk.text, key)
+
+    @staticmethod
+    def _upsert(conn: sqlite3.Connection, doc_id: str, kind: str, cycle_num: Optional[int],
+                question_num: Optional[int], question: str, body: str, papers: str):
+        row = conn.execute("SELECT row FROM doc_ids WHERE doc_id = ?", (doc_id,)).fetchone()
+        if row:
+            conn.execute("DELETE FROM documents WHERE rowid = ?", (row[0],))
+        cursor = conn.execute(
+            "INSERT INTO documents (question, body, papers, kind, cycle_num, question_num) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (question, body, papers, kind, cycle_num, question_num),
+        )
+        conn.execute(
+            "INSERT INTO doc_ids (doc_id, row) VALUES (?, ?) "
+            "ON CONFLICT(doc_id) DO UPDATE SET row = excluded.row",
+            (doc_id, cursor.lastrowid),
+        )
+
+    # === Querying ===
+
+    def search(self, query: str, limit: int = 10, kind: Optional[str] = None) -> List[SearchHit]:
+        """
+        Find the best-matching responses, syntheses and paper passages.
+
+        Args:
+            query: Query text (words, "phrases", prefix*, OR, NOT)
+            limit: Maximum number of hits
+            kind: Only return "response", "synthesis" or "paper" documents
+
+        Returns:
+            Hits, best first
+        """
+        match = to_fts_query(query)
+        if not match:
+            return []
+
+        sql = (
+            "SELECT kind, cycle_num, question_num, question, papers, "
+            f"snippet(documents, 1, '[', ']', '…', {self.SNIPPET_TOKENS}), "
+            "bm25(documents, ?, ?, ?) AS score "
+            "FROM documents WHERE documents MATCH ?"
+        )
+        params = [*self.WEIGHTS, match]
+        if kind:
+            sql += " AND kind = ?"
+            params.append(kind)
+        sql += " ORDER BY score LIMIT ?"
+        params.append(limit)
+
+        with self._lock:
+            rows = self.conn.execute(sql, params).fetchall()
+        hits = []
+        for k, c, q, question, papers, snippet, score in rows:
+            hit = SearchHit(kind=k, cycle_num=c, question_num=q, question=question or "",
+                            snippet=" ".join(snippet.split()), score=-score, project=self.pm.root.name)
+            if k == "paper":
+                hit.question_num, hit.page, hit.paper = None, q, papers
+            hits.append(hit)
+        return hits
+
+
+def search_projects(managers: List["ProjectManager"], query: str, limit: int = 10,
+                    kind: Optional[str] = None) -> tuple:
+    """
+    Search several projects and merge their hits by score.
+
+    Returns:
+        (hits, elapsed milliseconds)
+    """
+    start = time.perf_counter()
+    hits = []
+    for pm in managers:
+        hits.extend(pm.search_index.search(query, limit=limit, kind=kind))
+    hits.sort(key=lambda h: h.score, reverse=True)
+    return hits[:limit], (time.perf_counter() - start) * 1000
+
+
+def print_hits(hits: List[SearchHit], elapsed_ms: float, multi_project: bool = False):
+    """Print search hits for the terminal."""
+    if not hits:
+        print(f"No matches ({elapsed_ms:.1f} ms).")
+        return
+
+    print(f"\n🔎 {len(hits)} match{'es' if len(hits) != 1 else ''} ({elapsed_ms:.1f} ms)\n")
+    for hit in hits:
+        if hit.kind == "paper":
+            where = f"Paper [{hit.paper}] p.{hit.page}"
+        else:
+            where = f"Cycle {hit.cycle_num}" + (f" Q{hit.question_num}" if hit.question_num else " synthesis")
+        if multi_project:
+            where = f"{hit.project} / {where}"
+        print(f"  {where}  (score {hit.score:.2f})")
+        if hit.question:
+            question = hit.question if len(hit.question) <= 100 else hit.question[:97] + "..."
+            print(f"    Q: {question}")
+        print(f"    {hit.snippet}\n")
+
+
+def hits_to_json(hits: List[SearchHit]) -> str:
+    return json.dumps([h.to_dict() for h in hits], indent=2)
@@ -0,0 +1,349 @@
+"""
+Run Simulator - Plans run_cycles throughput without touching Alphaxiv.
+
+Handles:
+- Fitting a latency model from a project's historical response records
+- A simulated Alphaxiv client that replays historical answers in virtual time
+- Running the real ResearchOrchestrator on scratch copies of projects under a
+  virtual-time event loop
+- Comparing concurrency and pacing settings (duration, queue depth, utilisation)
+"""
+
+import asyncio
+import contextlib
+import io
+import math
+import random
+import shutil
+import statistics
+import tempfile
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+
+from .alphaxiv import AlphaxivResponse
+from .orchestrator import ResearchOrchestrator
+from .persistence import AsyncPersistence
+from .project import ProjectManager
+
+
+class LatencyModel:
+    """Log-normal query latency model fitted from historical responses."""
+
+    # Used when a project has no usable timing history
+    DEFAULT_MEDIAN_SECONDS = 45.0
+    DEFAULT_SIGMA = 0.5
+
+    def __init__(self, samples: List[float], responses: Optional[List[dict]] = None):
+        """
+        Initialize latency model.
+
+        Args:
+            samples: Observed per-query latencies in seconds
+            responses: Historical response records to replay (text + papers)
+        """
+        self.samples = [s for s in samples if s > 0]
+        self.responses = responses or []
+
+        if self.samples:
+            logs = [math.log(s) for s in self.samples]
+            self.mu = statistics.mean(logs)
+            # A handful of samples says little about spread; keep the default
+            if len(logs) >= 5:
+                self.sigma = max(statistics.stdev(logs), 0.05)
+            else:
+                self.sigma = self.DEFAULT_SIGMA
+        else:
+            self.mu = math.log(self.DEFAULT_MEDIAN_SECONDS)
+            self.sigma = self.DEFAULT_SIGMA
+
+    @property
+    def median_seconds(self) -> float:
+        return math.exp(self.mu)
+
+    def sample(self, rng: random.Random) -> float:
+        """Draw one query latency in seconds."""
+        return rng.lognormvariate(self.mu, self.sigma)
+
+    @classmethod
+    def fit(cls, project_roots: List[Path], query_delay: float = ResearchOrchestrator.QUERY_DELAY
+            ) -> "LatencyModel":
+        """
+        Fit a model from the saved responses of the given projects.
+
+        Responses that record duration_seconds are used directly. Older
+        records only carry a completion timestamp, so latency is inferred from
+        the gap between consecutive responses in the same cycle.
+        """
+        samples = []
+        responses = []
+
+        for root in project_roots:
+            timestamps = {}
+            for record in ProjectManager(root).iter_responses():
+                responses.append({"text": record.get("text", ""), "papers": record.get("papers", [])})
+
+                if record.get("duration_seconds"):
+                    samples.append(float(record["duration_seconds"]))
+                elif record.get("timestamp"):
+                    try:
+                        stamp = datetime.fromisoformat(record["timestamp"])
+                    except ValueError:
+                        continue
+                    timestamps.setdefault(record["cycle_num"], []).append(stamp)
+
+            for stamps in timestamps.values():
+                for earlier, later in zip(stamps, stamps[1:]):
+                    gap = (later - earlier).total_seconds() - query_delay
+                    # Ignore gaps that span an interruption or manual session
+                    if 0 < gap < 600:
+                        samples.append(gap)
+
+        return cls(samples, responses)
+
+
+@dataclass
+class SimulationStats:
+    """Counters shared by the clients of one simulation run."""
+    queries: int = 0
+    query_seconds: float = 0.0
+    active_queries: int = 0
+
+
+class SimulatedAlphaxivClient:
+    """Stand-in for AlphaxivClient whose queries only take virtual time."""
+
+    PAGE_LOAD_SECONDS = 3.0
+
+    def __init__(self, model: LatencyModel, rng: random.Random,
+                 contention: float = 0.0, stats: Optional[SimulationStats] = None):
+        """
+        Initialize simulated client.
+
+        Args:
+            model: Latency model to draw query times from
+            rng: Random source shared by one simulation run
+            contention: Fractional slowdown per additional concurrent query
+            stats: Shared counters for the simulation run
+        """
+        self.model = model
+        self.rng = rng
+        self.contention = contention
+        self.stats = stats or SimulationStats()
+
+    async def new_conversation(self):
+        await asyncio.sleep(self.PAGE_LOAD_SECONDS)
+
+    async def query(self, question: str, timeout_seconds: int = 120) -> AlphaxivResponse:
+        self.stats.active_queries += 1
+        try:
+            slowdown = 1 + self.contention * (self.stats.active_queries - 1)
+            latency = self.model.sample(self.rng) * slowdown
+            await asyncio.sleep(min(latency, timeout_seconds))
+        finally:
+            self.stats.active_queries -= 1
+        self.stats.queries += 1
+        self.stats.query_seconds += min(latency, timeout_seconds)
+
+        if self.model.responses:
+            record = self.rng.choice(self.model.responses)
+            return AlphaxivResponse(text=record["text"], papers=[dict(p) for p in record["papers"]])
+        return AlphaxivResponse(text="[Simulated response]", papers=[])
+
+    async def send_context_recap(self, recap: str):
+        return await self.query(recap)
+
+    async def close(self):
+        pass
+
+
+class _VirtualSelector:
+    """Selector wrapper that jumps the clock forward instead of blocking."""
+
+    def __init__(self, selector, loop: "VirtualTimeLoop"):
+        self._selector = selector
+        self._loop = loop
+
+    def select(self, timeout=None):
+        if timeout is None:
+            return self._selector.select(None)
+        events = self._selector.select(0)
+        if events or timeout <= 0:
+            return events
+        # Nothing ready: skip straight to the next scheduled timer
+        self._loop.virtual_time += timeout
+        return []
+
+    def __getattr__(self, name):
+        return getattr(self._selector, name)
+
+
+class VirtualTimeLoop(asyncio.SelectorEventLoop):
+    """Event loop whose clock advances to the next timer as soon as it is idle."""
+
+    def __init__(self):
+        super().__init__()
+        self.virtual_time = 0.0
+        self._selector = _VirtualSelector(self._selector, self)
+
+    def time(self) -> float:
+        return self.virtual_time
+
+
+class _InlinePersistence(AsyncPersistence):
+    """Applies writes synchronously so no real time passes outside the virtual clock."""
+
+    def _enqueue(self, op):
+        self._commit([(op, [op.future])])
+        return op.future
+
+    async def close(self):
+        await self.flush()
+
+
+@dataclass
+class SimulationResult:
+    """Projected outcome for one concurrency/pacing setting."""
+    concurrency: int
+    pacing: float
+    duration_seconds: float
+    queries: int
+    cycles: int
+    mean_queue_depth: float
+    max_queue_depth: int
+    utilisation: float
+    query_share: float
+
+
+class RunSimulator:
+    """Runs ResearchOrchestrator over scratch project copies in virtual time."""
+
+    def __init__(self, project_roots: List[Path], model: LatencyModel,
+                 num_cycles: int = 20, max_minutes: Optional[float] = None,
+                 contention: float = 0.0, seed: int = 0):
+        """
+        Initialize simulator.
+
+        Args:
+            project_roots: Projects to simulate (they are copied, never modified)
+            model: Fitted latency model
+            num_cycles: Cycles per project, as for rv run --cycles
+            max_minutes: Optional per-project budget, as for rv run --max-minutes
+            contention: Fractional slowdown per additional concurrent query
+            seed: Random seed (the same seed is used for every setting)
+        """
+        self.project_roots = [Path(p) for p in project_roots]
+        self.model = model
+        self.num_cycles = num_cycles
+        self.max_minutes = max_minutes
+        self.contention = contention
+        self.seed = seed
+
+    def simulate(self, concurrency: int, pacing: float) -> SimulationResult:
+        """Simulate one setting on fresh copies of every project."""
+        with tempfile.TemporaryDirectory(prefix="rv-simulate-") as scratch:
+            copies = []
+            for i, root in enumerate(self.project_roots):
+                dest = Path(scratch) / f"{i:02d}-{root.name}"
+                shutil.copytree(root, dest, ignore=shutil.ignore_patterns("research", "downloads"))
+                copies.append(dest)
+
+            loop = VirtualTimeLoop()
+            try:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    return loop.run_until_complete(self._run(copies, concurrency, pacing))
+            finally:
+                loop.close()
+
+    async def _run(self, copies: List[Path], concurrency: int, pacing: float) -> SimulationResult:
+        loop = asyncio.get_running_loop()
+        rng = random.Random(self.seed)
+        stats = SimulationStats()
+        slots = asyncio.Semaphore(concurrency)
+
+        # Time-weighted integrals of queue depth and busy slots
+        timeline = {"last": loop.time(), "waiting": 0, "busy": 0,
+                    "waiting_area": 0.0, "busy_area": 0.0, "max_waiting": 0}
+        cycles_run = 0
+
+        def mark(waiting_delta: int = 0, busy_delta: int = 0):
+            now = loop.time()
+            elapsed = now - timeline["last"]
+            timeline["waiting_area"] += timeline["waiting"] * elapsed
+            timeline["busy_area"] += timeline["busy"] * elapsed
+            timeline["last"] = now
+            timeline["waiting"] += waiting_delta
+            timeline["busy"] += busy_delta
+            timeline["max_waiting"] = max(timeline["max_waiting"], timeline["waiting"])
+
+        async def run_project(root: Path):
+            nonlocal cycles_run
+            mark(waiting_delta=1)
+            async with slots:
+                mark(waiting_delta=-1, busy_delta=1)
+                client = SimulatedAlphaxivClient(self.model, rng, self.contention, stats)
+                orchestrator = ResearchOrchestrator(ProjectManager(root), client=client)
+                orchestrator.persistence = _InlinePersistence(orchestrator.pm)
+                orchestrator.query_delay = pacing
+                try:
+                    results = await orchestrator.run_cycles(
+                        num_cycles=self.num_cycles, max_minutes=self.max_minutes
+                    )
+                    cycles_run += len(results)
+                finally:
+                    mark(busy_delta=-1)
+
+        await asyncio.gather(*(run_project(root) for root in copies))
+
+        duration = loop.time()
+        busy_seconds = timeline["busy_area"]
+        return SimulationResult(
+            concurrency=concurrency,
+            pacing=pacing,
+            duration_seconds=duration,
+            queries=stats.queries,
+            cycles=cycles_run,
+            mean_queue_depth=timeline["waiting_area"] / duration if duration else 0.0,
+            max_queue_depth=timeline["max_waiting"],
+            utilisation=busy_seconds / (concurrency * duration) if duration else 0.0,
+            query_share=stats.query_seconds / busy_seconds if busy_seconds else 0.0,
+        )
+
+    def sweep(self, concurrency_levels: List[int], pacings: List[float]) -> List[SimulationResult]:
+        """Simulate every combination of concurrency and pacing."""
+        return [self.simulate(c, p) for c in concurrency_levels for p in pacings]
+
+
+def recommend(results: List[SimulationResult], tolerance: float = 0.05) -> SimulationResult:
+    """Cheapest setting whose duration is within tolerance of the fastest one."""
+    fastest = min(r.duration_seconds for r in results)
+    candidates = [r for r in results if r.duration_seconds <= fastest * (1 + tolerance)]
+    return min(candidates, key=lambda r: (r.concurrency, -r.pacing))
+
+
+def print_report(results: List[SimulationResult], model: LatencyModel, num_projects: int,
+                 num_cycles: int):
+    """Print a human-readable comparison table."""
+    print(f"\n🧪 Simulated {num_projects} project(s) × {num_cycles} cycles")
+    print(f"   Latency model: median {model.median_seconds:.0f}s, σ(log) {model.sigma:.2f} "
+          f"({len(model.samples)} historical samples)")
+    print("=" * 78)
+    print(f"  {'conc':>4}  {'pacing':>6}  {'duration':>9}  {'cycles':>6}  {'queries':>7}  "
+          f"{'queue avg/max':>13}  {'util':>5}  {'in-query':>8}")
+    for r in results:
+        print(f"  {r.concurrency:>4}  {r.pacing:>5.1f}s  {_format_duration(r.duration_seconds):>9}  "
+              f"{r.cycles:>6}  {r.queries:>7}  {r.mean_queue_depth:>7.2f}/{r.max_queue_depth:<5}  "
+              f"{r.utilisation:>5.0%}  {r.query_share:>8.0%}")
+
+    best = recommend(results)
+    print(f"\n✓ Recommended: concurrency {best.concurrency}, pacing {best.pacing:.1f}s "
+          f"→ ~{_format_duration(best.duration_seconds)}")
+
+
+def _format_duration(seconds: float) -> str:
+    hours, rem = divmod(int(seconds), 3600)
+    minutes, secs = divmod(rem, 60)
+    if hours:
+        return f"{hours}h{minutes:02d}m"
+    return f"{minutes}m{secs:02d}s"
@@ -0,0 +1,825 @@
+"""
+Storage Backends - Where ProjectManager keeps papers, gaps, responses, cycles and state.
+
+Handles:
+- YamlBackend: the human-readable layout (papers.yaml plus its append-only
+  log, gaps/*.yaml, responses as .md + .json, metadata.json,
+  .research-state.yaml)
+- SqliteBackend: a single project.db with indexed lookups and transactional
+  batch updates, for projects whose registries have grown large
+- Transactional batches: every file touched in a batch is committed once,
+  with an fsync'd write-temp-then-rename
+- Multi-process safety: YAML batches hold the project's exclusive lock and
+  reads its shared lock; IDs come from a monotonic allocator
+- Converting a project between the two (rv import yaml / rv export yaml)
+- Reading archived cycles (rv archive) as if they were still on disk
+- Keeping response text in the content-addressed blob store, with
+  responses holding a reference (rv blobs)
+
+The backend is chosen by `settings.storage` in config.yaml (default: yaml).
+Questions, syntheses, checkpoints and hypotheses are always plain files.
+"""
+
+import contextlib
+import json
+import re
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import yaml
+
+from .archive import CycleFiles
+from .blobs import BlobStore, is_ref
+from .fileops import ProjectLock, atomic_write
+from .papers import PaperRegistry, canonical_arxiv_id, paper_key
+
+
+STORAGE_BACKENDS = ("yaml", "sqlite")
+
+
+# Characters of response text kept in the markdown when the text itself is a blob
+MARKDOWN_PREVIEW_CHARS = 280
+
+
+def format_response_markdown(question_num: int, question: str, response: dict,
+                             text_ref: Optional[str] = None) -> str:
+    """
+    Render a question-response pair as the markdown stored under responses/.
+
+    With text_ref, the full text lives in the blob store and the markdown
+    shows a preview and the reference.
+    """
+    text = response.get('text', '')
+    if text_ref:
+        preview = text if len(text) <= MARKDOWN_PREVIEW_CHARS else text[:MARKDOWN_PREVIEW_CHARS].rstrip() + "…"
+        text = f"{preview}\n\n> Full text: `{text_ref}` (rv blobs show {text_ref[7:19]})"
+    content = f"""# Response to Q{question_num}
+
+## Question
+
+{question}
+
+## Response
+
+{text}
+
+## Papers Found
+
+"""
+    for paper in response.get('papers', []):
+        content += f"- [{paper['title']}]({paper['url']})\n"
+
+    content += f"\n## Metadata\n\nTimestamp: {response.get('timestamp', '')}\n"
+    return content
+
+
+def _store_text(blobs: BlobStore, response: dict) -> dict:
+    """Response as persisted: the text moved into the blob store, a reference in its place."""
+    stored = {k: v for k, v in response.items() if k != "text"}
+    stored["text_ref"] = blobs.put(response.get("text") or "")
+    return stored
+
+
+def _load_text(blobs: BlobStore, stored: dict) -> dict:
+    """Response as read back: the text restored from its blob (empty if the blob is gone)."""
+    ref = stored.get("text_ref")
+    if not is_ref(ref):
+        return stored
+    response = {k: v for k, v in stored.items() if k != "text_ref"}
+    response["text"] = blobs.get(ref) or ""
+    return response
+
+
+class YamlBackend:
+    """Stores everything as YAML/JSON/markdown files in the project tree."""
+
+    name = "yaml"
+
+    STATE_FILE = ".research-state.yaml"
+    IDS_FILE = ".research-ids.yaml"
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.papers = PaperRegistry(self.root / "resources")
+        self.cycle_files = CycleFiles(self.root)
+        self.blobs = BlobStore(self.root)
+        # Shared by readers, exclusive for batches; also serialises threads
+        self.lock = ProjectLock(self.root)
+        # File contents written inside a batch, committed when it ends
+        self._pending: Optional[Dict[Path, str]] = None
+        self._depth = 0
+
+    # === State ===
+
+    def load_state(self) -> Optional[dict]:
+        state_path = self.root / self.STATE_FILE
+        text = self._read(state_path)
+        return None if text is None else yaml.safe_load(text)
+
+    def save_state(self, data: dict):
+        self._write(self.root / self.STATE_FILE, yaml.dump(data, default_flow_style=False))
+
+    # === Papers ===
+
+    def list_papers(self) -> List[dict]:
+        with self.lock.shared():
+            return self.papers.list()
+
+    def add_papers(self, new_papers: List[dict]) -> int:
+        """Add papers not already registered (by canonical arXiv ID). Returns the registry size."""
+        with self.batch():
+            return self.papers.add(new_papers)
+
+    def compact_papers(self) -> tuple:
+        """Fold the paper log into papers.yaml. Returns (entries before, papers after)."""
+        with self.batch():
+            return self.papers.compact()
+
+    def reclaim_space(self):
+        """Nothing to do: compaction already rewrote the files."""
+
+    def merge_papers(self, merges: List[tuple]) -> int:
+        """Replace duplicates with merged entries ((paper, replaced keys) pairs). Returns entries removed."""
+        with self.batch():
+            return self.papers.merge(merges)
+
+    # === Gaps ===
+
+    def list_gaps(self) -> List[dict]:
+        return self._load_yaml(self.root / "gaps" / "active.yaml", "gaps")
+
+    def list_resolved_gaps(self) -> List[dict]:
+        return self._load_yaml(self.root / "gaps" / "resolved.yaml", "resolved")
+
+    def add_gaps(self, new_gaps: List[dict]) -> int:
+        """Assign IDs to new gaps and make them active. Returns the active count."""
+        gaps_path = self.root / "gaps" / "active.yaml"
+        with self.batch():
+            gaps = self._load_yaml(gaps_path, "gaps")
+
+            # Never reuse an ID, even one that has since been resolved
+            existing = gaps + self.list_resolved_gaps()
+            floor = max([g.get("id") or 0 for g in existing], default=0)
+            ids = self.allocate_ids("gaps", len(new_gaps), floor=floor)
+
+            for gap, gap_id in zip(new_gaps, ids):
+                gap["id"] = gap_id
+                gap.setdefault("created", datetime.now().isoformat())
+                gaps.append(gap)
+
+            self._dump_yaml(gaps_path, {"gaps": gaps})
+            return len(gaps)
+
+    def resolve_gap(self, gap_id: int, reason: str) -> int:
+        """Move a gap to resolved. Returns the active count."""
+        active_path = self.root / "gaps" / "active.yaml"
+        resolved_path = self.root / "gaps" / "resolved.yaml"
+
+        with self.batch():
+            # Find and remove the gap
+            gap_to_resolve = None
+            remaining_gaps = []
+            for gap in self._load_yaml(active_path, "gaps"):
+                if gap.get("id") == gap_id:
+                    gap_to_resolve = gap
+                else:
+                    remaining_gaps.append(gap)
+
+            if gap_to_resolve is None:
+                raise ValueError(f"Gap #{gap_id} not found in active gaps")
+
+            # Add resolution info
+            gap_to_resolve["resolved"] = datetime.now().isoformat()
+            gap_to_resolve["resolution"] = reason
+
+            self._dump_yaml(active_path, {"gaps": remaining_gaps})
+
+            resolved = self._load_yaml(resolved_path, "resolved")
+            resolved.append(gap_to_resolve)
+            self._dump_yaml(resolved_path, {"resolved": resolved})
+
+            return len(remaining_gaps)
+
+    # === Responses ===
+
+    def save_response(self, cycle_num: int, question_num: int, question: str, response: dict):
+        responses_dir = self._cycle_dir(cycle_num) / "responses"
+        responses_dir.mkdir(parents=True, exist_ok=True)
+
+        # Blob written under the lock, so a concurrent gc can't drop it before it's referenced
+        with self.batch():
+            stored = _store_text(self.blobs, response)
+            self._write(responses_dir / f"q{question_num:02d}-response.md",
+                        format_response_markdown(question_num, question, response, stored["text_ref"]))
+
+            # Also save raw JSON for programmatic access
+            self._write(responses_dir / f"q{question_num:02d}-response.json", json.dumps(stored, indent=2))
+
+    def iter_responses(self, cycle_nums: Optional[Iterable[int]] = None) -> Iterator[dict]:
+        """Yield every saved response (or those of cycle_nums), with cycle_num, question_num and question."""
+        files = self.cycle_files
+        numbers = files.cycle_numbers()
+        if cycle_nums is not None:
+            wanted = set(cycle_nums)
+            numbers = [n for n in numbers if n in wanted]
+        for cycle_num in numbers:
+            for name in files.list(cycle_num, "responses"):
+                match = re.fullmatch(r"q(\d+)-response\.json", name)
+                if not match:
+                    continue
+                try:
+                    data = json.loads(files.read_text(cycle_num, f"responses/{name}"))
+                except (OSError, ValueError):
+                    continue
+                md_text = files.read_text(cycle_num, f"responses/{name[:-len('.json')]}.md")
+                data.setdefault("question", self._question_from_markdown(md_text))
+                yield {"cycle_num": cycle_num, "question_num": int(match.group(1)),
+                       **_load_text(self.blobs, data)}
+
+    def iter_text_refs(self) -> Iterator[tuple]:
+        """(where, ref) for every blob reference held by a response."""
+        files = self.cycle_files
+        for cycle_num in files.cycle_numbers():
+            for name in files.list(cycle_num, "responses"):
+                if not name.endswith("-response.json"):
+                    continue
+                try:
+                    ref = json.loads(files.read_text(cycle_num, f"responses/{name}")).get("text_ref")
+                except (OSError, ValueError):
+                    continue
+                if is_ref(ref):
+                    yield f"cycle-{cycle_num:03d}/responses/{name}", ref
+
+    def pack_responses(self) -> int:
+        """
+        Move inline text of responses saved before the blob store into it.
+
+        Archived cycles are left as they are. Returns the responses converted.
+        """
+        converted = 0
+        with self.batch():
+            for cycle_num in self.cycle_files.cycle_numbers():
+                responses_dir = self._cycle_dir(cycle_num) / "responses"
+                for json_path in sorted(responses_dir.glob("q*-response.json")):
+                    try:
+                        data = json.loads(json_path.read_text())
+                    except (OSError, ValueError):
+                        continue
+                    if "text" not in data:
+                        continue
+                    question_num = int(re.match(r"q(\d+)", json_path.name).group(1))
+                    md_path = json_path.with_suffix(".md")
+                    question = data.get("question") or self._question_from_markdown(
+                        md_path.read_text() if md_path.exists() else None)
+                    stored = _store_text(self.blobs, data)
+                    self._write(md_path, format_response_markdown(question_num, question, data,
+                                                                  stored["text_ref"]))
+                    self._write(json_path, json.dumps(stored, indent=2))
+                    converted += 1
+        return converted
+
+    def count_responses(self, cycle_num: int) -> int:
+        return sum(1 for name in self.cycle_files.list(cycle_num, "responses") if name.endswith(".md"))
+
+    # === Cycles ===
+
+    def save_cycle_metadata(self, cycle_num: int, metadata: dict, merge: bool = False):
+        with self.batch():
+            metadata_path = self._cycle_dir(cycle_num) / "metadata.json"
+            if merge:
+                metadata = {**self.load_cycle_metadata(cycle_num), **metadata}
+            self._write(metadata_path, json.dumps(metadata, indent=2))
+
+    def load_cycle_metadata(self, cycle_num: int) -> dict:
+        text = self._read(self._cycle_dir(cycle_num) / "metadata.json")
+        if text is None:
+            text = self.cycle_files.read_text(cycle_num, "metadata.json")
+        return json.loads(text) if text is not None else {}
+
+    def list_cycle_metadata(self) -> Dict[int, dict]:
+        result = {}
+        for cycle_num in self.cycle_files.cycle_numbers():
+            metadata = self.load_cycle_metadata(cycle_num)
+            if metadata:
+                result[cycle_num] = metadata
+        return result
+
+    # === Bulk conversion ===
+
+    @contextlib.contextmanager
+    def batch(self):
+        """
+        Run the enclosed updates as one transaction (nested batches join the outer one).
+
+        Files written in the batch are buffered and committed once each at
+        the end; paper additions become a single log append. If the block
+        raises, nothing is written. Holds the project's exclusive lock
+        throughout, so read-modify-write updates from other rv processes
+        cannot interleave.
+        """
+        with self.lock.exclusive():
+            outermost = self._depth == 0
+            if outermost:
+                self._pending = {}
+                self.papers.begin()
+            self._depth += 1
+            try:
+                yield
+            except BaseException:
+                self._depth -= 1
+                if outermost:
+                    self._pending = None
+                    self.papers.rollback()
+                raise
+            self._depth -= 1
+            if outermost:
+                pending, self._pending = self._pending, None
+                for path, text in pending.items():
+                    atomic_write(path, text)
+                self.papers.commit()
+
+    def snapshot(self) -> dict:
+        """Everything this backend stores, for conversion to another backend."""
+        return {
+            "state": self.load_state(),
+            "papers": self.list_papers(),
+            "gaps": self.list_gaps(),
+            "resolved": self.list_resolved_gaps(),
+            "responses": list(self.iter_responses()),
+            "cycles": self.list_cycle_metadata(),
+        }
+
+    def restore(self, snapshot: dict):
+        """Replace this backend's contents with a snapshot."""
+        with self.batch():
+            if snapshot.get("state") is not None:
+                self.save_state(snapshot["state"])
+            self.papers.replace(snapshot["papers"])
+            self._dump_yaml(self.root / "gaps" / "active.yaml", {"gaps": snapshot["gaps"]})
+            self._dump_yaml(self.root / "gaps" / "resolved.yaml", {"resolved": snapshot["resolved"]})
+            for record in snapshot["responses"]:
+                response = {k: v for k, v in record.items() if k not in ("cycle_num", "question_num", "question")}
+                self.save_response(record["cycle_num"], record["question_num"], record.get("question", ""), response)
+            for cycle_num, metadata in snapshot["cycles"].items():
+                self._cycle_dir(int(cycle_num)).mkdir(parents=True, exist_ok=True)
+                self.save_cycle_metadata(int(cycle_num), metadata)
+
+    # === Helpers ===
+
+    def _cycle_dir(self, cycle_num: int) -> Path:
+        return self.root / "research" / f"cycle-{cycle_num:03d}"
+
+    @staticmethod
+    def _question_from_markdown(md_text: Optional[str]) -> str:
+        if not md_text:
+            return ""
+        match = re.search(r"## Question\n\n(.*?)\n\n## Response", md_text, re.DOTALL)
+        return match.group(1) if match else ""
+
+    def allocate_ids(self, name: str, count: int, floor: int = 0) -> List[int]:
+        """
+        Allocate count new IDs from a monotonic per-project sequence.
+
+        Args:
+            name: Sequence name (e.g. "gaps")
+            count: How many IDs to allocate
+            floor: Allocate above this even if the sequence is behind (e.g.
+                IDs added by hand)
+
+        Returns:
+            The new IDs, in increasing order
+        """
+        ids_path = self.root / self.IDS_FILE
+        with self.batch():
+            sequences = yaml.safe_load(self._read(ids_path) or "") or {}
+            last = max(sequences.get(name, 0), floor)
+            sequences[name] = last + count
+            if count:
+                self._write(ids_path, yaml.dump(sequences, default_flow_style=False))
+        return list(range(last + 1, last + count + 1))
+
+    # Other threads block on the lock while a batch is open, so only the
+    # batch's own thread ever sees its buffered files
+
+    def _read(self, path: Path) -> Optional[str]:
+        """Contents of path as of this batch (None if it doesn't exist)."""
+        with self.lock.shared():
+            if self._pending is not None and path in self._pending:
+                return self._pending[path]
+            return path.read_text() if path.exists() else None
+
+    def _write(self, path: Path, text: str):
+        """Write path atomically, or buffer it until the current batch commits."""
+        with self.lock.exclusive():
+            if self._pending is not None:
+                self._pending[path] = text
+            else:
+                atomic_write(path, text)
+
+    def _load_yaml(self, path: Path, key: str) -> list:
+        data = yaml.safe_load(self._read(path) or "") or {}
+        return data.get(key) or []
+
+    def _dump_yaml(self, path: Path, data: dict):
+        self._write(path, yaml.dump(data, default_flow_style=False))
+
+
+class SqliteBackend:
+    """Stores papers, gaps, responses, cycle metadata and state in project.db."""
+
+    name = "sqlite"
+
+    DB_FILE = "project.db"
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS state (
+        key TEXT PRIMARY KEY,
+        value TEXT NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS papers (
+        id INTEGER PRIMARY KEY,
+        url TEXT UNIQUE,
+        key TEXT,
+        arxiv_id TEXT,
+        title TEXT,
+        added TEXT,
+        data TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS papers_arxiv_id ON papers(arxiv_id);
+    CREATE TABLE IF NOT EXISTS paper_aliases (
+        alias TEXT PRIMARY KEY,
+        key TEXT NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS gaps (
+        pk INTEGER PRIMARY KEY,
+        gap_id INTEGER NOT NULL,
+        status TEXT NOT NULL DEFAULT 'active',
+        priority TEXT,
+        created TEXT,
+        resolved TEXT,
+        data TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS gaps_status ON gaps(status, gap_id);
+    CREATE TABLE IF NOT EXISTS responses (
+        cycle_num INTEGER NOT NULL,
+        question_num INTEGER NOT NULL,
+        question TEXT,
+        timestamp TEXT,
+        data TEXT NOT NULL,
+        PRIMARY KEY (cycle_num, question_num)
+    );
+    CREATE TABLE IF NOT EXISTS cycles (
+        cycle_num INTEGER PRIMARY KEY,
+        data TEXT NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS sequences (
+        name TEXT PRIMARY KEY,
+        value INTEGER NOT NULL
+    );
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self._conn: Optional[sqlite3.Connection] = None
+        # Writes may come from the persistence thread; serialise access.
+        # SQLite locks the database itself; the project lock is for
+        # ProjectManager transactions that also touch plain files.
+        self._lock = threading.RLock()
+        self.lock = ProjectLock(self.root)
+        self.blobs = BlobStore(self.root)
+        self._depth = 0
+
+    @property
+    def path(self) -> Path:
+        return self.root / self.DB_FILE
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            # Wait for other rv processes' transactions rather than failing
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False,
+                                         isolation_level=None, timeout=30)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(self.SCHEMA)
+            self._migrate(self._conn)
+        return self._conn
+
+    @staticmethod
+    def _migrate(conn: sqlite3.Connection):
+        """Bring databases created by older versions up to the current schema."""
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(papers)")}
+        if "key" not in columns:
+            conn.execute("ALTER TABLE papers ADD COLUMN key TEXT")
+        # Backfill canonical keys; the first paper under a key wins
+        rows = conn.execute("SELECT id, data FROM papers WHERE key IS NULL ORDER BY id").fetchall()
+        if rows:
+            conn.execute("BEGIN IMMEDIATE")
+            seen = {r[0] for r in conn.execute("SELECT key FROM papers WHERE key IS NOT NULL")}
+            for row_id, data in rows:
+                key = paper_key(json.loads(data))
+                if key in seen:
+                    conn.execute("DELETE FROM papers WHERE id = ?", (row_id,))
+                else:
+                    seen.add(key)
+                    conn.execute("UPDATE papers SET key = ? WHERE id = ?", (key, row_id))
+            conn.execute("COMMIT")
+        conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS papers_key ON papers(key)")
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    @contextlib.contextmanager
+    def batch(self):
+        """Run the enclosed updates in one transaction (nested batches join the outer one)."""
+        with self._lock:
+            outermost = self._depth == 0
+            if outermost:
+                self.conn.execute("BEGIN IMMEDIATE")
+            self._depth += 1
+            try:
+                yield self.conn
+            except BaseException:
+                self._depth -= 1
+                if outermost:
+                    self.conn.execute("ROLLBACK")
+                raise
+            self._depth -= 1
+            if outermost:
+                self.conn.execute("COMMIT")
+
+    # === State ===
+
+    def load_state(self) -> Optional[dict]:
+        with self._lock:
+            rows = self.conn.execute("SELECT key, value FROM state").fetchall()
+        return {k: json.loads(v) for k, v in rows} or None
+
+    def save_state(self, data: dict):
+        with self.batch() as conn:
+            conn.executemany(
+                "INSERT INTO state (key, value) VALUES (?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                [(k, json.dumps(v)) for k, v in data.items()],
+            )
+
+    # === Papers ===
+
+    def list_papers(self) -> List[dict]:
+        with self._lock:
+            rows = self.conn.execute("SELECT data FROM papers ORDER BY id").fetchall()
+        return [json.loads(r[0]) for r in rows]
+
+    def add_papers(self, new_papers: List[dict]) -> int:
+        """Add papers not already registered (by canonical arXiv ID). Returns the registry size."""
+        with self.batch() as conn:
+            for paper in new_papers:
+                key = paper_key(paper)
+                exists = conn.execute(
+                    "SELECT 1 FROM papers WHERE key = ? UNION ALL SELECT 1 FROM paper_aliases WHERE alias = ?",
+                    (key, key),
+                ).fetchone()
+                if exists:
+                    continue
+                paper["added"] = datetime.now().isoformat()
+                self._insert_paper(conn, paper)
+            return conn.execute("SELECT COUNT(*) FROM papers").fetchone()[0]
+
+    def compact_papers(self) -> tuple:
+        """Papers are already de-duplicated on insert; see reclaim_space() for the file."""
+        with self._lock:
+            count = self.conn.execute("SELECT COUNT(*) FROM papers").fetchone()[0]
+        return count, count
+
+    def reclaim_space(self):
+        """VACUUM the database. Must run outside batch(): SQLite can't VACUUM in a transaction."""
+        with self._lock:
+            self.conn.execute("VACUUM")
+
+    def merge_papers(self, merges: List[tuple]) -> int:
+        """Replace duplicates with merged entries ((paper, replaced keys) pairs). Returns entries removed."""
+        removed = 0
+        with self.batch() as conn:
+            for paper, keys in merges:
+                key = paper_key(paper)
+                for old_key in keys:
+                    removed += conn.execute("DELETE FROM papers WHERE key = ?", (old_key,)).rowcount
+                conn.execute(
+                    "UPDATE papers SET arxiv_id = ?, title = ?, data = ? WHERE key = ?",
+                    (paper.get("arxiv_id"), paper.get("title"), json.dumps(paper), key),
+                )
+                self._insert_aliases(conn, paper)
+        return removed
+
+    @staticmethod
+    def _insert_paper(conn: sqlite3.Connection, paper: dict):
+        arxiv_id = canonical_arxiv_id(paper.get("arxiv_id")) or canonical_arxiv_id(paper.get("url"))
+        if arxiv_id:
+            paper["arxiv_id"] = arxiv_id
+        conn.execute(
+            "INSERT OR IGNORE INTO papers (url, key, arxiv_id, title, added, data) VALUES (?, ?, ?, ?, ?, ?)",
+            (paper.get("url"), paper_key(paper), paper.get("arxiv_id"), paper.get("title"),
+             paper.get("added"), json.dumps(paper)),
+        )
+        SqliteBackend._insert_aliases(conn, paper)
+
+    @staticmethod
+    def _insert_aliases(conn: sqlite3.Connection, paper: dict):
+        conn.executemany(
+            "INSERT OR REPLACE INTO paper_aliases (alias, key) VALUES (?, ?)",
+            [(alias, paper_key(paper)) for alias in paper.get("aliases", [])],
+        )
+
+    # === Gaps ===
+
+    def list_gaps(self) -> List[dict]:
+        return self._gaps("active")
+
+    def list_resolved_gaps(self) -> List[dict]:
+        return self._gaps("resolved")
+
+    def _gaps(self, status: str) -> List[dict]:
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT data FROM gaps WHERE status = ? ORDER BY pk", (status,)
+            ).fetchall()
+        return [json.loads(r[0]) for r in rows]
+
+    def add_gaps(self, new_gaps: List[dict]) -> int:
+        """Assign IDs to new gaps and make them active. Returns the active count."""
+        with self.batch() as conn:
+            floor = conn.execute("SELECT COALESCE(MAX(gap_id), 0) FROM gaps").fetchone()[0]
+            for gap, gap_id in zip(new_gaps, self.allocate_ids("gaps", len(new_gaps), floor=floor)):
+                gap["id"] = gap_id
+                gap.setdefault("created", datetime.now().isoformat())
+                self._insert_gap(conn, gap, "active")
+            return self._active_count(conn)
+
+    def allocate_ids(self, name: str, count: int, floor: int = 0) -> List[int]:
+        """Allocate count new IDs from a monotonic per-project sequence (see YamlBackend)."""
+        with self.batch() as conn:
+            row = conn.execute("SELECT value FROM sequences WHERE name = ?", (name,)).fetchone()
+            last = max(row[0] if row else 0, floor)
+            conn.execute(
+                "INSERT INTO sequences (name, value) VALUES (?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET value = excluded.value",
+                (name, last + count),
+            )
+        return list(range(last + 1, last + count + 1))
+
+    def resolve_gap(self, gap_id: int, reason: str) -> int:
+        """Move a gap to resolved. Returns the active count."""
+        with self.batch() as conn:
+            row = conn.execute(
+                "SELECT pk, data FROM gaps WHERE status = 'active' AND gap_id = ? ORDER BY pk LIMIT 1",
+                (gap_id,),
+            ).fetchone()
+            if row is None:
+                raise ValueError(f"Gap #{gap_id} not found in active gaps")
+
+            gap = json.loads(row[1])
+            gap["resolved"] = datetime.now().isoformat()
+            gap["resolution"] = reason
+            conn.execute(
+                "UPDATE gaps SET status = 'resolved', resolved = ?, data = ? WHERE pk = ?",
+                (gap["resolved"], json.dumps(gap), row[0]),
+            )
+            return self._active_count(conn)
+
+    @staticmethod
+    def _insert_gap(conn: sqlite3.Connection, gap: dict, status: str):
+        conn.execute(
+            "INSERT INTO gaps (gap_id, status, priority, created, resolved, data) VALUES (?, ?, ?, ?, ?, ?)",
+            (gap.get("id", 0), status, gap.get("priority"), str(gap.get("created", "")),
+             gap.get("resolved"), json.dumps(gap, default=str)),
+        )
+
+    @staticmethod
+    def _active_count(conn: sqlite3.Connection) -> int:
+        return conn.execute("SELECT COUNT(*) FROM gaps WHERE status = 'active'").fetchone()[0]
+
+    # === Responses ===
+
+    def save_response(self, cycle_num: int, question_num: int, question: str, response: dict):
+        with self.batch() as conn:
+            # Blob written inside the write transaction, so gc can't run in between
+            stored = _store_text(self.blobs, response)
+            conn.execute(
+                "INSERT INTO responses (cycle_num, question_num, question, timestamp, data) "
+                "VALUES (?, ?, ?, ?, ?) ON CONFLICT(cycle_num, question_num) DO UPDATE SET "
+                "question = excluded.question, timestamp = excluded.timestamp, data = excluded.data",
+                (cycle_num, question_num, question, response.get("timestamp"), json.dumps(stored)),
+            )
+
+    def iter_responses(self, cycle_nums: Optional[Iterable[int]] = None) -> Iterator[dict]:
+        query = "SELECT cycle_num, question_num, question, data FROM responses"
+        params: list = []
+        if cycle_nums is not None:
+            params = sorted(set(cycle_nums))
+            query += f" WHERE cycle_num IN ({', '.join('?' * len(params))})"
+        with self._lock:
+            rows = self.conn.execute(query + " ORDER BY cycle_num, question_num", params).fetchall()
+        for cycle_num, question_num, question, data in rows:
+            yield {"cycle_num": cycle_num, "question_num": question_num, "question": question,
+                   **_load_text(self.blobs, json.loads(data))}
+
+    def iter_text_refs(self) -> Iterator[tuple]:
+        """(where, ref) for every blob reference held by a response."""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT cycle_num, question_num, data FROM responses ORDER BY cycle_num, question_num"
+            ).fetchall()
+        for cycle_num, question_num, data in rows:
+            ref = json.loads(data).get("text_ref")
+            if is_ref(ref):
+                yield f"{self.DB_FILE} cycle {cycle_num} Q{question_num}", ref
+
+    def pack_responses(self) -> int:
+        """Move inline text of responses saved before the blob store into it."""
+        converted = 0
+        with self.batch() as conn:
+            rows = conn.execute("SELECT cycle_num, question_num, data FROM responses").fetchall()
+            for cycle_num, question_num, data in rows:
+                response = json.loads(data)
+                if "text" not in response:
+                    continue
+                conn.execute(
+                    "UPDATE responses SET data = ? WHERE cycle_num = ? AND question_num = ?",
+                    (json.dumps(_store_text(self.blobs, response)), cycle_num, question_num),
+                )
+                converted += 1
+        return converted
+
+    def count_responses(self, cycle_num: int) -> int:
+        with self._lock:
+            return self.conn.execute(
+                "SELECT COUNT(*) FROM responses WHERE cycle_num = ?", (cycle_num,)
+            ).fetchone()[0]
+
+    # === Cycles ===
+
+    def save_cycle_metadata(self, cycle_num: int, metadata: dict, merge: bool = False):
+        with self.batch() as conn:
+            if merge:
+                row = conn.execute("SELECT data FROM cycles WHERE cycle_num = ?", (cycle_num,)).fetchone()
+                if row:
+                    metadata = {**json.loads(row[0]), **metadata}
+            conn.execute(
+                "INSERT INTO cycles (cycle_num, data) VALUES (?, ?) "
+                "ON CONFLICT(cycle_num) DO UPDATE SET data = excluded.data",
+                (cycle_num, json.dumps(metadata)),
+            )
+
+    def load_cycle_metadata(self, cycle_num: int) -> dict:
+        with self._lock:
+            row = self.conn.execute("SELECT data FROM cycles WHERE cycle_num = ?", (cycle_num,)).fetchone()
+        return json.loads(row[0]) if row else {}
+
+    def list_cycle_metadata(self) -> Dict[int, dict]:
+        with self._lock:
+            rows = self.conn.execute("SELECT cycle_num, data FROM cycles ORDER BY cycle_num").fetchall()
+        return {n: json.loads(d) for n, d in rows}
+
+    # === Bulk conversion ===
+
+    def snapshot(self) -> dict:
+        return {
+            "state": self.load_state(),
+            "papers": self.list_papers(),
+            "gaps": self.list_gaps(),
+            "resolved": self.list_resolved_gaps(),
+            "responses": list(self.iter_responses()),
+            "cycles": self.list_cycle_metadata(),
+        }
+
+    def restore(self, snapshot: dict):
+        with self.batch() as conn:
+            for table in ("state", "papers", "paper_aliases", "gaps", "responses", "cycles"):
+                conn.execute(f"DELETE FROM {table}")
+            if snapshot.get("state") is not None:
+                self.save_state(snapshot["state"])
+            for paper in snapshot["papers"]:
+                self._insert_paper(conn, paper)
+            for gap in snapshot["gaps"]:
+                self._insert_gap(conn, gap, "active")
+            for gap in snapshot["resolved"]:
+                self._insert_gap(conn, gap, "resolved")
+            for record in snapshot["responses"]:
+                response = {k: v for k, v in record.items() if k not in ("cycle_num", "question_num", "question")}
+                self.save_response(record["cycle_num"], record["question_num"], record.get("question", ""), response)
+            for cycle_num, metadata in snapshot["cycles"].items():
+                self.save_cycle_metadata(int(cycle_num), metadata)
+
+
+def open_backend(root: Path, name: str):
+    """Create the named storage backend for a project root."""
+    if name == "sqlite":
+        return SqliteBackend(root)
+    if name == "yaml":
+        return YamlBackend(root)
+    raise ValueError(f"Unknown storage backend '{name}'. Choose from: {', '.join(STORAGE_BACKENDS)}")
@@ -0,0 +1,10 @@
+import pytest
+
+from files.project import ProjectManager
+
+
+@pytest.fixture(params=["yaml", "sqlite"])
+def project(request, tmp_path) -> ProjectManager:
+    """A fresh project on each storage backend."""
+    path = ProjectManager().create_project("proj", str(tmp_path), storage=request.param)
+    return ProjectManager(path)
@@ -0,0 +1,206 @@
+"""
+Tests for batch queries (rv ask --batch, rv cycle -j N).
+
+A fake client stands in for the browser: tabs, conversations and queries
+are counted so concurrency and resume behaviour can be checked without
+Playwright. The launch test drives the real AlphaxivClient over a fake
+async_playwright and is skipped when Playwright isn't installed.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from files import batch
+
+
+class FakeTab:
+    def __init__(self, client, num):
+        self.client = client
+        self.num = num
+        self.conversations = 0
+
+    async def new_conversation(self):
+        self.conversations += 1
+
+    async def query(self, question, timeout_seconds=120):
+        client = self.client
+        client.in_flight += 1
+        client.peak = max(client.peak, client.in_flight)
+        try:
+            await asyncio.sleep(client.latency)
+            if question in client.fail:
+                raise RuntimeError("no answer")
+            client.asked.append(question)
+            return type("Response", (), {"text": f"answer: {question}",
+                                         "papers": [{"title": question, "url": ""}]})()
+        finally:
+            client.in_flight -= 1
+
+    async def close(self):
+        self.client.closed += 1
+
+
+class FakeClient(FakeTab):
+    def __init__(self, latency=0.01, fail=()):
+        super().__init__(self, 0)
+        self.latency = latency
+        self.fail = set(fail)
+        self.asked = []
+        self.tabs = [self]
+        self.in_flight = 0
+        self.peak = 0
+        self.closed = 0
+
+    async def open_tab(self):
+        tab = FakeTab(self, len(self.tabs))
+        self.tabs.append(tab)
+        return tab
+
+
+def _run(client, questions, **kwargs):
+    records = []
+    summary = asyncio.run(batch.run_batch(client, questions, records.append, **kwargs))
+    return summary, records
+
+
+def test_concurrency_and_order():
+    client = FakeClient()
+    questions = [f"question {n}" for n in range(7)]
+    summary, records = _run(client, questions, concurrency=3)
+
+    assert (summary.answered, summary.failed) == (7, 0)
+    assert sorted(r.index for r in records) == list(range(7))
+    assert all(r.text == f"answer: {questions[r.index]}" for r in records)
+    assert client.peak == 3 and len(client.tabs) == 3
+    assert client.closed == 2  # The extra tabs, not the session itself
+    assert {r.tab for r in records} == {0, 1, 2}
+
+
+def test_no_more_tabs_than_questions():
+    client = FakeClient()
+    _run(client, ["a?", "b?"], concurrency=4)
+    assert len(client.tabs) == 2
+
+
+def test_conversations():
+    client = FakeClient()
+    _run(client, [f"q{n}" for n in range(6)], concurrency=2, fresh_conversations=False)
+    assert [tab.conversations for tab in client.tabs] == [1, 1]
+
+    client = FakeClient()
+    _run(client, [f"q{n}" for n in range(6)], concurrency=2)
+    assert sum(tab.conversations for tab in client.tabs) == 6
+
+
+def test_failures_are_recorded():
+    client = FakeClient(fail={"bad?"})
+    summary, records = _run(client, ["good?", "bad?"], concurrency=2)
+    assert (summary.answered, summary.failed) == (1, 1)
+    failed = [r for r in records if r.error]
+    assert len(failed) == 1 and failed[0].question == "bad?"
+    assert "RuntimeError" in failed[0].error
+    assert "error" in json.loads(failed[0].to_json())
+    assert "error" not in json.loads(next(r for r in records if not r.error).to_json())
+
+
+def test_resume(tmp_path):
+    output = tmp_path / "answers.jsonl"
+    questions = ["one?", "two?", "three?", "four?"]
+
+    client = FakeClient(fail={"three?"})
+    sink = batch.file_sink(output)
+    asyncio.run(batch.run_batch(client, questions[:3], sink, concurrency=2))
+    with open(output, "a") as f:
+        f.write('{"index": 3, "question": "four?", "te')  # Interrupted write
+
+    done = batch.answered_questions(output)
+    assert done == {"one?", "two?"}  # Failed and torn records are asked again
+    assert output.read_text().endswith("\n")
+
+    client = FakeClient()
+    summary = asyncio.run(batch.run_batch(client, questions, sink, concurrency=2, skip=done))
+    assert summary.skipped == 2 and sorted(client.asked) == ["four?", "three?"]
+    lines = [json.loads(line) for line in output.read_text().splitlines()]
+    assert batch.answered_questions(output) == set(questions)
+    assert len(lines) == 5
+
+
+def test_read_questions(tmp_path):
+    path = tmp_path / "questions.txt"
+    path.write_text("# header\nfirst?\n\n  second?  \nfirst?\n")
+    assert batch.read_questions(str(path)) == ["first?", "second?"]
+
+
+class _FakePlaywright:
+    """async_playwright() stand-in that counts browser launches."""
+
+    def __init__(self):
+        self.launches = 0
+        self.chromium = self
+
+    def __call__(self):
+        return self
+
+    async def start(self):
+        return self
+
+    async def stop(self):
+        pass
+
+    async def launch_persistent_context(self, user_data_dir, **kwargs):
+        self.launches += 1
+        await asyncio.sleep(0.05)  # Launching takes a while; other workers get to run
+        return _FakeContext()
+
+
+class _FakeContext:
+    def __init__(self):
+        self.pages = []
+
+    async def new_page(self):
+        page = _FakePage()
+        self.pages.append(page)
+        return page
+
+    async def close(self):
+        pass
+
+
+class _FakePage:
+    url = "about:blank"
+
+    async def goto(self, url):
+        self.url = url
+
+    async def wait_for_selector(self, selector, **kwargs):
+        return self  # Every element "exists"
+
+    async def close(self):
+        pass
+
+
+def test_browser_launched_once(tmp_path, monkeypatch):
+    pytest.importorskip("playwright")
+    from files import alphaxiv
+
+    playwright = _FakePlaywright()
+    monkeypatch.setattr(alphaxiv, "async_playwright", playwright)
+
+    async def query(self, question, timeout_seconds=120):
+        return alphaxiv.AlphaxivResponse(text=question)
+
+    monkeypatch.setattr(alphaxiv.AlphaxivClient, "query", query)
+    client = alphaxiv.AlphaxivClient(headless=True, profile_dir=tmp_path / "profile")
+
+    async def run():
+        try:
+            return await batch.run_batch(client, ["a?", "b?", "c?"], lambda r: None,
+                                         concurrency=3, fresh_conversations=False)
+        finally:
+            await client.close()
+
+    summary = asyncio.run(run())
+    assert summary.answered == 3
+    assert playwright.launches == 1
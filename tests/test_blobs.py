@@ -0,0 +1,29 @@
+"""
+Tests for the response blob store: text comes back exactly as received.
+"""
+
+from files.blobs import BlobStore
+
+
+TEXT = "\nFirst line with a hard break  \nsecond line\r\n\n- item\t\n\n"
+
+
+def test_put_keeps_text_exactly(tmp_path):
+    blobs = BlobStore(tmp_path)
+    ref = blobs.put(TEXT)
+    assert blobs.get(ref) == TEXT
+    assert blobs.put(TEXT) == ref  # Repeated answers share a blob
+    assert blobs.put(TEXT.strip()) != ref
+    assert blobs.verify(ref)
+
+
+def test_response_round_trip(project):
+    project.save_cycle_response(1, 1, "why?", {"text": TEXT, "papers": [], "timestamp": "now"})
+    project.save_cycle_response(1, 2, "why again?", {"text": TEXT, "papers": [], "timestamp": "now"})
+    responses = list(project.iter_responses([1]))
+    assert [r["text"] for r in responses] == [TEXT, TEXT]
+    assert len(list(project.blobs.refs())) == 1
+
+    markdown = (project.root / "research" / "cycle-001" / "responses" / "q01-response.md")
+    if markdown.exists():  # YAML projects keep a readable copy with a preview
+        assert "Full text: `sha256:" in markdown.read_text()
@@ -0,0 +1,121 @@
+"""
+Tests for `rv cycle`: numbering, re-asking unanswered questions, -j N,
+and keeping response writes off the event loop.
+"""
+
+import asyncio
+import sys
+import threading
+
+import pytest
+
+pytest.importorskip("playwright")
+
+from files import cli  # noqa: E402
+from files.alphaxiv import AlphaxivResponse  # noqa: E402
+from files.project import ProjectManager  # noqa: E402
+
+
+class FakeClient:
+    """Stands in for AlphaxivClient; questions in `fail` raise."""
+
+    fail = set()
+    asked = []
+
+    def __init__(self, headless=False, debug=False):
+        pass
+
+    async def open_tab(self):
+        return FakeClient()
+
+    async def new_conversation(self):
+        pass
+
+    async def query(self, question, timeout_seconds=120):
+        await asyncio.sleep(0.01)
+        if question in self.fail:
+            raise RuntimeError("no answer")
+        FakeClient.asked.append(question)
+        n = len(FakeClient.asked)
+        return AlphaxivResponse(text=f"answer to {question}", papers=[
+            {"title": f"Paper {n}", "url": f"https://arxiv.org/abs/2401.{n:05d}"}])
+
+    async def close(self):
+        pass
+
+
+@pytest.fixture
+def rv(project, monkeypatch):
+    monkeypatch.chdir(project.root)
+    monkeypatch.setattr(cli, "AlphaxivClient", FakeClient)
+    monkeypatch.setattr(FakeClient, "fail", set())
+    monkeypatch.setattr(FakeClient, "asked", [])
+
+    def run(*argv):
+        monkeypatch.setattr(sys, "argv", ["rv", "cycle", *argv])
+        try:
+            cli.main()
+        except SystemExit as e:
+            return e.code
+        return 0
+
+    return run
+
+
+def _answered(cycle_num):
+    return sorted(r["question_num"] for r in ProjectManager().iter_responses([cycle_num]))
+
+
+def test_failed_questions_are_filled_on_rerun(rv, monkeypatch, capsys):
+    FakeClient.fail = {"why b?"}
+    assert rv("why a?", "why b?", "why c?") == 1
+    pm = ProjectManager()
+    assert pm.get_cycle_questions(1) == ["why a?", "why b?", "why c?"]
+    assert _answered(1) == [1, 3]
+    assert "rerun `rv cycle -n 1`" in capsys.readouterr().out
+
+    FakeClient.fail = set()
+    assert rv("-n", "1") == 0
+    assert FakeClient.asked[-1] == "why b?"
+    assert ProjectManager().get_cycle_questions(1) == ["why a?", "why b?", "why c?"]
+    assert _answered(1) == [1, 2, 3]
+
+    # Asking a failed question again by name also fills its slot
+    FakeClient.fail = {"why d?"}
+    rv("why d?", "-n", "1")
+    FakeClient.fail = set()
+    assert rv("why e?", "why d?", "-n", "1") == 0
+    assert ProjectManager().get_cycle_questions(1) == ["why a?", "why b?", "why c?", "why d?", "why e?"]
+    assert _answered(1) == [1, 2, 3, 4, 5]
+
+
+def test_unquoted_question_is_rejected(rv, capsys):
+    assert rv("what", "is", "attention") == 1
+    assert 'rv cycle "what is attention"' in capsys.readouterr().out
+    assert FakeClient.asked == []
+    assert ProjectManager().get_cycle_questions(1) == []
+
+
+def test_parallel_tabs(rv):
+    questions = [f"question {n}?" for n in range(1, 6)]
+    assert rv(*questions, "-j", "3") == 0
+    pm = ProjectManager()
+    assert pm.get_cycle_questions(1) == questions
+    responses = {r["question_num"]: r for r in pm.iter_responses([1])}
+    assert sorted(responses) == [1, 2, 3, 4, 5]
+    assert all(responses[n]["question"] == questions[n - 1] for n in responses)
+    assert len(pm.get_papers()) == 5
+    assert pm.state.total_cycles_completed == 1
+
+
+def test_writes_run_off_the_event_loop(rv, monkeypatch):
+    threads = []
+    save = ProjectManager.save_cycle_response
+
+    def recording(self, *args, **kwargs):
+        threads.append(threading.current_thread().name)
+        return save(self, *args, **kwargs)
+
+    monkeypatch.setattr(ProjectManager, "save_cycle_response", recording)
+    assert rv("why a?", "why b?", "-j", "2") == 0
+    assert threads == ["rv-writer", "rv-writer"]
@@ -0,0 +1,240 @@
+"""
+Tests for rv papers fetch against the mock server's /pdf route.
+
+Covers Range resume (If-Range on the .part's ETag), the 416 restart,
+bodies cut short by the server, rejecting responses that aren't PDFs,
+the per-host rate limit, the offline mirror and the manifest (skip and
+--verify).
+"""
+
+import asyncio
+import hashlib
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from files.downloads import (
+    HostRateLimiter,
+    PaperFetcher,
+    download_targets,
+    pdf_filename,
+)
+from files.mock_server import MockAlphaxivServer, MockConfig
+
+
+@pytest.fixture(scope="module")
+def server():
+    with MockAlphaxivServer(MockConfig(pdf_pages=2)) as server:
+        yield server
+
+
+def _etag(body: bytes) -> str:
+    return '"%s"' % hashlib.sha256(body).hexdigest()[:16]
+
+
+def _fetch(directory, targets, verify=False, **kwargs):
+    kwargs.setdefault("rate", 0)
+    fetcher = PaperFetcher(directory, retries=0, timeout=10, **kwargs)
+    return asyncio.run(fetcher.fetch(targets, verify=verify))
+
+
+def _write_part(directory, arxiv_id, data: bytes, etag: str):
+    directory.mkdir(parents=True, exist_ok=True)
+    part = directory / (pdf_filename(arxiv_id) + ".part")
+    part.write_bytes(data)
+    (directory / (part.name + ".json")).write_text(json.dumps({"etag": etag, "last_modified": None}))
+    return part
+
+
+def test_download(server, tmp_path):
+    targets = download_targets([{"arxiv_id": "2401.00001"}, {"url": "https://arxiv.org/abs/2401.00002v2"}],
+                               base_url=server.pdf_url)
+    result = _fetch(tmp_path, targets)
+    assert (result.downloaded, result.resumed, result.failed) == (2, 0, [])
+    for arxiv_id in ("2401.00001", "2401.00002"):
+        assert (tmp_path / f"{arxiv_id}.pdf").read_bytes() == server.make_paper_pdf(arxiv_id)
+    assert not list(tmp_path.glob("*.part*"))
+
+
+def test_range_resume(server, tmp_path):
+    body = server.make_paper_pdf("2402.00001")
+    _write_part(tmp_path, "2402.00001", body[:100], _etag(body))
+    result = _fetch(tmp_path, download_targets([{"arxiv_id": "2402.00001"}], base_url=server.pdf_url))
+    assert (result.downloaded, result.resumed) == (1, 1)
+    assert result.bytes == len(body)
+    assert (tmp_path / "2402.00001.pdf").read_bytes() == body
+
+
+def test_changed_etag_restarts(server, tmp_path):
+    body = server.make_paper_pdf("2402.00002")
+    # A .part of an older version of the file: If-Range fails, the server sends it all
+    _write_part(tmp_path, "2402.00002", b"%PDF-old version" * 10, '"stale"')
+    result = _fetch(tmp_path, download_targets([{"arxiv_id": "2402.00002"}], base_url=server.pdf_url))
+    assert (result.downloaded, result.resumed) == (1, 0)
+    assert (tmp_path / "2402.00002.pdf").read_bytes() == body
+
+
+def test_range_not_satisfiable_restarts(server, tmp_path):
+    body = server.make_paper_pdf("2402.00003")
+    # A complete .part that was never renamed: the server answers 416
+    _write_part(tmp_path, "2402.00003", body, _etag(body))
+    requests = server.pdf_requests
+    result = _fetch(tmp_path, download_targets([{"arxiv_id": "2402.00003"}], base_url=server.pdf_url))
+    assert (result.downloaded, result.resumed, result.failed) == (1, 0, [])
+    assert server.pdf_requests - requests == 2
+    assert (tmp_path / "2402.00003.pdf").read_bytes() == body
+
+
+def test_rejects_non_pdf(server, tmp_path):
+    # The assistant route answers with the HTML chat page
+    targets = download_targets([{"arxiv_id": "2402.00004"}], base_url=server.url)
+    result = _fetch(tmp_path, targets)
+    assert result.downloaded == 0
+    assert len(result.failed) == 1 and "not a PDF" in result.failed[0][1]
+    assert not list(tmp_path.glob("2402.00004*"))
+    assert "2402.00004" not in json.loads((tmp_path / "manifest.json").read_text())["files"]
+
+
+def test_host_rate_limiter():
+    async def starts(limiter, hosts):
+        loop = asyncio.get_running_loop()
+        begin = loop.time()
+
+        async def one(host):
+            await limiter.wait(host)
+            return loop.time() - begin
+
+        return await asyncio.gather(*(one(host) for host in hosts))
+
+    times = asyncio.run(starts(HostRateLimiter(rate=20), ["a", "a", "a", "b"]))
+    assert times[1] >= 0.05 - 0.01 and times[2] >= 0.10 - 0.01
+    assert times[3] < 0.04  # Another host isn't held back
+    assert max(asyncio.run(starts(HostRateLimiter(rate=0), ["a"] * 5))) < 0.04
+
+
+def test_fetch_respects_rate_limit(server, tmp_path):
+    targets = download_targets([{"arxiv_id": f"2403.0000{n}"} for n in range(1, 4)],
+                               base_url=server.pdf_url)
+    result = _fetch(tmp_path, targets, rate=10, concurrency=3)
+    assert result.downloaded == 3
+    assert result.wall_seconds >= 0.2 - 0.01  # Three requests to one host, 0.1 s apart
+
+
+def test_offline_mirror(server, tmp_path):
+    mirror = tmp_path / "mirror"
+    (mirror / "hep-th").mkdir(parents=True)
+    (mirror / "2404.00001.pdf").write_bytes(server.make_paper_pdf("2404.00001"))
+    (mirror / "hep-th" / "9901001.pdf").write_bytes(server.make_paper_pdf("hep-th/9901001"))
+    (mirror / "2404.00003.pdf").write_bytes(b"<html>not a pdf</html>")
+
+    targets = download_targets([{"arxiv_id": a} for a in
+                                ("2404.00001", "hep-th/9901001", "2404.00002", "2404.00003")],
+                               base_url=server.pdf_url)
+    requests = server.pdf_requests
+    result = _fetch(tmp_path / "downloads", targets, mirror=mirror, offline=True)
+
+    assert server.pdf_requests == requests
+    assert result.from_mirror == 2 and result.downloaded == 0
+    failed = dict(result.failed)
+    assert "offline" in failed["2404.00002"]
+    assert "not a PDF" in failed["2404.00003"]
+    assert (tmp_path / "downloads" / "hep-th_9901001.pdf").read_bytes() == \
+        server.make_paper_pdf("hep-th/9901001")
+    manifest = json.loads((tmp_path / "downloads" / "manifest.json").read_text())["files"]
+    assert manifest["2404.00001"]["source"] == "mirror"
+
+
+def test_manifest_skip_and_verify(server, tmp_path):
+    targets = download_targets([{"arxiv_id": "2405.00001"}, {"arxiv_id": "2405.00002"}],
+                               base_url=server.pdf_url)
+    assert _fetch(tmp_path, targets).downloaded == 2
+
+    requests = server.pdf_requests
+    result = _fetch(tmp_path, targets)
+    assert (result.skipped, result.downloaded) == (2, 0)
+    assert server.pdf_requests == requests
+
+    # Same size, different bytes: only --verify notices
+    path = tmp_path / "2405.00001.pdf"
+    data = bytearray(path.read_bytes())
+    data[-20] ^= 0xFF
+    path.write_bytes(bytes(data))
+    assert _fetch(tmp_path, targets).skipped == 2
+
+    result = _fetch(tmp_path, targets, verify=True)
+    assert (result.skipped, result.downloaded) == (1, 1)
+    assert path.read_bytes() == server.make_paper_pdf("2405.00001")
+    manifest = json.loads((tmp_path / "manifest.json").read_text())["files"]
+    assert manifest["2405.00001"]["sha256"] == hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+class _TruncatingServer:
+    """Serves one PDF, cutting the first full response short after `cut` bytes."""
+
+    def __init__(self, body: bytes, cut: int):
+        self.body = body
+        self.cut = cut
+        self.requests = []
+        outer = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                outer.requests.append(self.headers.get("Range"))
+                body, status = outer.body, 200
+                match = re.fullmatch(r"bytes=(\d+)-", self.headers.get("Range", ""))
+                if match and self.headers.get("If-Range") in (None, _etag(body)):
+                    start = int(match.group(1))
+                    body, status = body[start:], 206
+                self.send_response(status)
+                self.send_header("Content-Type", "application/pdf")
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("ETag", _etag(outer.body))
+                if status == 206:
+                    self.send_header("Content-Range",
+                                     f"bytes {start}-{len(outer.body) - 1}/{len(outer.body)}")
+                self.end_headers()
+                if status == 200 and len(outer.requests) == 1:
+                    self.wfile.write(body[:outer.cut])
+                    self.close_connection = True
+                else:
+                    self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    @property
+    def pdf_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/pdf/"
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def test_truncated_body_is_resumed(server, tmp_path):
+    body = server.make_paper_pdf("2406.00001")
+    truncating = _TruncatingServer(body, cut=1000)
+    try:
+        targets = download_targets([{"arxiv_id": "2406.00001"}], base_url=truncating.pdf_url)
+        result = _fetch(tmp_path, targets)
+        assert result.downloaded == 0
+        assert "incomplete download (1000 of" in result.failed[0][1]
+        assert not (tmp_path / "2406.00001.pdf").exists()
+        assert (tmp_path / "2406.00001.pdf.part").stat().st_size == 1000
+        assert "2406.00001" not in json.loads((tmp_path / "manifest.json").read_text())["files"]
+
+        result = _fetch(tmp_path, targets)
+        assert (result.downloaded, result.resumed) == (1, 1)
+        assert truncating.requests == [None, "bytes=1000-"]
+        assert (tmp_path / "2406.00001.pdf").read_bytes() == body
+    finally:
+        truncating.close()
@@ -0,0 +1,78 @@
+"""
+Tests for paper full text: chunking, and incremental extraction that only
+re-reads PDFs whose checksum changed.
+"""
+
+import pytest
+
+from files.fulltext import FullTextIndex, chunk_pages, extractor_name
+from files.mock_server import make_pdf
+
+
+def _words(n, prefix="w"):
+    return " ".join(f"{prefix}{i}" for i in range(n))
+
+
+def test_chunk_sizes_and_overlap():
+    chunks = chunk_pages([_words(450)], words=200, overlap=40)
+    assert [c.seq for c in chunks] == [0, 1, 2]
+    assert [len(c.text.split()) for c in chunks] == [200, 200, 130]
+    # Each chunk starts with the last 40 words of the previous one
+    assert chunks[1].text.split()[:40] == chunks[0].text.split()[-40:]
+    assert chunks[-1].text.split()[-1] == "w449"
+
+
+def test_chunk_pages_and_hyphenation():
+    pages = [_words(150, "a"), "trans-\nformer " + _words(150, "b"), ""]
+    chunks = chunk_pages(pages, words=100, overlap=20)
+    assert [c.page for c in chunks] == [1, 1, 2, 2]
+    assert "transformer" in chunks[1].text.split()
+    assert chunk_pages([]) == [] and chunk_pages(["", " "]) == []
+
+
+def test_short_text_is_one_chunk():
+    chunks = chunk_pages(["just a few words"])
+    assert len(chunks) == 1 and chunks[0].text == "just a few words" and chunks[0].page == 1
+
+
+needs_extractor = pytest.mark.skipif(extractor_name() is None,
+                                     reason="needs pypdf or pdftotext")
+
+
+def _write_pdf(downloads, arxiv_id, marker):
+    downloads.mkdir(parents=True, exist_ok=True)
+    pages = [[f"arXiv:{arxiv_id}", f"{marker} {_words(12)}"], [_words(30, marker)]]
+    (downloads / f"{arxiv_id}.pdf").write_bytes(make_pdf(pages))
+
+
+@needs_extractor
+def test_incremental_extraction(project):
+    index = FullTextIndex(project)
+    downloads = index.downloads_dir
+    _write_pdf(downloads, "2401.00001", "alpha")
+    _write_pdf(downloads, "2401.00002", "beta")
+    (downloads / "2401.00003.pdf").write_bytes(b"%PDF-1.4 broken")
+
+    result = index.extract(jobs=2)
+    assert (result.extracted, result.unchanged, len(result.failed)) == (2, 0, 1)
+    assert index.keys() == ["2401.00001", "2401.00002"]
+    assert "alpha" in index.chunks("2401.00001")[0].text
+    assert index.stats()["pages"] == 4 and index.stats()["failed"] == 1
+
+    # Nothing changed: nothing is read again, the broken PDF included
+    result = index.extract(jobs=2)
+    assert (result.extracted, result.unchanged, result.failed) == (0, 3, [])
+
+    # A changed PDF is extracted again; a deleted one is dropped
+    _write_pdf(downloads, "2401.00001", "gamma")
+    (downloads / "2401.00002.pdf").unlink()
+    result = index.extract(jobs=2)
+    assert (result.extracted, result.unchanged, result.removed) == (1, 1, 1)
+    assert index.keys() == ["2401.00001"]
+    text = " ".join(c.text for c in index.chunks("arxiv.org/abs/2401.00001v2"))
+    assert "gamma" in text and "alpha" not in text
+
+    # force re-reads everything still on disk
+    result = index.extract(jobs=1, force=True)
+    assert result.extracted == 1 and len(result.failed) == 1
+    index.close()
@@ -0,0 +1,158 @@
+"""
+Smoke tests for the mock Alphaxiv server used by rv bench.
+
+The page's static source (including the <template>s answers are cloned
+from) must offer an element for every selector group in page_selectors.py,
+so a selector change or a mock page edit that would break the e2e benchmark
+fails here without needing a browser (or Playwright).
+"""
+
+import json
+import re
+import urllib.request
+from html.parser import HTMLParser
+
+import pytest
+
+from files.mock_server import MockAlphaxivServer, MockConfig
+from files.page_selectors import SELECTOR_FALLBACKS
+
+
+class Element:
+    def __init__(self, tag: str, attrs: dict, parent: "Element" = None):
+        self.tag = tag
+        self.attrs = attrs
+        self.parent = parent
+        self.children = []
+        self.text = ""
+
+    def iter(self):
+        yield self
+        for child in self.children:
+            yield from child.iter()
+
+    def all_text(self) -> str:
+        return self.text + "".join(child.all_text() for child in self.children)
+
+
+class TreeBuilder(HTMLParser):
+    VOID = {"meta", "input", "br", "img", "link", "hr"}
+
+    def __init__(self):
+        super().__init__()
+        self.root = Element("#document", {})
+        self.current = self.root
+
+    def handle_starttag(self, tag, attrs):
+        element = Element(tag, {k: v or "" for k, v in attrs}, self.current)
+        self.current.children.append(element)
+        if tag not in self.VOID:
+            self.current = element
+
+    def handle_endtag(self, tag):
+        node = self.current
+        while node is not self.root and node.tag != tag:
+            node = node.parent
+        if node is not self.root:
+            self.current = node.parent
+
+    def handle_data(self, data):
+        if self.current.tag not in ("script", "style"):
+            self.current.text += data
+
+
+_PART = re.compile(
+    r"""\.(?P<cls>[\w-]+)"""
+    r"""|\[(?P<attr>[\w-]+)(?:(?P<op>[*^$]?=)(?P<q>["'])(?P<value>.*?)(?P=q)(?P<icase>\s+i)?)?\]"""
+    r"""|:not\((?P<not>[^()]*)\)"""
+    r"""|:has\((?P<has>[\w-]+)\)"""
+    r"""|:has-text\((?P<tq>["'])(?P<text>.*?)(?P=tq)\)"""
+)
+
+
+def _compound_matches(element: Element, compound: str) -> bool:
+    tag = re.match(r"[a-z][\w-]*", compound)
+    if tag and element.tag != tag.group():
+        return False
+    rest = compound[tag.end():] if tag else compound
+
+    pos = 0
+    while pos < len(rest):
+        part = _PART.match(rest, pos)
+        if part is None:
+            raise ValueError(f"Unsupported selector syntax: {compound!r}")
+        pos = part.end()
+        if part["cls"] is not None:
+            if part["cls"] not in element.attrs.get("class", "").split():
+                return False
+        elif part["attr"] is not None:
+            if part["attr"] not in element.attrs:
+                return False
+            if part["op"]:
+                actual, wanted = element.attrs[part["attr"]], part["value"]
+                if part["icase"]:
+                    actual, wanted = actual.lower(), wanted.lower()
+                if part["op"] == "=" and actual != wanted:
+                    return False
+                if part["op"] == "*=" and wanted not in actual:
+                    return False
+        elif part["not"] is not None:
+            if _compound_matches(element, part["not"]):
+                return False
+        elif part["has"] is not None:
+            if not any(e.tag == part["has"] for e in element.iter() if e is not element):
+                return False
+        elif part["text"] is not None:
+            if part["text"].lower() not in element.all_text().lower():
+                return False
+    return True
+
+
+def select(root: Element, selector: str) -> list:
+    """Elements matching a CSS/Playwright selector (the subset AlphaxivClient uses)."""
+    compounds = re.findall(r"(?:[^\s\[(]|\[[^\]]*\]|\([^)]*\))+", selector)
+    matches = []
+    for element in root.iter():
+        if not _compound_matches(element, compounds[-1]):
+            continue
+        ancestor, wanted = element.parent, list(compounds[:-1])
+        while wanted and ancestor is not None:
+            if _compound_matches(ancestor, wanted[-1]):
+                wanted.pop()
+            ancestor = ancestor.parent
+        if not wanted:
+            matches.append(element)
+    return matches
+
+
+@pytest.fixture(scope="module")
+def server():
+    with MockAlphaxivServer(MockConfig(first_token_delay=0)) as server:
+        yield server
+
+
+@pytest.fixture(scope="module")
+def page(server):
+    with urllib.request.urlopen(server.url) as response:
+        html = response.read().decode("utf-8")
+    builder = TreeBuilder()
+    builder.feed(html)
+    return builder.root
+
+
+@pytest.mark.parametrize("group", sorted(SELECTOR_FALLBACKS))
+def test_selector_group_resolves(page, group):
+    selectors = SELECTOR_FALLBACKS[group]
+    assert any(select(page, selector) for selector in selectors), \
+        f"No {group} selector matches the mock page: {selectors}"
+
+
+def test_answer_api(server):
+    request = urllib.request.Request(server.url.rsplit("/", 1)[0] + "/api/answer",
+                                     data=json.dumps({"question": "why"}).encode(), method="POST")
+    with urllib.request.urlopen(request) as response:
+        answer = json.loads(response.read())
+    assert len(answer["text"]) >= server.config.answer_chars
+    assert len(answer["papers"]) == server.config.papers_per_answer
+    assert all(re.search(r"arxiv\.org/abs/\d{4}\.\d{5}$", p["url"]) for p in answer["papers"])
+    assert server.queries == 1
@@ -0,0 +1,128 @@
+"""
+Tests for AsyncPersistence: FIFO order on the writer thread, coalescing of
+adjacent state/paper updates, per-op retry when one write in a batch fails,
+and ordered reads outside the batch transaction.
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from files.persistence import AsyncPersistence
+from files.project import ProjectManager
+
+
+class Held:
+    """Blocks the writer thread so the writes queued meanwhile drain as one batch."""
+
+    def __init__(self, persistence: AsyncPersistence):
+        self.started = threading.Event()
+        self.release = threading.Event()
+        persistence.submit(self._hold)
+        self.started.wait()
+
+    def _hold(self):
+        self.started.set()
+        self.release.wait()
+
+
+def _descriptions(pm: ProjectManager):
+    return [gap["description"] for gap in pm.get_active_gaps() if gap.get("description")]
+
+
+def test_fifo_order_and_ordered_reads(project):
+    persistence = AsyncPersistence(project)
+    seen = []
+
+    async def run():
+        for n in range(20):
+            persistence.submit(seen.append, n)
+        # run() observes every write queued before it, outside any transaction
+        snapshot = await persistence.run(lambda: (list(seen), project._txn_depth,
+                                                  threading.current_thread().name))
+        await persistence.close()
+        return snapshot
+
+    written, depth, thread = asyncio.run(run())
+    assert written == list(range(20)) and seen == list(range(20))
+    assert depth == 0 and thread == "rv-writer"
+
+
+def test_coalescing(project, monkeypatch):
+    persistence = AsyncPersistence(project)
+    calls = []
+    update_state, update_papers = ProjectManager.update_state, ProjectManager._update_papers
+
+    def counting_state(self, **kwargs):
+        calls.append(("state", kwargs))
+        return update_state(self, **kwargs)
+
+    def counting_papers(self, papers):
+        calls.append(("papers", len(papers)))
+        return update_papers(self, papers)
+
+    monkeypatch.setattr(ProjectManager, "update_state", counting_state)
+    monkeypatch.setattr(ProjectManager, "_update_papers", counting_papers)
+
+    async def run():
+        held = Held(persistence)
+        futures = [
+            persistence.update_state(current_cycle=1),
+            persistence.update_state(current_cycle=2, current_phase="integrative"),
+            persistence.update_papers([{"title": "A", "url": "https://arxiv.org/abs/2401.00001"}]),
+            persistence.update_papers([{"title": "B", "url": "https://arxiv.org/abs/2401.00002"}]),
+            persistence.update_papers([{"title": "C", "url": "https://arxiv.org/abs/2401.00003"}]),
+        ]
+        held.release.set()
+        await persistence.close()
+        return futures
+
+    futures = asyncio.run(run())
+    assert calls[0] == ("state", {"current_cycle": 2, "current_phase": "integrative"})
+    assert [call for call in calls if call[0] == "papers"] == [("papers", 3)]
+    assert all(f.done() and f.exception() is None for f in futures)
+    reopened = ProjectManager(project.root)
+    assert (reopened.state.current_cycle, reopened.state.current_phase) == (2, "integrative")
+    assert len(reopened.get_papers()) == 3
+
+
+def test_failed_write_is_isolated(project):
+    persistence = AsyncPersistence(project)
+
+    def bad():
+        project.add_gap("half written")
+        raise ValueError("bad write")
+
+    async def run():
+        held = Held(persistence)
+        good = persistence.submit(project.add_gap, "first")
+        failed = persistence.submit(bad)
+        later = persistence.submit(project.add_gap, "second")
+        held.release.set()
+        with pytest.raises(ValueError):
+            await persistence.flush()
+        await persistence.flush()  # The error is reported once
+        await persistence.close()
+        return good, failed, later
+
+    good, failed, later = asyncio.run(run())
+    assert good.exception() is None and later.exception() is None
+    assert isinstance(failed.exception(), ValueError)
+    assert _descriptions(project) == ["first", "second"]
+    assert _descriptions(ProjectManager(project.root)) == ["first", "second"]
+
+
+def test_awaited_errors_go_to_the_caller(project):
+    persistence = AsyncPersistence(project)
+
+    def boom():
+        raise KeyError("missing")
+
+    async def run():
+        with pytest.raises(KeyError):
+            await persistence.run(boom)
+        await persistence.flush()  # Not also reported at flush()
+        await persistence.close()
+
+    asyncio.run(run())
@@ -0,0 +1,123 @@
+"""
+Tests for ProjectManager transactions: rollback, after-commit hooks, and
+how AsyncPersistence batches behave when a hook or the commit fails.
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from files.persistence import AsyncPersistence
+from files.project import ProjectManager
+from files.recap import RecapView
+
+
+def _descriptions(pm: ProjectManager):
+    return [gap["description"] for gap in pm.get_active_gaps() if gap.get("description")]
+
+
+def _fail_once(monkeypatch, cls, name, error=OSError("disk full")):
+    """Make cls.name raise error on its first call only."""
+    original = getattr(cls, name)
+    calls = []
+
+    def patched(self, *args, **kwargs):
+        calls.append(args)
+        if len(calls) == 1:
+            raise error
+        return original(self, *args, **kwargs)
+
+    monkeypatch.setattr(cls, name, patched)
+    return calls
+
+
+def test_rollback(project):
+    gaps_count = project.state.gaps_count
+    hooks = []
+    with pytest.raises(RuntimeError):
+        with project.transaction():
+            project.add_gap("never saved")
+            project.update_state(current_phase="integrative")
+            project._after_commit(hooks.append, "hook")
+            raise RuntimeError("abort")
+
+    assert hooks == []
+    assert _descriptions(project) == []
+    assert project.state.current_phase == "expansive"
+    reopened = ProjectManager(project.root)
+    assert _descriptions(reopened) == [] and reopened.state.gaps_count == gaps_count
+
+
+def test_hooks_run_after_commit(project):
+    hooks = []
+    with project.transaction():
+        project._after_commit(hooks.append, "first")
+        with project.transaction():  # Nested transactions join the outer one
+            project._after_commit(hooks.append, "second")
+        assert hooks == []
+    assert hooks == ["first", "second"]
+
+    project._after_commit(hooks.append, "now")  # Outside a transaction
+    assert hooks[-1] == "now"
+
+
+def test_failing_hook_keeps_commit(project, monkeypatch, capsys):
+    _fail_once(monkeypatch, RecapView, "gaps_added")
+    hooks = []
+    with project.transaction():
+        project._update_gaps([{"description": "g1"}])
+        project._after_commit(hooks.append, "later")
+
+    assert _descriptions(project) == ["g1"]
+    assert hooks == ["later"]  # Hooks after the failing one still run
+    out = capsys.readouterr().out
+    assert "RecapView not updated (OSError: disk full)" in out
+    assert "delete .research-recap.json" in out
+
+
+def test_failing_hook_does_not_duplicate_persisted_writes(project, monkeypatch, capsys):
+    calls = _fail_once(monkeypatch, RecapView, "gaps_added")
+    gaps_count = len(project.get_active_gaps())
+    persistence = AsyncPersistence(project)
+
+    async def run():
+        persistence.submit(project._update_gaps, [{"description": "g1"}])
+        persistence.submit(project._update_gaps, [{"description": "g2"}])
+        await persistence.close()
+
+    asyncio.run(run())
+    assert _descriptions(project) == ["g1", "g2"]
+    assert len(calls) == 2
+    assert ProjectManager(project.root).state.gaps_count == gaps_count + 2
+
+
+def test_commit_failure_is_not_retried(project, monkeypatch):
+    persistence = AsyncPersistence(project)
+    _fail_once(monkeypatch, type(project.backend), "save_state")
+    applied = []
+    started, release = threading.Event(), threading.Event()
+
+    def hold():
+        started.set()
+        release.wait()
+
+    def write(name):
+        applied.append(name)
+        project.update_state(current_phase=name)
+
+    async def run():
+        # Hold the writer so both writes are drained into one batch
+        persistence.submit(hold)
+        started.wait()
+        first = persistence.submit(write, "integrative")
+        second = persistence.submit(write, "synthesis")
+        release.set()
+        with pytest.raises(OSError):
+            await persistence.flush()
+        await persistence.close()
+        return first.exception(), second.exception()
+
+    errors = asyncio.run(run())
+    assert applied == ["integrative", "synthesis"]  # Each applied once, not again one by one
+    assert all(isinstance(e, OSError) for e in errors)